@@ -0,0 +1,150 @@
+"""Collectors: package listing, .desktop parsing, /proc walks and the recording format."""
+import random
+import tracemalloc
+import dataclasses
+from typing import Optional
+import pytest
+from system_toolbox.package_manager import AptPackageManager, PackageList
+from system_toolbox.desktop_entries import find_desktop_files
+from system_toolbox.process_tree import ProcessTree
+from system_toolbox.system_info import get_memory_pressure
+from system_toolbox.mounts import parse_mountinfo
+from system_toolbox import recording, wire
+from conftest import PACKAGE_COUNT, PROCESS_COUNT, package_names
+
+INVENTORY_COUNT = 50000
+
+def bench_apt_list_installed(benchmark, dpkg_admindir):
+    manager = AptPackageManager(dpkg_admindir)
+    packages = benchmark(manager.list_installed)
+    assert len(packages) == PACKAGE_COUNT
+
+def bench_parse_desktop_file(benchmark, desktop_dir, qapp):
+    from system_toolbox.apps_tab import PackageLoaderThread
+    loader = PackageLoaderThread(None, [desktop_dir])
+    files = find_desktop_files([desktop_dir])
+    results = benchmark(lambda: [loader.parse_desktop_file(path) for path in files])
+    assert all(results)
+
+def bench_package_loader_run(benchmark, dpkg_admindir, desktop_dir, qapp):
+    from system_toolbox.apps_tab import PackageLoaderThread
+    loader = PackageLoaderThread(AptPackageManager(dpkg_admindir), [desktop_dir])
+    loaded = []
+    loader.data_loaded.connect(lambda packages, desktop_map: loaded.append(packages))
+    # run() in this thread: the signal is delivered directly
+    benchmark(loader.run)
+    assert len(loaded[-1]) > PACKAGE_COUNT
+
+@dataclasses.dataclass
+class DictPackageInfo:
+    """The package record PackageList replaced: a plain dataclass with a __dict__ per instance."""
+    name: str
+    size_mb: float
+    version: str
+    type: str
+    status: str = "Installed"
+    desktop_file_path: Optional[str] = None
+    exec_path: Optional[str] = None
+
+@pytest.fixture(scope="module")
+def inventory_lines():
+    """dpkg-query output for a 50k-package inventory: name, installed size (KB), version."""
+    rng = random.Random(6)
+    return [
+        f"{name}\t{rng.randint(10, 500000)}\t{rng.randint(0, 9)}.{rng.randint(0, 30)}.{rng.randint(0, 99)}-{rng.randint(1, 5)}"
+        for name in package_names(INVENTORY_COUNT, seed=6)
+    ]
+
+def retained_bytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    packages = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return packages, after - before
+
+def bench_package_list_memory(benchmark, inventory_lines):
+    """Parsing a 50k inventory, plus the memory it keeps (strings included) compared to dataclass records."""
+    def build_list():
+        packages = PackageList()
+        for line in inventory_lines:
+            name, size_kb, version = line.split("\t")
+            packages.add(name, float(size_kb) / 1024, version, "apt")
+        return packages
+    def build_records():
+        records = []
+        for line in inventory_lines:
+            name, size_kb, version = line.split("\t")
+            records.append(DictPackageInfo(name, float(size_kb) / 1024, version, "apt"))
+        return records
+
+    packages, compact = retained_bytes(build_list)
+    records, legacy = retained_bytes(build_records)
+    assert len(packages) == len(records) == INVENTORY_COUNT
+    assert packages[123].as_dict() == dataclasses.asdict(records[123])
+    benchmark.extra_info["bytes_per_package"] = round(compact / INVENTORY_COUNT)
+    benchmark.extra_info["dataclass_bytes_per_package"] = round(legacy / INVENTORY_COUNT)
+    assert compact < legacy * 0.75
+    benchmark.pedantic(build_list, rounds=3, iterations=1)
+
+def bench_get_process_list(benchmark, fake_proc, monkeypatch):
+    import psutil
+    from system_toolbox.system_info import get_process_list
+    monkeypatch.setattr(psutil, "PROCFS_PATH", fake_proc)
+    processes = benchmark(get_process_list)
+    assert len(processes) == PROCESS_COUNT
+
+def bench_process_tree_update(benchmark, fake_proc):
+    tree = ProcessTree(fake_proc)
+    tree.update()
+    # Steady state: every pid known, counters refreshed
+    benchmark(tree.update)
+    assert len(tree.nodes) == PROCESS_COUNT
+
+def bench_process_tree_first_update(benchmark, fake_proc):
+    benchmark(lambda: ProcessTree(fake_proc).update())
+
+def bench_get_memory_pressure(benchmark, fake_proc):
+    data = benchmark(get_memory_pressure, fake_proc, fake_proc)
+    assert data["psi"]["some"]["avg10"] == 1.5
+
+def bench_parse_mountinfo(benchmark):
+    lines = [
+        f"{i} 1 8:{i} / /mnt/disk{i} rw,relatime shared:{i} - ext4 /dev/sd{chr(97 + i % 26)}{i} rw"
+        for i in range(200)
+    ]
+    mounts = benchmark(parse_mountinfo, "\n".join(lines) + "\n")
+    assert len(mounts) == 200
+
+@pytest.fixture(scope="module")
+def recorded_samples(fake_proc):
+    """One chunk of samples: the fake /proc sampled repeatedly, as the recorder would."""
+    tree = ProcessTree(fake_proc)
+    memory = {
+        "total": 16 << 30, "used": 7 << 30, "available": 9 << 30, "percent": 43.8,
+        "cache": 6 << 30, "dirty": 2 << 20, "writeback": 0, "swap_total": 4 << 30, "swap_free": 3 << 30,
+        "psi_some": 1.5, "psi_full": 0.1, "pgmajfault": 3.0, "pswpin": 0.0, "status": "No memory pressure",
+    }
+    disks = [{
+        "device": f"/dev/sd{chr(97 + i)}", "mountpoint": f"/mnt/{i}", "fstype": "ext4", "opts": "rw",
+        "state": "ok", "total": 500 << 30, "used": (100 + i) << 30, "free": (400 - i) << 30, "percent": 20.0 + i,
+        "reserved": 25 << 30, "inodes_total": 30000000, "inodes_used": 400000 + i, "inodes_percent": 1.3,
+        "readonly": False, "error": None,
+    } for i in range(6)]
+    samples = []
+    for i in range(recording.CHUNK_SAMPLES):
+        tree.update()
+        samples.append({"time": 1700000000.0 + 2 * i, "memory": memory, "processes": tree.process_rows(), "disks": disks})
+    return samples
+
+def bench_recording_encode_chunk(benchmark, recorded_samples):
+    benchmark(recording.encode_chunk, recorded_samples)
+
+def bench_recording_decode_chunk(benchmark, recorded_samples):
+    data = recording.encode_chunk(recorded_samples)
+    samples = benchmark(recording.decode_chunk, data)
+    assert len(samples) == len(recorded_samples)
+
+def bench_wire_roundtrip(benchmark, recorded_samples):
+    rows = {row["pid"]: row for row in recorded_samples[0]["processes"]}
+    assert benchmark(lambda: wire.decode(wire.encode(rows))) == rows
@@ -0,0 +1,134 @@
+"""GUI hot paths, under offscreen Qt: icon lookup, the package table and the process table."""
+import pytest
+from system_toolbox.package_manager import AptPackageManager
+from conftest import PROCESS_COUNT
+
+@pytest.fixture
+def desktop_map(dpkg_admindir, desktop_dir, qapp):
+    from system_toolbox.apps_tab import PackageLoaderThread
+    loader = PackageLoaderThread(None, [desktop_dir])
+    maps = []
+    loader.data_loaded.connect(lambda packages, desktop_map: maps.append(desktop_map))
+    loader.run()
+    return maps[0]
+
+@pytest.fixture
+def apps_tab(qapp, dpkg_admindir, desktop_dir, icon_theme, monkeypatch):
+    """An AppsTab reading the synthetic dpkg database and launchers, with the initial load done."""
+    from system_toolbox import apps_tab
+    monkeypatch.setattr(apps_tab, "get_package_manager", lambda: AptPackageManager(dpkg_admindir))
+    monkeypatch.setattr(apps_tab, "RemotePackageManager", lambda connection, local: local) # no daemon
+    loader_class = apps_tab.PackageLoaderThread
+    monkeypatch.setattr(apps_tab, "PackageLoaderThread", lambda manager: loader_class(manager, [desktop_dir]))
+    tab = apps_tab.AppsTab()
+    tab.loader_thread.wait()
+    qapp.processEvents() # delivers data_loaded
+    tab.renderer.finish()
+    assert tab.table.rowCount() > 0
+    yield tab
+    tab.deleteLater()
+
+def bench_icon_loader_cold(benchmark, names, desktop_map, icon_theme):
+    """Resolving every package icon once: theme lookups and fallback file searches."""
+    from system_toolbox.apps_tab import IconLoader
+    def resolve():
+        loader = IconLoader(desktop_map, search_paths=[])
+        for name in names:
+            loader.get_icon(name)
+    benchmark.pedantic(resolve, rounds=3, iterations=1)
+
+def bench_icon_loader_cached(benchmark, names, desktop_map, icon_theme):
+    from system_toolbox.apps_tab import IconLoader
+    loader = IconLoader(desktop_map, search_paths=[])
+    for name in names:
+        loader.get_icon(name)
+    benchmark(lambda: [loader.get_icon(name) for name in names])
+
+def bench_apps_render_packages(benchmark, apps_tab):
+    """The whole package table, all slices rendered back to back."""
+    def render():
+        apps_tab.render_packages(apps_tab.all_packages)
+        apps_tab.renderer.finish()
+    benchmark.pedantic(render, rounds=5, iterations=1)
+    assert apps_tab.table.rowCount() == len(apps_tab.all_packages)
+
+def bench_apps_render_slice(benchmark, apps_tab):
+    """One slice of the chunked render: how long the event loop waits between input events."""
+    def render_slice():
+        if not apps_tab.renderer.running:
+            apps_tab.render_packages(apps_tab.all_packages)
+        apps_tab.renderer.render_slice()
+    benchmark(render_slice)
+
+def bench_apps_perform_filter(benchmark, apps_tab):
+    queries = iter(["", "a", "ab", "lib", "zz", "e"] * 1000)
+    def search():
+        apps_tab.search_bar.blockSignals(True)
+        apps_tab.search_bar.setText(next(queries))
+        apps_tab.search_bar.blockSignals(False)
+        apps_tab.perform_filter()
+    benchmark(search)
+
+@pytest.fixture
+def ram_tab(qapp, fake_proc):
+    from system_toolbox.ram_tab import RamTab
+    from system_toolbox.process_tree import ProcessTree
+    tab = RamTab()
+    tree = ProcessTree(fake_proc)
+    tree.update()
+    tree.update()
+    yield tab, tree
+    tab.deleteLater()
+
+def bench_ram_update_table(benchmark, ram_tab):
+    """Alternates between two top-50 lists, so every tick changes most cells."""
+    tab, tree = ram_tab
+    by_memory = tree.top("memory_rss", 50)
+    by_pid = tree.top("pid", 50)
+    assert len(by_memory) == 50 and PROCESS_COUNT >= 50
+    lists = [by_memory, by_pid]
+    state = {"tick": 0}
+    def update():
+        state["tick"] += 1
+        tab.update_table(lists[state["tick"] % 2])
+    benchmark(update)
+    assert tab.table.rowCount() == 50
+
+@pytest.fixture
+def styled_ram_tab(qapp, ram_tab):
+    """The RAM tab shown under the application stylesheet, as in the app."""
+    from system_toolbox.styles import get_stylesheet
+    tab, tree = ram_tab
+    qapp.setStyleSheet(get_stylesheet())
+    tab.show()
+    qapp.processEvents()
+    yield tab
+    tab.hide()
+    qapp.setStyleSheet("")
+
+def bench_restyle_inline_sheet(benchmark, styled_ram_tab):
+    """Before: a stylesheet of its own set on the RAM bar every tick, parsed and polished each time."""
+    bar = styled_ram_tab.ram_progress
+    sheets = ["QProgressBar::chunk { background-color: #5cb85c; }", "QProgressBar::chunk { background-color: #f0ad4e; }"]
+    state = {"tick": 0}
+    def restyle():
+        state["tick"] += 1
+        bar.setStyleSheet(sheets[state["tick"] % 2])
+    benchmark(restyle)
+    bar.setStyleSheet("")
+
+def bench_restyle_dynamic_property(benchmark, styled_ram_tab):
+    """After: a level change every tick (the worst case) re-polishes from the parsed application sheet."""
+    from system_toolbox.styles import set_style_state
+    bar = styled_ram_tab.ram_progress
+    levels = ["normal", "warning"]
+    state = {"tick": 0}
+    def restyle():
+        state["tick"] += 1
+        set_style_state(bar, "level", levels[state["tick"] % 2])
+    benchmark(restyle)
+
+def bench_ram_update_ram(benchmark, styled_ram_tab):
+    """A steady RAM tick: label and value change, the level does not, so nothing is polished."""
+    ram = {"total": 16 * 1024**3, "used": 6 * 1024**3, "percent": 37.5}
+    benchmark(styled_ram_tab.update_ram, ram)
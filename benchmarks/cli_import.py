@@ -0,0 +1,58 @@
+"""
+Import and run time of the command line entry point, which must not load Qt:
+
+    python benchmarks/cli_import.py [--runs 10]
+
+Each run is a fresh interpreter. "import" is the time to import system_toolbox.cli,
+"<command>" the wall time of `python -m system_toolbox <command> --format ndjson`.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import system_toolbox.cli
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "qt": any(name.startswith("PySide6") for name in sys.modules)}))
+"""
+
+def run_once(command):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    started = time.perf_counter()
+    output = subprocess.run(command, capture_output=True, text=True, check=True, env=env).stdout
+    return time.perf_counter() - started, output
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--commands", nargs="*", default=["ram", "disks", "processes"])
+    args = parser.parse_args()
+
+    results = {"import": []}
+    for _ in range(args.runs):
+        _, output = run_once([sys.executable, "-c", IMPORT_PROBE])
+        probe = json.loads(output)
+        if probe["qt"]:
+            sys.exit("system_toolbox.cli imported PySide6")
+        results["import"].append(probe["seconds"])
+    for name in args.commands:
+        results[name] = [
+            run_once([sys.executable, "-m", "system_toolbox", name, "--format", "ndjson"])[0]
+            for _ in range(args.runs)
+        ]
+
+    print(f"{'':<12}{'median':>10}{'min':>10}{'max':>10}")
+    for key, values in results.items():
+        values = [value * 1000 for value in values]
+        print(f"{key:<12}{statistics.median(values):>8.1f}ms{min(values):>8.1f}ms{max(values):>8.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Synthetic fixtures for the benchmark suite: a fake /proc, a dpkg status database,
+a directory of .desktop launchers and an icon theme. Everything is generated with a
+fixed seed, so runs on the same machine are comparable.
+"""
+import os
+import sys
+import random
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Qt widgets are benchmarked without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Baselines are kept next to the benchmarks, wherever pytest is started from
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+PROCESS_COUNT = 400
+PACKAGE_COUNT = 3000
+DESKTOP_COUNT = 300
+ICON_COUNT = 200
+ICON_SIZES = ["48x48", "128x128", "256x256", "scalable"]
+
+# Tiny valid PNG (1x1, transparent)
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    if config.getoption("benchmark_storage", None) == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{BASELINES}"
+
+def word(rng, length=None):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(length or rng.randint(3, 10)))
+
+def package_names(count=PACKAGE_COUNT, seed=1):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        name = word(rng)
+        if rng.random() < 0.4:
+            name += "-" + rng.choice(["common", "data", "bin", "dev", "stable", "core", "utils"])
+        names.add(name)
+    return sorted(names)
+
+def write_dpkg_status(admindir, names, seed=2):
+    """A /var/lib/dpkg/status with one installed stanza per package."""
+    rng = random.Random(seed)
+    os.makedirs(admindir, exist_ok=True)
+    with open(os.path.join(admindir, "status"), "w") as f:
+        for name in names:
+            f.write(
+                f"Package: {name}\n"
+                "Status: install ok installed\n"
+                "Priority: optional\n"
+                "Section: misc\n"
+                f"Installed-Size: {rng.randint(10, 500000)}\n"
+                "Maintainer: Benchmark <bench@example.com>\n"
+                "Architecture: amd64\n"
+                f"Version: {rng.randint(0, 9)}.{rng.randint(0, 30)}.{rng.randint(0, 99)}-{rng.randint(1, 5)}\n"
+                f"Description: synthetic package {name}\n"
+                " Generated for the benchmark suite.\n\n"
+            )
+    # dpkg-query also reads these
+    for path in ("info", "updates", "triggers"):
+        os.makedirs(os.path.join(admindir, path), exist_ok=True)
+    open(os.path.join(admindir, "available"), "w").close()
+
+def write_desktop_files(directory, names, count=DESKTOP_COUNT, seed=3):
+    """Launchers: half for installed packages, half for unpackaged apps (AppImage-like)."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        if i % 2 == 0:
+            key = names[rng.randrange(len(names))]
+            exec_path = f"/usr/bin/{key}"
+        else:
+            key = f"app-{word(rng)}-{i}"
+            exec_path = f"/opt/{key}/{key}.AppImage"
+        with open(os.path.join(directory, f"{key}.desktop"), "w") as f:
+            f.write(
+                "[Desktop Entry]\n"
+                "Type=Application\n"
+                f"Name={key.replace('-', ' ').title()}\n"
+                f"Comment=Synthetic launcher {i}\n"
+                f"Exec={exec_path} %U\n"
+                f"Icon={key}\n"
+                f"StartupWMClass={key}\n"
+                "Categories=Utility;\n"
+            )
+
+def write_icon_theme(root, names, count=ICON_COUNT, seed=4):
+    """A hicolor-style theme with PNGs for `count` of the names, spread over the sizes."""
+    rng = random.Random(seed)
+    theme = os.path.join(root, "hicolor")
+    directories = []
+    for size in ICON_SIZES:
+        os.makedirs(os.path.join(theme, size, "apps"), exist_ok=True)
+        directories.append(f"{size}/apps")
+    with open(os.path.join(theme, "index.theme"), "w") as f:
+        f.write(f"[Icon Theme]\nName=Hicolor\nDirectories={','.join(directories)}\n\n")
+        for size in ICON_SIZES:
+            if size == "scalable":
+                f.write(f"[{size}/apps]\nSize=128\nMinSize=8\nMaxSize=512\nType=Scalable\n\n")
+            else:
+                f.write(f"[{size}/apps]\nSize={size.split('x')[0]}\nType=Fixed\n\n")
+    for name in rng.sample(names, count):
+        with open(os.path.join(theme, rng.choice(ICON_SIZES[:-1]), "apps", f"{name}.png"), "wb") as f:
+            f.write(PNG)
+    return theme
+
+def write_fake_proc(root, count=PROCESS_COUNT, seed=5):
+    """
+    A /proc with `count` processes: the files read by ProcessTree, get_memory_pressure()
+    and psutil (stat, statm, status, io, cgroup, exe...), plus meminfo, vmstat and PSI.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(root, "pressure"), exist_ok=True)
+    total_kb = 16 * 1024 * 1024
+    with open(os.path.join(root, "meminfo"), "w") as f:
+        for key, value in [
+            ("MemTotal", total_kb), ("MemFree", 2 * 1024 * 1024), ("MemAvailable", 9 * 1024 * 1024),
+            ("Buffers", 300000), ("Cached", 6 * 1024 * 1024), ("SwapCached", 1000),
+            ("Active", 5 * 1024 * 1024), ("Inactive", 4 * 1024 * 1024), ("Shmem", 400000),
+            ("Slab", 500000), ("SReclaimable", 300000), ("SUnreclaim", 200000),
+            ("SwapTotal", 4 * 1024 * 1024), ("SwapFree", 3 * 1024 * 1024),
+            ("Dirty", 2000), ("Writeback", 0),
+        ]:
+            f.write(f"{key + ':':<16}{value:>10} kB\n")
+    with open(os.path.join(root, "stat"), "w") as f:
+        f.write("cpu  100 0 100 10000 10 0 0 0 0 0\ncpu0 100 0 100 10000 10 0 0 0 0 0\n")
+        f.write("btime 1700000000\nprocesses 5000\nprocs_running 2\nprocs_blocked 0\n")
+    with open(os.path.join(root, "vmstat"), "w") as f:
+        for key in ("pgmajfault", "pswpin", "pswpout", "workingset_refault_file", "workingset_refault_anon"):
+            f.write(f"{key} {rng.randint(0, 100000)}\n")
+    with open(os.path.join(root, "pressure", "memory"), "w") as f:
+        f.write("some avg10=1.50 avg60=0.80 avg300=0.20 total=123456\n")
+        f.write("full avg10=0.10 avg60=0.05 avg300=0.01 total=2345\n")
+
+    pids = list(range(1, count + 1))
+    for pid in pids:
+        directory = os.path.join(root, str(pid))
+        os.makedirs(directory)
+        name = word(rng)
+        ppid = 0 if pid == 1 else rng.randint(1, pid - 1)
+        rss_pages = rng.randint(100, 100000)
+        fields = ["S", ppid, pid, pid, 0, -1, 4194304, 100, 0, 0, 0,
+                  rng.randint(0, 10000), rng.randint(0, 5000), 0, 0, 20, 0, 1, 0,
+                  rng.randint(100, 1000000), rss_pages * 4096 * 3, rss_pages]
+        fields += [18446744073709551615, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 17, 0, 0, 0, 0, 0, 0,
+                   0, 0, 0, 0, 0, 0, 0, 0]
+        with open(os.path.join(directory, "stat"), "w") as f:
+            f.write(f"{pid} ({name}) {' '.join(str(field) for field in fields)}\n")
+        with open(os.path.join(directory, "statm"), "w") as f:
+            f.write(f"{rss_pages * 3} {rss_pages} {rss_pages // 4} 100 0 {rss_pages // 2} 0\n")
+        with open(os.path.join(directory, "status"), "w") as f:
+            f.write(f"Name:\t{name}\nState:\tS (sleeping)\nTgid:\t{pid}\nPid:\t{pid}\nPPid:\t{ppid}\n"
+                    f"Uid:\t1000\t1000\t1000\t1000\nGid:\t1000\t1000\t1000\t1000\n"
+                    f"VmRSS:\t{rss_pages * 4} kB\nVmSwap:\t{rng.randint(0, 5000)} kB\nThreads:\t1\n")
+        with open(os.path.join(directory, "io"), "w") as f:
+            f.write(f"rchar: 0\nwchar: 0\nread_bytes: {rng.randint(0, 10**9)}\nwrite_bytes: {rng.randint(0, 10**9)}\n")
+        with open(os.path.join(directory, "cgroup"), "w") as f:
+            f.write(f"0::/user.slice/user-1000.slice/app.slice/{name}.service\n")
+        with open(os.path.join(directory, "comm"), "w") as f:
+            f.write(name + "\n")
+        with open(os.path.join(directory, "cmdline"), "w") as f:
+            f.write(f"/usr/bin/{name}\0--flag\0")
+        os.symlink(f"/usr/bin/{name}", os.path.join(directory, "exe"))
+    return root
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    return app
+
+@pytest.fixture(scope="session")
+def names():
+    return package_names()
+
+@pytest.fixture(scope="session")
+def dpkg_admindir(tmp_path_factory, names):
+    admindir = str(tmp_path_factory.mktemp("dpkg"))
+    write_dpkg_status(admindir, names)
+    return admindir
+
+@pytest.fixture(scope="session")
+def desktop_dir(tmp_path_factory, names):
+    directory = str(tmp_path_factory.mktemp("applications"))
+    write_desktop_files(directory, names)
+    return directory
+
+@pytest.fixture(scope="session")
+def icon_theme(tmp_path_factory, names, qapp):
+    """Makes a synthetic theme the current icon theme, so QIcon.fromTheme() looks there."""
+    from PySide6.QtGui import QIcon
+    root = str(tmp_path_factory.mktemp("icons"))
+    theme = write_icon_theme(root, names)
+    QIcon.setThemeSearchPaths([root])
+    QIcon.setThemeName("hicolor")
+    return theme
+
+@pytest.fixture(scope="session")
+def fake_proc(tmp_path_factory):
+    return write_fake_proc(str(tmp_path_factory.mktemp("proc")))
+
+@pytest.fixture(scope="session")
+def packages(dpkg_admindir):
+    from system_toolbox.package_manager import AptPackageManager
+    return AptPackageManager(dpkg_admindir).list_installed()
@@ -0,0 +1,93 @@
+"""
+Time to first paint of the main window.
+
+Each run starts a fresh interpreter, so module imports are part of the measurement:
+
+    python benchmarks/startup.py [--runs 5] [--eager]
+
+--eager builds every tab before the window is shown, the way MainWindow used to.
+Use QT_QPA_PLATFORM=offscreen to run without a display.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure(eager):
+    """One startup in this process; prints the timings (seconds since start) as JSON."""
+    started = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QObject, QEvent, QTimer
+    from system_toolbox.main import MainWindow
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    window = MainWindow()
+    if eager:
+        for index in range(window.tabs.count()):
+            window.tabs.widget(index).build()
+    constructed = time.perf_counter()
+    timings = {}
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and "first_paint" not in timings:
+                timings["first_paint"] = time.perf_counter()
+            return False
+
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+    window.show()
+
+    def check():
+        # The current tab is built right after the first paint
+        tab = window.tabs.currentWidget()
+        if "first_paint" in timings and tab.widget is not None:
+            timings["tab_ready"] = time.perf_counter()
+            app.quit()
+        else:
+            QTimer.singleShot(1, check)
+
+    QTimer.singleShot(0, check)
+    QTimer.singleShot(30000, app.quit)
+    app.exec()
+
+    result = {"imports": imported, "window": constructed}
+    result.update(timings)
+    print(json.dumps({key: value - started for key, value in result.items()}))
+    # Skip tearing down loader threads still running in the tabs
+    sys.stdout.flush()
+    os._exit(0)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--eager", action="store_true", help="build all tabs before showing the window")
+    parser.add_argument("--once", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.once:
+        measure(args.eager)
+        return
+
+    command = [sys.executable, os.path.abspath(__file__), "--once"] + (["--eager"] if args.eager else [])
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'':<14}{'median':>10}{'min':>10}{'max':>10}")
+    for key in ("imports", "window", "first_paint", "tab_ready"):
+        values = [run[key] * 1000 for run in runs if key in run]
+        if values:
+            print(f"{key:<14}{statistics.median(values):>8.1f}ms{min(values):>8.1f}ms{max(values):>8.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,32 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QThread, Signal, QSize, QTimer
 from PySide6.QtGui import QIcon, QAction
 from system_toolbox.package_manager import get_package_manager
+from system_toolbox.collector import CollectorConnection, RemotePackageManager
+from system_toolbox.tracing import span, traced
+from system_toolbox.widgets import ChunkedRenderer
 import subprocess
 import os
-import glob
+
+# Directories searched for icon files named like the icon / package
+ICON_SEARCH_PATHS = [
+    "/usr/share/pixmaps",
+    "/usr/share/icons/hicolor/128x128/apps",
+    "/usr/share/icons/hicolor/48x48/apps",
+    "/usr/share/icons/hicolor/256x256/apps",
+    "/usr/share/icons/hicolor/512x512/apps",
+    "/usr/share/icons/hicolor/scalable/apps",
+    "/usr/share/icons",
+    "/usr/share/app-install/icons",
+    os.path.expanduser("~/.local/share/icons"),
+    os.path.expanduser("~/.icons")
+]
 
 DENYLIST = ["linux-image", "ubuntu-desktop", "systemd", "python3", "gnome-shell", "kernel", "filesystem"]
 
 class IconLoader:
-    def __init__(self, preloaded_map=None):
+    def __init__(self, preloaded_map=None, search_paths=None):
         self.desktop_map = preloaded_map if preloaded_map is not None else {}
+        self.search_paths = search_paths if search_paths is not None else ICON_SEARCH_PATHS
         self.icon_cache = {}
         if preloaded_map is None:
             self._scan_desktop_files()
@@ -27,29 +44,17 @@ class IconLoader:
         if package_name in self.icon_cache:
             return self.icon_cache[package_name]
 
-        icon = self._resolve_icon(package_name)
+        with span("icons.resolve"):
+            icon = self._resolve_icon(package_name)
         self.icon_cache[package_name] = icon
         return icon
 
     def _find_fallback_icon(self, name):
         # Search common paths for png/svg/xpm/ico
         # This helps find icons for apps that don't fully integrate with the icon theme
-        search_paths = [
-            "/usr/share/pixmaps",
-            "/usr/share/icons/hicolor/128x128/apps",
-            "/usr/share/icons/hicolor/48x48/apps",
-            "/usr/share/icons/hicolor/256x256/apps",
-            "/usr/share/icons/hicolor/512x512/apps",
-            "/usr/share/icons/hicolor/scalable/apps",
-            "/usr/share/icons",
-            "/usr/share/app-install/icons",
-            os.path.expanduser("~/.local/share/icons"),
-            os.path.expanduser("~/.icons")
-        ]
-        
         extensions = [".png", ".svg", ".xpm", ".ico", ".icns"]
         
-        for path in search_paths:
+        for path in self.search_paths:
             if not os.path.exists(path):
                 continue
             
@@ -171,68 +176,29 @@ class NumericTableWidgetItem(QTableWidgetItem):
             return super().__lt__(other)
 
 from concurrent.futures import ThreadPoolExecutor
-from system_toolbox.package_manager import PackageInfo
+from system_toolbox.package_manager import PackageList
+from system_toolbox.desktop_entries import find_desktop_files, parse_desktop_file
 
 class PackageLoaderThread(QThread):
-    data_loaded = Signal(list, dict) # packages, desktop_map
+    data_loaded = Signal(object, dict) # PackageList, desktop_map
     
-    def __init__(self, pkg_manager):
+    def __init__(self, pkg_manager, desktop_paths=None):
         super().__init__()
         self.pkg_manager = pkg_manager
+        self.desktop_paths = desktop_paths # None: the standard DESKTOP_PATHS
         
+    @traced("packages.desktop_parse")
     def parse_desktop_file(self, filepath):
-        try:
-            filename = os.path.basename(filepath).lower()
-            key_filename = filename[:-8] # remove .desktop
-            
-            icon = None
-            exec_name = None
-            app_name = None
-            startup_class = None
-            cmd_path = None
-            
-            with open(filepath, 'r', errors='ignore') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("Icon="):
-                        icon = line.split("=", 1)[1].strip()
-                        icon = icon.replace('"', '').replace("'", "")
-                        if icon.startswith("~"):
-                            icon = os.path.expanduser(icon)
-                        if not os.path.isabs(icon):
-                            base, ext = os.path.splitext(icon)
-                            if ext in ['.png', '.svg', '.xpm', '.ico']:
-                                icon = base
-                    elif line.startswith("Exec="):
-                        cmd = line.split("=", 1)[1].strip()
-                        cmd = cmd.replace('"', '').replace("'", "")
-                        cmd_path = cmd.split()[0]
-                        exec_name = os.path.basename(cmd_path).lower()
-                    elif line.startswith("Name="):
-                        app_name = line.split("=", 1)[1].strip()
-                    elif line.startswith("StartupWMClass="):
-                        startup_class = line.split("=", 1)[1].strip().lower()
-            
-            return {
-                'filepath': filepath,
-                'filename': filename,
-                'key_filename': key_filename,
-                'icon': icon,
-                'exec_name': exec_name,
-                'app_name': app_name,
-                'startup_class': startup_class,
-                'cmd_path': cmd_path
-            }
-        except Exception:
-            return None
+        return parse_desktop_file(filepath)
 
     def run(self):
         # 1. List Packages (Subprocess)
-        packages = []
+        packages = PackageList()
         installed_names = set()
         
         if self.pkg_manager:
-            packages = self.pkg_manager.list_installed()
+            with span("packages.query"):
+                packages = self.pkg_manager.list_installed()
             for p in packages:
                 installed_names.add(p.name.lower())
                 clean = p.name.lower().replace("-stable", "").replace("-bin", "")
@@ -240,25 +206,13 @@ class PackageLoaderThread(QThread):
 
         # 2. Scan Desktop Files (Parallel)
         desktop_map = {}
-        extra_packages = []
+        extra_packages = PackageList()
         added_desktop_apps = set()
         
-        paths = [
-            "/usr/share/applications",
-            "/usr/local/share/applications",
-            os.path.expanduser("~/.local/share/applications"),
-            "/var/lib/snapd/desktop/applications",
-            "/var/lib/flatpak/exports/share/applications",
-            os.path.expanduser("~/.local/share/flatpak/exports/share/applications")
-        ]
-        
-        all_desktop_files = []
-        for path in paths:
-            if os.path.exists(path):
-                all_desktop_files.extend(glob.glob(os.path.join(path, "*.desktop")))
+        all_desktop_files = find_desktop_files(self.desktop_paths)
         
         # Use ThreadPool to parse files in parallel
-        with ThreadPoolExecutor(max_workers=10) as executor:
+        with span("packages.desktop_scan"), ThreadPoolExecutor(max_workers=10) as executor:
             results = executor.map(self.parse_desktop_file, all_desktop_files)
             
             for res in results:
@@ -305,7 +259,7 @@ class PackageLoaderThread(QThread):
                     elif res['cmd_path'] and ".AppImage" in res['cmd_path']:
                         pkg_type = "AppImage"
                         
-                    pkg = PackageInfo(
+                    extra_packages.add(
                         name=display_name,
                         size_mb=size_mb,
                         version="N/A",
@@ -314,7 +268,6 @@ class PackageLoaderThread(QThread):
                         desktop_file_path=res['filepath'],
                         exec_path=res['cmd_path']
                     )
-                    extra_packages.append(pkg)
                     added_desktop_apps.add(display_name)
 
         # Combine lists
@@ -331,6 +284,10 @@ class AppsTab(QWidget):
 
         # Get Package Manager
         self.pkg_manager = get_package_manager()
+
+        # A running collector daemon shares its package inventory between windows
+        if self.pkg_manager is not None:
+            self.pkg_manager = RemotePackageManager(CollectorConnection(), self.pkg_manager)
         
         # Placeholder IconLoader (will be updated after thread finishes)
         self.icon_loader = IconLoader(preloaded_map={})
@@ -366,6 +323,7 @@ class AppsTab(QWidget):
         
         # Packages Table
         self.table = QTableWidget()
+        self.table.setObjectName("packageTable") # styled in styles.py
         self.table.setColumnCount(3)
         self.table.setHorizontalHeaderLabels(["Name", "Version", "Size"])
         self.table.setAlternatingRowColors(False) # Clean white look
@@ -374,33 +332,7 @@ class AppsTab(QWidget):
         self.table.setSelectionBehavior(QTableWidget.SelectRows)
         self.table.setSelectionMode(QTableWidget.SingleSelection)
         self.table.setIconSize(QSize(32, 32)) # Larger icons
-        
-        # Style the table to match reference
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                background-color: white;
-                gridline-color: #e0e0e0;
-            }
-            QTableWidget::item {
-                padding: 10px;
-                border-bottom: 1px solid #f0f0f0;
-            }
-            QTableWidget::item:selected {
-                background-color: #e3f2fd;
-                color: black;
-            }
-            QHeaderView::section {
-                background-color: white;
-                border: none;
-                border-bottom: 2px solid #e0e0e0;
-                padding: 12px;
-                font-weight: bold;
-                color: #9e9e9e;
-                text-transform: uppercase;
-                font-size: 12px;
-            }
-        """)
+        self.table.verticalHeader().setDefaultSectionSize(50) # Reduced height slightly for compactness
         
         # Column resizing
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch) # Name stretches
@@ -420,13 +352,19 @@ class AppsTab(QWidget):
         # Default Sort State
         self.current_sort_col = 0 # Name
         self.current_sort_order = Qt.AscendingOrder
+        self.filter_text = ""
         
         self.layout.addWidget(self.table)
+
+        # Rows are added in short slices, so the window stays responsive while a long list loads
+        self.renderer = ChunkedRenderer(self.render_row, "apps.render", parent=self)
+        self.renderer.progress.connect(self.on_render_progress)
+        self.renderer.finished.connect(self.finish_loading)
         
         # Loading Indicator
         self.loading_label = QLabel("Loading packages... Please wait.")
         self.loading_label.setAlignment(Qt.AlignCenter)
-        self.loading_label.setStyleSheet("color: #666; font-style: italic;")
+        self.loading_label.setObjectName("loadingLabel")
         self.layout.addWidget(self.loading_label)
         self.loading_label.hide() # Hide initially
 
@@ -438,6 +376,7 @@ class AppsTab(QWidget):
             return
 
         # UI State for Loading
+        self.renderer.cancel()
         self.table.setRowCount(0)
         self.refresh_btn.setEnabled(False)
         self.refresh_btn.setText("Loading...")
@@ -460,42 +399,56 @@ class AppsTab(QWidget):
         self.render_packages(self.all_packages)
 
     def render_packages(self, packages_to_render):
-        # Reset Table
+        # Reset Table (drops a render still in progress)
+        self.renderer.cancel()
         self.table.setRowCount(0)
         self.table.setSortingEnabled(False)
-        self.table.setUpdatesEnabled(False)
         
-        # Update label (optional, might not render if we block immediately)
         self.loading_label.setText(f"Processing {len(packages_to_render)} packages...")
         self.loading_label.show()
-        
-        for i, pkg in enumerate(packages_to_render):
-            row_idx = i
-            self.table.insertRow(row_idx)
-            self.table.setRowHeight(row_idx, 50) # Reduced height slightly for compactness
-            
-            # Name Column
-            icon = self.icon_loader.get_icon(pkg.name)
-            name_item = QTableWidgetItem(pkg.name)
-            name_item.setIcon(icon)
-            font = name_item.font()
-            name_item.setData(Qt.UserRole, pkg) # Store full pkg object
-            font.setPointSize(11) # Slightly smaller font
-            font.setBold(True)
-            name_item.setFont(font)
-            self.table.setItem(row_idx, 0, name_item)
-
-            # Version
-            self.table.setItem(row_idx, 1, QTableWidgetItem(pkg.version))
-            
-            # Size
-            size_item = NumericTableWidgetItem(f"{pkg.size_mb:.2f} MB")
-            size_item.setData(Qt.UserRole, pkg.size_mb) # Store raw float for sorting
-            size_item.setForeground(Qt.gray)
-            self.table.setItem(row_idx, 2, size_item)
 
-        self.table.setUpdatesEnabled(True)
-        self.finish_loading()
+        # Rows arrive in the current sort order, so they do not jump when the sort is applied
+        self.renderer.start(self.sorted_packages(packages_to_render))
+
+    def sorted_packages(self, packages):
+        if self.current_sort_col == 2:
+            key = lambda pkg: pkg.size_mb
+        elif self.current_sort_col == 1:
+            key = lambda pkg: pkg.version
+        else:
+            key = lambda pkg: pkg.name
+        return sorted(packages, key=key, reverse=self.current_sort_order == Qt.DescendingOrder)
+
+    def render_row(self, row_idx, pkg):
+        self.table.insertRow(row_idx)
+        
+        # Name Column
+        icon = self.icon_loader.get_icon(pkg.name)
+        name_item = QTableWidgetItem(pkg.name)
+        name_item.setIcon(icon)
+        font = name_item.font()
+        name_item.setData(Qt.UserRole, pkg) # Store full pkg object
+        font.setPointSize(11) # Slightly smaller font
+        font.setBold(True)
+        name_item.setFont(font)
+        self.table.setItem(row_idx, 0, name_item)
+
+        # Version
+        self.table.setItem(row_idx, 1, QTableWidgetItem(pkg.version))
+        
+        # Size
+        size_item = NumericTableWidgetItem(f"{pkg.size_mb:.2f} MB")
+        size_item.setData(Qt.UserRole, pkg.size_mb) # Store raw float for sorting
+        size_item.setForeground(Qt.gray)
+        self.table.setItem(row_idx, 2, size_item)
+
+        # A search typed while loading also applies to the rows still coming
+        if self.filter_text and self.filter_text not in pkg.name.lower():
+            self.table.setRowHidden(row_idx, True)
+
+    def on_render_progress(self, rendered, total):
+        if rendered < total:
+            self.loading_label.setText(f"Processing packages... {rendered:,} / {total:,}")
 
     def show_context_menu(self, pos):
         item = self.table.itemAt(pos)
@@ -585,15 +538,15 @@ class AppsTab(QWidget):
         # Restart timer on every keystroke
         self.search_timer.start()
 
+    @traced("apps.filter")
     def perform_filter(self):
         text = self.search_bar.text().lower()
+        self.filter_text = text
         
         if not hasattr(self, 'all_packages'):
             return
 
-        # If we are currently batch loading, we should probably let it finish 
-        # or just filter what we have. For simplicity, we filter what is currently in the table.
-        # If the table is incomplete (still loading), this might look weird, but it's better than crashing.
+        # While rows are still being added, this filters the rows so far; render_row() filters the rest
         
         for row in range(self.table.rowCount()):
             item = self.table.item(row, 0) # Name column
@@ -0,0 +1,192 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget,
+    QTreeWidgetItem, QHeaderView, QMessageBox, QProgressBar, QTextEdit
+)
+from PySide6.QtCore import Qt, QThread, Signal
+from system_toolbox.cleanup_scanner import default_plugins, scan_plugins, run_cleanup
+from system_toolbox.system_info import format_size
+
+class CleanupScanWorker(QThread):
+    result = Signal(object) # one plugin result, as soon as that plugin is done
+    finished = Signal()
+
+    def __init__(self, plugins):
+        super().__init__()
+        self.plugins = plugins
+        self.cancelled = False
+
+    def run(self):
+        scan_plugins(self.plugins, on_result=self.result.emit, is_cancelled=lambda: self.cancelled)
+        self.finished.emit()
+
+class CleanupWorker(QThread):
+    progress = Signal(object) # (items done, bytes freed)
+    output = Signal(str)
+    finished = Signal(object) # (items done, bytes freed, failures)
+
+    def __init__(self, items):
+        super().__init__()
+        self.items = items
+
+    def run(self):
+        result = run_cleanup(
+            self.items,
+            on_progress=lambda done, freed: self.progress.emit((done, freed)),
+            on_output=self.output.emit
+        )
+        self.finished.emit(result)
+
+class CleanupDialog(QDialog):
+    """
+    Shows the space each cleanup plugin found, as the plugins finish,
+    and removes the items the user keeps ticked.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Clean Up")
+        self.resize(800, 600)
+        self.scan_worker = None
+        self.clean_worker = None
+        self.plugin_items = {} # plugin -> top level item
+
+        layout = QVBoxLayout(self)
+
+        self.summary_label = QLabel("Looking for reclaimable space...")
+        self.summary_label.setObjectName("subHeaderLabel")
+        layout.addWidget(self.summary_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(3)
+        self.tree.setHeaderLabels(["Item", "Size", "Details"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.itemChanged.connect(self.update_selection)
+        layout.addWidget(self.tree)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        self.log = QTextEdit()
+        self.log.setReadOnly(True)
+        self.log.setMaximumHeight(120)
+        self.log.setVisible(False)
+        layout.addWidget(self.log)
+
+        buttons = QHBoxLayout()
+        self.status_label = QLabel()
+        buttons.addWidget(self.status_label, 1)
+        self.btn_rescan = QPushButton("Rescan")
+        self.btn_rescan.clicked.connect(self.start_scan)
+        buttons.addWidget(self.btn_rescan)
+        self.btn_clean = QPushButton("Clean Selected")
+        self.btn_clean.setObjectName("primaryBtn")
+        self.btn_clean.clicked.connect(self.clean_selected)
+        buttons.addWidget(self.btn_clean)
+        layout.addLayout(buttons)
+
+        self.start_scan()
+
+    def start_scan(self):
+        self.tree.clear()
+        self.plugin_items = {}
+        plugins = [plugin for plugin in default_plugins() if plugin.available()]
+        for plugin in plugins:
+            item = QTreeWidgetItem([plugin.name, "", "Scanning..."])
+            item.setToolTip(0, plugin.description)
+            self.tree.addTopLevelItem(item)
+            self.plugin_items[plugin] = item
+        self.btn_rescan.setEnabled(False)
+        self.btn_clean.setEnabled(False)
+        self.scan_worker = CleanupScanWorker(plugins)
+        self.scan_worker.result.connect(self.on_plugin_result)
+        self.scan_worker.finished.connect(self.on_scan_finished)
+        self.scan_worker.start()
+
+    def on_plugin_result(self, result):
+        top = self.plugin_items.get(result["plugin"])
+        if top is None:
+            return
+        self.tree.blockSignals(True)
+        if result["error"]:
+            top.setText(2, f"Error: {result['error']}")
+        elif not result["items"]:
+            top.setText(2, "Nothing to clean")
+        else:
+            top.setText(1, format_size(result["size"]))
+            needs_root = any(item["privileged"] for item in result["items"])
+            top.setText(2, f"{len(result['items']):,} items" + (", needs administrator rights" if needs_root else ""))
+            top.setFlags(top.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsAutoTristate)
+            for entry in sorted(result["items"], key=lambda e: e["size"], reverse=True):
+                child = QTreeWidgetItem([entry["label"], format_size(entry["size"]), entry["path"] or ""])
+                child.setFlags(child.flags() | Qt.ItemIsUserCheckable)
+                child.setCheckState(0, Qt.Checked if result["plugin"].selected else Qt.Unchecked)
+                child.setData(0, Qt.UserRole, entry)
+                top.addChild(child)
+        self.tree.blockSignals(False)
+        self.update_selection()
+
+    def on_scan_finished(self):
+        self.btn_rescan.setEnabled(True)
+        self.update_selection()
+
+    def selected_entries(self):
+        entries = []
+        for i in range(self.tree.topLevelItemCount()):
+            top = self.tree.topLevelItem(i)
+            for j in range(top.childCount()):
+                child = top.child(j)
+                if child.checkState(0) == Qt.Checked:
+                    entries.append(child.data(0, Qt.UserRole))
+        return entries
+
+    def update_selection(self, *args):
+        entries = self.selected_entries()
+        total = sum(entry["size"] for entry in entries)
+        self.summary_label.setText(f"{format_size(total)} selected to clean")
+        cleaning = self.clean_worker is not None and self.clean_worker.isRunning()
+        self.btn_clean.setEnabled(bool(entries) and not cleaning)
+
+    def clean_selected(self):
+        entries = self.selected_entries()
+        if not entries:
+            return
+        reply = QMessageBox.question(
+            self, "Clean Up",
+            f"Delete {len(entries):,} items and free about {format_size(sum(e['size'] for e in entries))}?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        self.progress_bar.setRange(0, len(entries))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.log.clear()
+        self.log.setVisible(True)
+        self.btn_clean.setEnabled(False)
+        self.btn_rescan.setEnabled(False)
+        self.clean_worker = CleanupWorker(entries)
+        self.clean_worker.progress.connect(self.on_clean_progress)
+        self.clean_worker.output.connect(self.log.append)
+        self.clean_worker.finished.connect(self.on_clean_finished)
+        self.clean_worker.start()
+
+    def on_clean_progress(self, progress):
+        done, freed = progress
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"Freed {format_size(freed)}")
+
+    def on_clean_finished(self, result):
+        done, freed, failures = result
+        self.progress_bar.setVisible(False)
+        failed = f", {failures} items could not be cleaned" if failures else ""
+        self.status_label.setText(f"Freed {format_size(freed)} ({done:,} items){failed}")
+        self.start_scan()
+
+    def done(self, result):
+        if self.scan_worker is not None and self.scan_worker.isRunning():
+            self.scan_worker.cancelled = True
+            self.scan_worker.wait()
+        # The deletion is not interrupted halfway; wait for it
+        if self.clean_worker is not None and self.clean_worker.isRunning():
+            self.clean_worker.wait()
+        super().done(result)
@@ -0,0 +1,488 @@
+import os
+import re
+import glob
+import stat
+import time
+import shlex
+import shutil
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from system_toolbox.dir_scanner import DirectoryScanner
+from system_toolbox.package_manager import get_package_manager, AptPackageManager
+
+# Journal size left after a vacuum
+JOURNAL_KEEP = 200 * 1024**2
+
+# Commands run by the plugins print English, parseable output
+C_LOCALE = dict(os.environ, LC_ALL="C")
+
+def path_usage(path, cancelled=None):
+    """Disk usage of a file or directory tree in bytes (0 if it cannot be read)."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return 0
+    if not stat.S_ISDIR(st.st_mode):
+        return st.st_blocks * 512
+    scanner = DirectoryScanner(path, workers=4)
+    tree = scanner.scan(progress=lambda s: cancelled is not None and cancelled.is_set() and s.cancel())
+    return tree.total_size[0]
+
+def child_usage(path, cancelled=None, skip=()):
+    """[(child path, bytes)] of the entries directly below a directory, from one scan."""
+    scanner = DirectoryScanner(path, workers=4)
+    tree = scanner.scan(progress=lambda s: cancelled is not None and cancelled.is_set() and s.cancel())
+    result = [
+        (os.path.join(path, tree.names[child]), tree.total_size[child])
+        for child in tree.children(0)
+        if tree.names[child] not in skip
+    ]
+    # Files directly in the directory are folded into the root's own size; list them one by one
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name in skip or entry.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    result.append((entry.path, entry.stat(follow_symlinks=False).st_blocks * 512))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return result
+
+def version_key(version):
+    return [int(part) for part in re.findall(r"\d+", version)]
+
+def _item(label, size, path=None, command=None, privileged=False):
+    return {"label": label, "size": size, "path": path, "command": command, "privileged": privileged}
+
+class CleanupPlugin:
+    """
+    A location or package store with space that can be given back.
+    scan() returns items, each one either a `path` to delete or a `command` to run.
+    """
+    name = ""
+    description = ""
+    timeout = 15.0 # seconds scan() may take before its results are dropped
+    selected = True # whether the items start out ticked; False for anything a user may miss
+
+    def available(self) -> bool:
+        return True
+
+    def scan(self, cancelled):
+        raise NotImplementedError
+
+class UserCachePlugin(CleanupPlugin):
+    name = "User cache"
+    description = "Files applications keep in ~/.cache and re-create when needed"
+    selected = False # caches hold logins, thumbnails and offline data
+
+    def __init__(self, home=None):
+        self.path = os.path.join(home or os.path.expanduser("~"), ".cache")
+
+    def available(self):
+        return os.path.isdir(self.path)
+
+    def scan(self, cancelled):
+        # VBox keeps its own snapshots and hash cache there
+        usage = child_usage(self.path, cancelled, skip={"vbox"})
+        return [_item(os.path.basename(path), size, path=path) for path, size in usage if size > 0]
+
+class PackageCachePlugin(CleanupPlugin):
+    name = "Package cache"
+    description = "Downloaded .deb / .rpm files of packages that are already installed"
+    patterns = [
+        "/var/cache/apt/archives/*.deb",
+        "/var/cache/apt/archives/partial/*",
+        "/var/cache/dnf/*/packages/*.rpm",
+        "/var/cache/libdnf5/*/packages/*.rpm",
+    ]
+
+    def scan(self, cancelled):
+        items = []
+        for pattern in self.patterns:
+            for path in glob.glob(pattern):
+                if cancelled.is_set():
+                    return items
+                try:
+                    size = os.lstat(path).st_blocks * 512
+                except OSError:
+                    continue
+                items.append(_item(os.path.basename(path), size, path=path, privileged=True))
+        return items
+
+class RotatedLogsPlugin(CleanupPlugin):
+    name = "Old log files"
+    description = "Rotated and compressed logs in /var/log"
+    rotated = re.compile(r"(\.\d+|-\d{8})(\.(gz|xz|bz2|zst))?$|\.(gz|xz|bz2|zst)$")
+
+    def __init__(self, root="/var/log"):
+        self.root = root
+
+    def scan(self, cancelled):
+        items = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            if cancelled.is_set():
+                break
+            # The journal has its own plugin
+            dirnames[:] = [d for d in dirnames if not (dirpath == self.root and d == "journal")]
+            for name in filenames:
+                if not self.rotated.search(name):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    size = os.lstat(path).st_blocks * 512
+                except OSError:
+                    continue
+                items.append(_item(os.path.relpath(path, self.root), size, path=path, privileged=True))
+        return items
+
+class JournalPlugin(CleanupPlugin):
+    name = "System journal"
+    description = f"Old entries of the systemd journal (keeps the newest {JOURNAL_KEEP // 1024**2} MB)"
+
+    def __init__(self, path="/var/log/journal"):
+        self.path = path
+
+    def available(self):
+        return os.path.isdir(self.path)
+
+    def scan(self, cancelled):
+        size = path_usage(self.path, cancelled)
+        reclaimable = size - JOURNAL_KEEP
+        if reclaimable <= 0:
+            return []
+        return [_item(
+            "Journal files", reclaimable,
+            command=["journalctl", f"--vacuum-size={JOURNAL_KEEP // 1024**2}M"], privileged=True
+        )]
+
+class OldKernelsPlugin(CleanupPlugin):
+    name = "Old kernels"
+    description = "Installed kernels other than the running and the newest one"
+    timeout = 30.0 # listing every installed package is slow on big installs
+    selected = False # an older kernel is the way back from a broken update
+
+    def __init__(self, manager=None):
+        self.manager = manager
+
+    def scan(self, cancelled):
+        manager = self.manager or get_package_manager()
+        if manager is None:
+            return []
+        running = os.uname().release
+
+        # Group the image, modules and headers packages by kernel version
+        kernels = {}
+        for pkg in manager.list_installed():
+            if isinstance(manager, AptPackageManager):
+                match = re.match(r"linux-(?:image|modules|modules-extra|headers)-(?:unsigned-)?(\d+\.\d+\.\d+-\d+)", pkg.name)
+                if not match:
+                    continue
+                version = match.group(1)
+                spec = pkg.name
+            else:
+                if not re.fullmatch(r"kernel(-core|-modules|-modules-core|-modules-extra|-devel)?", pkg.name):
+                    continue
+                version = pkg.version
+                spec = f"{pkg.name}-{pkg.version}"
+            kernels.setdefault(version, []).append((spec, pkg.size_mb))
+
+        if len(kernels) < 2:
+            return []
+        newest = max(kernels, key=version_key)
+        items = []
+        for version, packages in sorted(kernels.items(), key=lambda kv: version_key(kv[0])):
+            if version == newest or running.startswith(version):
+                continue
+            names = [spec for spec, _ in packages]
+            size = int(sum(size_mb for _, size_mb in packages) * 1024**2)
+            items.append(_item(f"Kernel {version}", size, command=manager.uninstall_many_cmd(names), privileged=True))
+        return items
+
+def parse_size(text):
+    """Parses sizes printed by flatpak ("1.2 GB", "560.3 MB", "8.2 kB")."""
+    match = re.match(r"([\d.]+)\s*([kMGT]?B)", text.replace("\xa0", " ").strip())
+    if not match:
+        return 0
+    factor = {"B": 1, "kB": 1000, "MB": 1000**2, "GB": 1000**3, "TB": 1000**4}[match.group(2)]
+    return int(float(match.group(1)) * factor)
+
+class FlatpakPlugin(CleanupPlugin):
+    name = "Unused Flatpak runtimes"
+    description = "Runtimes no installed Flatpak application depends on"
+
+    def available(self):
+        return os.path.exists("/usr/bin/flatpak")
+
+    def _list(self, *args):
+        result = subprocess.run(
+            ["flatpak", "list", *args], capture_output=True, text=True,
+            timeout=self.timeout, env=C_LOCALE, check=True
+        )
+        return [line.split("\t") for line in result.stdout.splitlines() if line.strip()]
+
+    def scan(self, cancelled):
+        # Runtimes are referenced as id/arch/branch; extensions (GL drivers, locales)
+        # belong to a runtime or app when their id extends its id
+        used = {row[0].strip() for row in self._list("--app", "--columns=runtime") if row}
+        used_ids = {ref.split("/")[0] for ref in used}
+        app_ids = {row[0].strip() for row in self._list("--app", "--columns=application") if row}
+
+        items = []
+        for row in self._list("--runtime", "--columns=ref,installation,size"):
+            if len(row) < 3:
+                continue
+            ref, installation, size = row[0].strip(), row[1].strip(), row[2]
+            ref_id = ref.split("/")[0]
+            if "/".join(ref.split("/")[:3]) in used or ref_id in used_ids:
+                continue
+            owners = used_ids | app_ids
+            if any(ref_id.startswith(owner + ".") for owner in owners):
+                continue
+            items.append(_item(
+                ref, parse_size(size),
+                command=["flatpak", "uninstall", "-y", "--noninteractive", f"--{installation}", ref]
+            ))
+        return items
+
+class SnapPlugin(CleanupPlugin):
+    name = "Disabled Snap revisions"
+    description = "Older revisions snapd keeps after a refresh"
+
+    def available(self):
+        return os.path.exists("/usr/bin/snap")
+
+    def scan(self, cancelled):
+        result = subprocess.run(
+            ["snap", "list", "--all"], capture_output=True, text=True,
+            timeout=self.timeout, env=C_LOCALE, check=True
+        )
+        items = []
+        for line in result.stdout.splitlines()[1:]:
+            parts = line.split()
+            # Name Version Rev Tracking Publisher Notes
+            if len(parts) < 6 or "disabled" not in parts[-1]:
+                continue
+            name, rev = parts[0], parts[2]
+            try:
+                size = os.path.getsize(f"/var/lib/snapd/snaps/{name}_{rev}.snap")
+            except OSError:
+                size = 0
+            items.append(_item(
+                f"{name} (revision {rev})", size,
+                command=["snap", "remove", name, "--revision", rev], privileged=True
+            ))
+        return items
+
+def default_plugins():
+    return [
+        UserCachePlugin(), PackageCachePlugin(), RotatedLogsPlugin(), JournalPlugin(),
+        OldKernelsPlugin(), FlatpakPlugin(), SnapPlugin()
+    ]
+
+def scan_plugins(plugins, on_result=None, is_cancelled=None):
+    """
+    Runs every available plugin at the same time, each on its own thread.
+    A plugin that does not finish within its timeout is reported as timed out and its
+    result dropped; it does not hold up the others. on_result(result) is called from
+    this thread as each plugin finishes; is_cancelled() stops waiting for the rest.
+    Returns the results of the finished plugins in plugin order:
+    {"plugin", "name", "description", "size", "items", "error"}.
+    """
+    results = {}
+    plugins = [plugin for plugin in plugins if plugin.available()]
+    executor = ThreadPoolExecutor(max_workers=max(len(plugins), 1))
+    start = time.monotonic()
+    running = {}
+    for plugin in plugins:
+        cancelled = threading.Event()
+        running[executor.submit(plugin.scan, cancelled)] = (plugin, cancelled)
+
+    def finish(plugin, items=None, error=None):
+        result = {
+            "plugin": plugin,
+            "name": plugin.name,
+            "description": plugin.description,
+            "size": sum(item["size"] for item in items or []),
+            "items": items or [],
+            "error": error,
+        }
+        results[plugin] = result
+        if on_result:
+            on_result(result)
+
+    while running:
+        if is_cancelled and is_cancelled():
+            for plugin, cancelled in running.values():
+                cancelled.set()
+            break
+        now = time.monotonic()
+        deadline = min(start + plugin.timeout for plugin, _ in running.values())
+        done, _ = wait(running, timeout=min(max(deadline - now, 0), 0.25), return_when=FIRST_COMPLETED)
+        for future in done:
+            plugin, _ = running.pop(future)
+            try:
+                finish(plugin, items=future.result())
+            except Exception as e:
+                # One broken plugin must not take the whole scan down
+                finish(plugin, error=str(e))
+        now = time.monotonic()
+        for future, (plugin, cancelled) in list(running.items()):
+            if now >= start + plugin.timeout:
+                cancelled.set()
+                running.pop(future)
+                finish(plugin, error=f"timed out after {plugin.timeout:.0f} s")
+
+    # Timed-out scans finish in the background
+    executor.shutdown(wait=False)
+    return [results[plugin] for plugin in plugins if plugin in results]
+
+# Paths handed to one deleting shell by xargs
+DELETE_BATCH = 256
+
+# Printed by the privileged script after each command, with the command's index and status
+STATUS_MARKER = "__vbox_status"
+# Printed after each deleted path, with the path's index (rm -v quotes unusual names)
+REMOVED_MARKER = "__vbox_removed"
+
+# Deletes "index:path" arguments one by one and reports the index of every path that is gone
+DELETE_SCRIPT = (
+    'for arg; do path="${arg#*:}"; '
+    f'rm -rf --one-file-system -- "$path" && echo "{REMOVED_MARKER} ${{arg%%:*}}"; done'
+)
+
+def _privileged_script(commands):
+    """
+    Shell script run through a single pkexec (one password prompt): deletes the
+    NUL-separated "index:path" entries streamed on stdin in batches, then runs the commands.
+    Each command is followed by a STATUS_MARKER line with its index and exit status.
+    """
+    lines = [f"xargs -0 -r -n {DELETE_BATCH} sh -c {shlex.quote(DELETE_SCRIPT)} sh"]
+    for i, command in enumerate(commands):
+        if command[0] == "pkexec":
+            command = command[1:]
+        lines.append(f"{shlex.join(command)}; echo \"{STATUS_MARKER} {i} $?\"")
+    return "\n".join(lines)
+
+def run_cleanup(items, on_progress=None, on_output=None, is_cancelled=None):
+    """
+    Deletes the paths and runs the commands of the given scan items.
+    User items are handled in-process; privileged ones go to one pkexec'd shell
+    that receives the paths on stdin while it is already deleting.
+    on_progress(items done, bytes freed) and on_output(line) are called as work completes.
+    Returns (items done, bytes freed, failures).
+    """
+    done = 0
+    freed = 0
+    failures = 0
+
+    def progress(item):
+        nonlocal done, freed
+        done += 1
+        freed += item["size"]
+        if on_progress:
+            on_progress(done, freed)
+
+    def output(line):
+        if on_output:
+            on_output(line)
+
+    user_items = [item for item in items if not item["privileged"]]
+    root_items = [item for item in items if item["privileged"]]
+
+    # 1. The user's own files and commands
+    for item in user_items:
+        if is_cancelled and is_cancelled():
+            return done, freed, failures
+        try:
+            if item["path"]:
+                if os.path.isdir(item["path"]) and not os.path.islink(item["path"]):
+                    shutil.rmtree(item["path"])
+                else:
+                    os.remove(item["path"])
+                output(f"removed {item['path']}")
+            else:
+                result = subprocess.run(item["command"], capture_output=True, text=True, env=C_LOCALE)
+                for line in (result.stdout + result.stderr).splitlines():
+                    output(line)
+                if result.returncode != 0:
+                    raise OSError(f"{item['command'][0]} exited with status {result.returncode}")
+            progress(item)
+        except OSError as e:
+            failures += 1
+            output(f"Error cleaning {item['label']}: {e}")
+
+    # 2. Everything that needs root, in one elevated process
+    if not root_items or (is_cancelled and is_cancelled()):
+        return done, freed, failures
+    paths = dict(enumerate(item for item in root_items if item["path"]))
+    commands = [item for item in root_items if item["command"]]
+    script = _privileged_script([item["command"] for item in commands])
+    try:
+        process = subprocess.Popen(
+            ["pkexec", "sh", "-c", script],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            env=C_LOCALE, text=True, bufsize=1
+        )
+    except OSError as e:
+        output(f"Error starting pkexec: {e}")
+        return done, freed, failures + len(root_items)
+
+    # Feed the paths from a thread so reading the output below never blocks the writer.
+    # The loop below shrinks `paths`, so the feeder works from its own list.
+    to_feed = [f"{index}:{item['path']}\0" for index, item in paths.items()]
+    def feed():
+        try:
+            for entry in to_feed:
+                process.stdin.write(entry)
+        except (OSError, ValueError):
+            pass
+        finally:
+            # xargs only finishes once stdin is closed
+            try:
+                process.stdin.close()
+            except (OSError, ValueError):
+                pass
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+
+    removed = re.compile(rf"^{REMOVED_MARKER} (\d+)$")
+    # The marker may follow output that did not end with a newline
+    status_line = re.compile(rf"^(.*){STATUS_MARKER} (\d+) (\d+)$")
+    statuses = {}
+    for line in process.stdout:
+        line = line.rstrip("\n")
+        match = status_line.match(line)
+        if match:
+            statuses[int(match.group(2))] = int(match.group(3))
+            if match.group(1):
+                output(match.group(1))
+            continue
+        match = removed.match(line)
+        if match:
+            item = paths.pop(int(match.group(1)), None)
+            if item is not None:
+                progress(item)
+            continue
+        output(line)
+    process.wait()
+    feeder.join()
+
+    if process.returncode in (126, 127):
+        # Authentication dismissed or failed: nothing ran
+        output("Authorization was not granted")
+        return done, freed, failures + len(root_items)
+    # Paths the script did not report could not be deleted
+    failures += len(paths)
+    # Each command by its own status; one without a marker never ran (script killed)
+    for i, item in enumerate(commands):
+        status = statuses.get(i)
+        if status == 0:
+            progress(item)
+        else:
+            failures += 1
+            output(f"Error cleaning {item['label']}: " + ("not run" if status is None else f"exited with status {status}"))
+    return done, freed, failures
@@ -0,0 +1,229 @@
+"""
+Command line access to VBox's data without Qt:
+
+    python -m system_toolbox disks [--all] [--format table|ndjson] [--watch SECONDS]
+    python -m system_toolbox ram | processes [--top N] | packages
+    python -m system_toolbox daemon [--socket PATH]
+    python -m system_toolbox exporter [--port PORT] [--top N]
+    python -m system_toolbox record FILE [--interval SECONDS] [--duration SECONDS]
+    python -m system_toolbox replay FILE [--speed N]
+    python -m system_toolbox [gui] [--trace FILE]
+
+Data comes from the collector daemon when one is running (unless --local).
+Only the GUI and replay entry points import PySide6.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+# Integer fields shown with format_size() in tables
+BYTE_FIELDS = {"total", "used", "free", "reserved", "available", "memory_rss"}
+
+def remote(state, topic):
+    # Watch mode asks for a sample taken now, not the daemon's cached one
+    return state["client"].get(topic, fresh=state["fresh"])
+
+def collect_disks(args, state):
+    if state["client"] is not None and not args.all:
+        return list(remote(state, "disks").values())
+    # The sampler keeps mountinfo open between samples and never hangs on a dead mount
+    if "sampler" not in state:
+        from system_toolbox.mounts import DiskUsageSampler
+        state["sampler"] = DiskUsageSampler()
+    return state["sampler"].sample(all=args.all)
+
+def collect_ram(args, state):
+    if state["client"] is not None:
+        return [remote(state, "ram")["usage"]]
+    from system_toolbox.system_info import get_ram_usage
+    return [get_ram_usage()]
+
+def collect_processes(args, state):
+    if state["client"] is not None:
+        processes = list(remote(state, "processes").values())
+    else:
+        # The daemon's sampler, so both sources give the same fields (rates start at 0)
+        if "tree" not in state:
+            from system_toolbox.process_tree import ProcessTree
+            state["tree"] = ProcessTree()
+        state["tree"].update()
+        processes = state["tree"].process_rows()
+    processes.sort(key=lambda p: p["memory_percent"], reverse=True)
+    return processes[:args.top] if args.top else processes
+
+def collect_packages(args, state):
+    if state["client"] is not None:
+        return list(remote(state, "packages").values())
+    if "manager" not in state:
+        from system_toolbox.package_manager import get_package_manager
+        state["manager"] = get_package_manager()
+    if state["manager"] is None:
+        raise RuntimeError("Unsupported distribution")
+    return [pkg.as_dict() for pkg in state["manager"].list_installed()]
+
+COMMANDS = {
+    "disks": (collect_disks, "Mounted filesystems: size, usage, inodes"),
+    "ram": (collect_ram, "Memory usage"),
+    "processes": (collect_processes, "Processes by memory usage"),
+    "packages": (collect_packages, "Installed packages"),
+}
+
+def format_table(records):
+    """Aligned text table of the flat fields of `records`."""
+    from system_toolbox.system_info import format_size
+    if not records:
+        return "(none)"
+    columns = [key for key, value in records[0].items() if not isinstance(value, (dict, list))]
+    rows = []
+    for record in records:
+        row = []
+        for key in columns:
+            value = record.get(key)
+            if value is None:
+                row.append("-")
+            elif key in BYTE_FIELDS and isinstance(value, int):
+                row.append(format_size(value))
+            elif isinstance(value, float):
+                row.append(f"{value:.1f}")
+            else:
+                row.append(str(value))
+        rows.append(row)
+    widths = [max(len(key), *(len(row[i]) for row in rows)) for i, key in enumerate(columns)]
+    lines = ["  ".join(key.upper().ljust(width) for key, width in zip(columns, widths))]
+    for row in rows:
+        lines.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+    return "\n".join(lines)
+
+def emit(records, args, out):
+    if args.format == "ndjson":
+        now = round(time.time(), 3)
+        for record in records:
+            out.write(json.dumps({"time": now, **record}, default=str) + "\n")
+    else:
+        out.write(format_table(records) + "\n\n")
+    out.flush()
+
+def run(args, out=sys.stdout):
+    from system_toolbox.collector import CollectorConnection, CollectorError
+    collect = COMMANDS[args.command][0]
+    # In watch mode a daemon started later is picked up
+    connection = None if args.local else CollectorConnection()
+    state = {"fresh": bool(args.watch)}
+    count = 0
+    next_sample = time.monotonic()
+    while True:
+        state["client"] = connection.client() if connection is not None else None
+        # Collectors report problems with print(); keep them out of the data stream
+        with contextlib.redirect_stdout(sys.stderr):
+            try:
+                records = collect(args, state)
+            except CollectorError as e:
+                # The daemon went away: carry on with local sampling
+                print(f"Error reading from the collector, sampling locally: {e}")
+                state["client"] = None
+                records = collect(args, state)
+        emit(records, args, out)
+        count += 1
+        if not args.watch or (args.count and count >= args.count):
+            return 0
+        # Fixed rate: a slow sample shortens the next sleep, missed ticks are skipped
+        next_sample += args.watch
+        now = time.monotonic()
+        if next_sample < now:
+            next_sample = now + (next_sample - now) % args.watch
+        time.sleep(next_sample - now)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m system_toolbox", description="VBox system toolbox")
+    commands = parser.add_subparsers(dest="command")
+    gui = commands.add_parser("gui", help="Start the graphical interface (default)")
+    gui.add_argument("--trace", metavar="FILE", help="record timing spans and write a Chrome trace to FILE on exit")
+    daemon = commands.add_parser("daemon", help="Run the collector shared by all VBox windows and commands")
+    daemon.add_argument("--socket", help="Unix socket path (default: $XDG_RUNTIME_DIR/vbox/collector.sock)")
+    exporter = commands.add_parser("exporter", help="Serve metrics for Prometheus on /metrics")
+    exporter.add_argument("--address", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+    exporter.add_argument("--port", type=int, default=9877, help="port to listen on (default: %(default)s)")
+    exporter.add_argument("--interval", type=float, default=15.0, help="seconds a sample is reused (default: %(default)s)")
+    exporter.add_argument("--top", type=int, default=20, help="processes exported individually (default: %(default)s)")
+    record = commands.add_parser("record", help="Record memory, process and disk samples to a file")
+    record.add_argument("file", help="recording to create or append to")
+    record.add_argument("--interval", type=float, default=2.0, help="seconds between samples (default: %(default)s)")
+    record.add_argument("--duration", type=float, help="stop after this many seconds (default: until Ctrl+C)")
+    replay = commands.add_parser("replay", help="Play a recording in the RAM and Disk tabs")
+    replay.add_argument("file", help="recording made with the record command")
+    replay.add_argument("--speed", type=float, default=1.0, help="playback speed (default: %(default)s)")
+    for name, (_, help_text) in COMMANDS.items():
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--format", choices=["table", "ndjson"], default="table")
+        command.add_argument("--watch", type=float, metavar="SECONDS", help="sample again every SECONDS")
+        command.add_argument("--count", type=int, help="stop after this many samples")
+        command.add_argument("--local", action="store_true", help="collect in this process even if a collector runs")
+        if name == "disks":
+            command.add_argument("--all", action="store_true", help="include virtual filesystems")
+        if name == "processes":
+            command.add_argument("--top", type=int, help="only the N largest processes")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command in (None, "gui"):
+        if getattr(args, "trace", None):
+            from system_toolbox.tracing import dump_at_exit
+            dump_at_exit(args.trace)
+        from system_toolbox.main import main as gui_main
+        return gui_main()
+    if args.command == "daemon":
+        from system_toolbox.collector_daemon import CollectorDaemon, CollectorError
+        try:
+            CollectorDaemon(args.socket).run()
+        except (CollectorError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+    if args.command == "exporter":
+        from system_toolbox.exporter import serve
+        try:
+            serve(args.address, args.port, args.interval, args.top)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+    if args.command == "record":
+        from system_toolbox.recording import record, RecordingError
+        if args.interval <= 0:
+            print("--interval needs a positive number of seconds", file=sys.stderr)
+            return 2
+        print(f"Recording to {args.file} every {args.interval:g} s, Ctrl+C to stop", file=sys.stderr)
+        try:
+            count = record(args.file, args.interval, args.duration)
+        except (RecordingError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Recorded {count} samples", file=sys.stderr)
+        return 0
+    if args.command == "replay":
+        from system_toolbox.recording import RecordingError
+        from system_toolbox.replay_window import main as replay_main
+        try:
+            return replay_main(args.file, args.speed)
+        except (RecordingError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    if args.watch is not None and args.watch <= 0:
+        print("--watch needs a positive interval", file=sys.stderr)
+        return 2
+    from system_toolbox.collector import CollectorError
+    try:
+        return run(args)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Output piped into head & co.; keep the interpreter from flushing into the closed pipe at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (RuntimeError, CollectorError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
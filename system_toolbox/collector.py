@@ -0,0 +1,177 @@
+import os
+import stat
+import socket
+import threading
+import time
+from system_toolbox import wire
+from system_toolbox.package_manager import BasePackageManager, PackageList
+
+# Package scans take a few seconds
+CLIENT_TIMEOUT = 30.0
+# Seconds between attempts to reach a daemon that was not running
+RECONNECT_INTERVAL = 10.0
+
+class CollectorError(Exception):
+    pass
+
+def socket_path():
+    """$XDG_RUNTIME_DIR/vbox/collector.sock, or a private directory in /tmp."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    base = os.path.join(runtime, "vbox") if runtime else f"/tmp/vbox-{os.getuid()}"
+    return os.path.join(base, "collector.sock")
+
+def check_private_dir(directory):
+    """
+    Raises PermissionError unless `directory` is a real directory owned by this user with
+    mode 0700. In /tmp another user could create it first and serve fake data (PIDs to kill).
+    """
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) != 0o700:
+        raise PermissionError(f"{directory} is not a private directory of this user")
+
+def apply_update(data, message):
+    """Applies an update message to the previous data of its topic; returns the new data."""
+    if message["full"]:
+        return message["data"]
+    data = dict(data)
+    data.update(message["changed"])
+    for key in message["removed"]:
+        data.pop(key, None)
+    return data
+
+class CollectorClient:
+    """
+    Blocking client of a running collector daemon (see collector_daemon.py), safe to share between threads.
+    It keeps the last data of every topic, so the daemon only sends what changed.
+    After a connection error `connected` is False and every call raises CollectorError:
+    callers then collect in-process.
+    """
+    def __init__(self, path=None, timeout=CLIENT_TIMEOUT):
+        self.path = path or socket_path()
+        check_private_dir(os.path.dirname(self.path))
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(self.path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.data = {}
+        self.connected = True
+        self.lock = threading.Lock()
+
+    def _receive_exactly(self, size):
+        chunks = []
+        while size:
+            chunk = self.sock.recv(min(size, 1024 * 1024))
+            if not chunk:
+                raise ConnectionError("Collector closed the connection")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def _receive(self):
+        header = self._receive_exactly(wire.HEADER_SIZE)
+        return wire.decode(self._receive_exactly(wire.frame_length(header)))
+
+    def _apply(self, message):
+        if "error" in message:
+            raise CollectorError(message["error"])
+        topic = message["topic"]
+        self.data[topic] = apply_update(self.data.get(topic), message)
+        return topic, self.data[topic]
+
+    def get(self, topic, fresh=False):
+        """Current data of a topic: a dict keyed by pid / mountpoint / package, or the "ram" dict."""
+        with self.lock:
+            if not self.connected:
+                raise CollectorError("Not connected to the collector")
+            try:
+                self.sock.sendall(wire.frame({"op": "get", "topic": topic, "fresh": fresh}))
+                message = self._receive()
+            except (OSError, wire.WireError) as e:
+                self.close()
+                raise CollectorError(f"Lost the collector: {e}") from e
+            return self._apply(message)[1]
+
+    def subscribe(self, topics):
+        """
+        Generator of (topic, data), one per update pushed by the daemon. The connection
+        is used for nothing else afterwards; it ends with CollectorError when the daemon goes away.
+        """
+        with self.lock:
+            try:
+                self.sock.settimeout(None)
+                self.sock.sendall(wire.frame({"op": "subscribe", "topics": list(topics)}))
+            except OSError as e:
+                self.close()
+                raise CollectorError(f"Lost the collector: {e}") from e
+        while True:
+            try:
+                message = self._receive()
+            except (OSError, wire.WireError) as e:
+                self.close()
+                raise CollectorError(f"Lost the collector: {e}") from e
+            yield self._apply(message)
+
+    def close(self):
+        self.connected = False
+        self.sock.close()
+
+def connect_collector(path=None):
+    """A client of the running collector daemon, or None when there is none."""
+    try:
+        return CollectorClient(path)
+    except OSError:
+        return None
+
+class CollectorConnection:
+    """
+    The collector client of one tab or command, safe to share between threads.
+    client() returns a connected CollectorClient, or None while there is no daemon. A daemon
+    started or restarted later is picked up, trying at most once every `interval` seconds.
+    """
+    def __init__(self, path=None, interval=RECONNECT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._client = None
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+    def client(self):
+        with self._lock:
+            if self._client is not None and self._client.connected:
+                return self._client
+            now = time.monotonic()
+            if now < self._next_attempt:
+                return None
+            self._next_attempt = now + self.interval
+            self._client = connect_collector(self.path)
+            return self._client
+
+class RemotePackageManager(BasePackageManager):
+    """
+    Package inventory from the collector daemon, so several windows share one scan.
+    Uninstall commands, and the inventory while no daemon runs, come from `local`.
+    """
+    def __init__(self, connection, local):
+        self.connection = connection
+        self.local = local
+
+    def list_installed(self):
+        client = self.connection.client()
+        if client is not None:
+            try:
+                packages = PackageList()
+                for pkg in client.get("packages").values():
+                    packages.add(**pkg)
+                return packages
+            except CollectorError as e:
+                print(f"Error reading packages from the collector: {e}")
+        return self.local.list_installed()
+
+    def uninstall_cmd(self, pkg_name):
+        return self.local.uninstall_cmd(pkg_name)
+
+    def uninstall_many_cmd(self, pkg_names):
+        return self.local.uninstall_many_cmd(pkg_names)
@@ -0,0 +1,261 @@
+import os
+import time
+import signal
+import asyncio
+from system_toolbox import wire
+from system_toolbox.collector import socket_path, connect_collector, check_private_dir, CollectorError
+from system_toolbox.package_manager import package_db_signature
+
+# Sampling interval of each topic while a client subscribes, and the oldest sample a plain "get" accepts
+INTERVALS = {"ram": 2.0, "processes": 2.0, "disks": 10.0, "packages": 600.0}
+# Oldest sample a "get" with "fresh" accepts (a user pressed Refresh, a mount changed)
+FRESH_AGE = 1.0
+# How often subscribed topics are checked for being due
+POLL_TICK = 0.25
+
+def package_key(pkg):
+    return f"{pkg['type']}/{pkg['name']}/{pkg['version']}"
+
+def diff(old, new):
+    """(changed, removed) turning keyed snapshot `old` into `new`."""
+    changed = {key: value for key, value in new.items() if old.get(key) != value}
+    removed = [key for key in old if key not in new]
+    return changed, removed
+
+class Topic:
+    """
+    One kind of data the daemon collects. Keyed topics (a dict of records) are sent
+    as deltas against what the connection already has; others are sent whole.
+    """
+    def __init__(self, name, collect, keyed=True, changed=None):
+        self.name = name
+        self.collect = collect
+        self.interval = INTERVALS[name]
+        self.keyed = keyed
+        self.changed = changed # cheap check forcing a new sample before the interval is up
+        self.data = None
+        self.version = 0
+        self.sampled = None
+        self.subscribers = 0
+        self.lock = asyncio.Lock()
+        self.updated = asyncio.Condition()
+
+    def stale(self, max_age):
+        if self.sampled is None or time.monotonic() - self.sampled >= max_age:
+            return True
+        return self.changed is not None and self.changed()
+
+async def read_message(reader):
+    """Next message from a stream, or None at end of stream."""
+    try:
+        header = await reader.readexactly(wire.HEADER_SIZE)
+        payload = await reader.readexactly(wire.frame_length(header))
+    except asyncio.IncompleteReadError:
+        return None
+    return wire.decode(payload)
+
+class CollectorDaemon:
+    """
+    Samples processes, memory, disks and the package inventory once for every VBox
+    window and command line client, and serves them over a Unix domain socket.
+    Each message is a MessagePack map with a 4 byte length prefix (see wire.py).
+
+    Requests:
+    - {"op": "get", "topic": t, "fresh": bool}: one update of topic t (a sample no older
+      than the topic's interval, or FRESH_AGE with "fresh").
+    - {"op": "subscribe", "topics": [...]}: the connection then only receives updates,
+      pushed whenever a topic changes. A slow reader skips intermediate samples.
+    Updates are {"topic", "version", "full": True, "data"} or, for keyed topics on a
+    connection that already has an earlier version, {"topic", "version", "full": False,
+    "changed": {key: record}, "removed": [keys]}. Failures are answered with {"error"}.
+    Topics are only sampled while someone asks for them.
+    """
+    def __init__(self, path=None):
+        from system_toolbox.process_tree import ProcessTree
+        from system_toolbox.memory_pressure import MemoryPressureMonitor
+        from system_toolbox.mounts import DiskUsageSampler
+        from system_toolbox.package_manager import get_package_manager
+
+        self.path = path or socket_path()
+        self.tree = ProcessTree()
+        self.pressure = MemoryPressureMonitor()
+        self.sampler = DiskUsageSampler()
+        self.manager = get_package_manager()
+        self.package_signature = None
+        self.topics = {topic.name: topic for topic in [
+            Topic("ram", self.collect_ram, keyed=False),
+            Topic("processes", self.collect_processes),
+            Topic("disks", self.collect_disks, changed=self.sampler.watcher.changed),
+            Topic("packages", self.collect_packages, changed=lambda: package_db_signature() != self.package_signature),
+        ]}
+        self.stopping = None
+        self.connections = {} # handler task -> writer
+
+    # 1. Collectors (run on the executor, one at a time per topic)
+
+    def collect_ram(self):
+        from system_toolbox.system_info import get_ram_usage
+        self.pressure.sample()
+        return {"usage": get_ram_usage(), "pressure": self.pressure.snapshot()}
+
+    def collect_processes(self):
+        self.tree.update()
+        return {row["pid"]: row for row in self.tree.process_rows()}
+
+    def collect_disks(self):
+        return {disk["mountpoint"]: disk for disk in self.sampler.sample()}
+
+    def collect_packages(self):
+        if self.manager is None:
+            raise CollectorError("Unsupported distribution")
+        self.package_signature = package_db_signature()
+        packages = (pkg.as_dict() for pkg in self.manager.list_installed())
+        return {package_key(pkg): pkg for pkg in packages}
+
+    # 2. Sampling
+
+    async def refresh(self, topic, max_age):
+        async with topic.lock:
+            if not topic.stale(max_age):
+                return
+            data = await asyncio.get_running_loop().run_in_executor(None, topic.collect)
+            topic.sampled = time.monotonic()
+            if data != topic.data:
+                topic.data = data
+                topic.version += 1
+                async with topic.updated:
+                    topic.updated.notify_all()
+
+    async def refresh_quietly(self, topic):
+        try:
+            await self.refresh(topic, topic.interval)
+        except Exception as e:
+            print(f"Error collecting {topic.name}: {e}")
+
+    async def poll(self):
+        while True:
+            for topic in self.topics.values():
+                if topic.subscribers and not topic.lock.locked() and topic.stale(topic.interval):
+                    # Topics refresh independently: a package scan does not hold up the RAM samples
+                    asyncio.ensure_future(self.refresh_quietly(topic))
+            await asyncio.sleep(POLL_TICK)
+
+    # 3. Connections
+
+    async def send(self, writer, write_lock, message):
+        async with write_lock:
+            writer.write(wire.frame(message))
+            await writer.drain()
+
+    async def send_update(self, writer, write_lock, topic, sent):
+        """Sends the current data of `topic`, as a delta against what this connection has."""
+        version, data = topic.version, topic.data
+        message = {"topic": topic.name, "version": version}
+        previous = sent.get(topic.name)
+        if previous is None or not topic.keyed:
+            message["full"] = True
+            message["data"] = data
+        else:
+            changed, removed = diff(previous, data)
+            message.update(full=False, changed=changed, removed=removed)
+        # Snapshots are replaced, never modified, so keeping a reference is enough
+        sent[topic.name] = data
+        await self.send(writer, write_lock, message)
+
+    async def push(self, topic, writer, write_lock, sent):
+        topic.subscribers += 1
+        sent_version = None
+        try:
+            await self.refresh_quietly(topic)
+            while True:
+                async with topic.updated:
+                    await topic.updated.wait_for(lambda: topic.data is not None and topic.version != sent_version)
+                sent_version = topic.version
+                await self.send_update(writer, write_lock, topic, sent)
+        finally:
+            topic.subscribers -= 1
+
+    async def handle(self, reader, writer):
+        sent = {} # topic name -> data this connection last received
+        write_lock = asyncio.Lock()
+        pushers = []
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                request = await read_message(reader)
+                if request is None:
+                    break
+                if not isinstance(request, dict):
+                    await self.send(writer, write_lock, {"error": f"Expected a map, got {type(request).__name__}"})
+                    continue
+                op = request.get("op")
+                if op == "get":
+                    topic = self.topics.get(request.get("topic"))
+                    if topic is None:
+                        await self.send(writer, write_lock, {"error": f"Unknown topic {request.get('topic')!r}"})
+                        continue
+                    try:
+                        await self.refresh(topic, FRESH_AGE if request.get("fresh") else topic.interval)
+                    except Exception as e:
+                        await self.send(writer, write_lock, {"error": f"Error collecting {topic.name}: {e}"})
+                        continue
+                    await self.send_update(writer, write_lock, topic, sent)
+                elif op == "subscribe":
+                    for name in request.get("topics", []):
+                        if name in self.topics:
+                            pushers.append(asyncio.ensure_future(self.push(self.topics[name], writer, write_lock, sent)))
+                else:
+                    await self.send(writer, write_lock, {"error": f"Unknown request {op!r}"})
+        except (ConnectionError, wire.WireError):
+            pass
+        finally:
+            for pusher in pushers:
+                pusher.cancel()
+            writer.close()
+            self.connections.pop(asyncio.current_task(), None)
+
+    async def serve(self):
+        directory = os.path.dirname(self.path)
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        # An existing directory is only trusted when it is ours and private
+        check_private_dir(directory)
+        if os.path.exists(self.path):
+            running = connect_collector(self.path)
+            if running is not None:
+                running.close()
+                raise CollectorError(f"A collector is already running on {self.path}")
+            os.unlink(self.path) # left behind by a daemon that was killed
+
+        loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stopping.set)
+
+        # Only the owner may connect: the data includes every process and command line
+        old_umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.handle, path=self.path)
+        finally:
+            os.umask(old_umask)
+        print(f"Collector listening on {self.path}")
+        poller = asyncio.ensure_future(self.poll())
+        try:
+            async with server:
+                await self.stopping.wait()
+        finally:
+            poller.cancel()
+            # Closing a connection ends its handler at the next read
+            handlers = list(self.connections)
+            for writer in self.connections.values():
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def run(self):
+        asyncio.run(self.serve())
@@ -0,0 +1,72 @@
+import os
+import glob
+
+# Locations scanned for .desktop launchers (system, user, Snap and Flatpak exports)
+DESKTOP_PATHS = [
+    "/usr/share/applications",
+    "/usr/local/share/applications",
+    os.path.expanduser("~/.local/share/applications"),
+    "/var/lib/snapd/desktop/applications",
+    "/var/lib/flatpak/exports/share/applications",
+    os.path.expanduser("~/.local/share/flatpak/exports/share/applications")
+]
+
+def find_desktop_files(paths=None):
+    """
+    Returns the list of .desktop files found in the given directories.
+    """
+    all_desktop_files = []
+    for path in (paths if paths is not None else DESKTOP_PATHS):
+        if os.path.exists(path):
+            all_desktop_files.extend(glob.glob(os.path.join(path, "*.desktop")))
+    return all_desktop_files
+
+def parse_desktop_file(filepath):
+    """
+    Parses the fields VBox cares about from a .desktop file.
+    Returns a dictionary, or None if the file cannot be read.
+    """
+    try:
+        filename = os.path.basename(filepath).lower()
+        key_filename = filename[:-8] # remove .desktop
+
+        icon = None
+        exec_name = None
+        app_name = None
+        startup_class = None
+        cmd_path = None
+
+        with open(filepath, 'r', errors='ignore') as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("Icon="):
+                    icon = line.split("=", 1)[1].strip()
+                    icon = icon.replace('"', '').replace("'", "")
+                    if icon.startswith("~"):
+                        icon = os.path.expanduser(icon)
+                    if not os.path.isabs(icon):
+                        base, ext = os.path.splitext(icon)
+                        if ext in ['.png', '.svg', '.xpm', '.ico']:
+                            icon = base
+                elif line.startswith("Exec="):
+                    cmd = line.split("=", 1)[1].strip()
+                    cmd = cmd.replace('"', '').replace("'", "")
+                    cmd_path = cmd.split()[0]
+                    exec_name = os.path.basename(cmd_path).lower()
+                elif line.startswith("Name="):
+                    app_name = line.split("=", 1)[1].strip()
+                elif line.startswith("StartupWMClass="):
+                    startup_class = line.split("=", 1)[1].strip().lower()
+
+        return {
+            'filepath': filepath,
+            'filename': filename,
+            'key_filename': key_filename,
+            'icon': icon,
+            'exec_name': exec_name,
+            'app_name': app_name,
+            'startup_class': startup_class,
+            'cmd_path': cmd_path
+        }
+    except Exception:
+        return None
@@ -0,0 +1,196 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox, QWidget,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox,
+    QTabWidget, QPlainTextEdit, QSplitter
+)
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFontDatabase
+from system_toolbox import tracing
+from system_toolbox.watchdog import bucket_labels
+
+# Columns: (header, stats key, format)
+STAT_COLUMNS = [
+    ("Span", None, None),
+    ("Count", "count", "{:,}"),
+    ("p50 (ms)", "p50_ms", "{:.2f}"),
+    ("p99 (ms)", "p99_ms", "{:.2f}"),
+    ("Max (ms)", "max_ms", "{:.2f}"),
+    ("Total (ms)", "total_ms", "{:,.1f}"),
+]
+
+class NumericItem(QTableWidgetItem):
+    def __lt__(self, other):
+        return self.data(Qt.UserRole) < other.data(Qt.UserRole)
+
+class DiagnosticsDialog(QDialog):
+    """
+    Hidden panel (Ctrl+Shift+D) with the timing spans of this session (per-span
+    counts and p50 / p99) and the GUI stalls caught by the StallWatchdog.
+    Refreshed every second while open.
+    """
+    def __init__(self, watchdog, parent=None):
+        super().__init__(parent)
+        self.watchdog = watchdog
+        self.setWindowTitle("Diagnostics")
+        self.resize(800, 550)
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.chk_enabled = QCheckBox("Record timings")
+        self.chk_enabled.setChecked(tracing.enabled)
+        self.chk_enabled.toggled.connect(tracing.enable)
+        controls.addWidget(self.chk_enabled)
+        self.chk_stalls = QCheckBox("Detect UI stalls")
+        self.chk_stalls.setChecked(watchdog.running)
+        self.chk_stalls.toggled.connect(self.on_stalls_toggled)
+        controls.addWidget(self.chk_stalls)
+        controls.addStretch()
+
+        btn_reset = QPushButton("Reset")
+        btn_reset.clicked.connect(self.on_reset)
+        controls.addWidget(btn_reset)
+        btn_save = QPushButton("Save Chrome Trace...")
+        btn_save.setObjectName("primaryBtn")
+        btn_save.clicked.connect(self.save_trace)
+        controls.addWidget(btn_save)
+        layout.addLayout(controls)
+
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
+
+        # 1. Spans
+        spans = QWidget()
+        spans_layout = QVBoxLayout(spans)
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(STAT_COLUMNS))
+        self.table.setHorizontalHeaderLabels([column[0] for column in STAT_COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setShowGrid(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(5, Qt.DescendingOrder)
+        spans_layout.addWidget(self.table)
+
+        self.hint_label = QLabel()
+        self.hint_label.setObjectName("subHeaderLabel")
+        spans_layout.addWidget(self.hint_label)
+        self.tabs.addTab(spans, "Spans")
+
+        # 2. Stalls: histogram, the code they were caught in, and its stack
+        stalls = QWidget()
+        stalls_layout = QVBoxLayout(stalls)
+        self.histogram_label = QLabel()
+        self.histogram_label.setObjectName("subHeaderLabel")
+        self.histogram_label.setWordWrap(True)
+        stalls_layout.addWidget(self.histogram_label)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.culprit_table = QTableWidget()
+        self.culprit_table.setColumnCount(4)
+        self.culprit_table.setHorizontalHeaderLabels(["Stalled In", "Stalls", "Total (ms)", "Worst (ms)"])
+        self.culprit_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.culprit_table.verticalHeader().setVisible(False)
+        self.culprit_table.setShowGrid(False)
+        self.culprit_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.culprit_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.culprit_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.culprit_table.itemSelectionChanged.connect(self.show_stack)
+        splitter.addWidget(self.culprit_table)
+        self.stack_view = QPlainTextEdit()
+        self.stack_view.setReadOnly(True)
+        self.stack_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.stack_view.setPlaceholderText("Select a row to see the stack of its longest stall.")
+        splitter.addWidget(self.stack_view)
+        stalls_layout.addWidget(splitter)
+        self.tabs.addTab(stalls, "UI Stalls")
+        self.stacks = {} # location -> stack text of its worst stall
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def refresh(self):
+        self.refresh_spans()
+        self.refresh_stalls()
+
+    def refresh_spans(self):
+        stats = tracing.stats()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(stats))
+        for row, (name, values) in enumerate(sorted(stats.items())):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            for col, (_, key, fmt) in enumerate(STAT_COLUMNS[1:], start=1):
+                item = NumericItem(fmt.format(values[key]))
+                item.setData(Qt.UserRole, values[key])
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+        if not stats:
+            self.hint_label.setText(
+                "No spans recorded yet." if tracing.enabled else "Timing is off: check \"Record timings\" or start with VBOX_TRACE=1."
+            )
+        else:
+            self.hint_label.setText(f"Percentiles cover the last {tracing.SAMPLES_PER_SPAN:,} calls of each span.")
+
+    def refresh_stalls(self):
+        snapshot = self.watchdog.snapshot()
+        if not self.watchdog.running and not snapshot["stalls"]:
+            self.histogram_label.setText("Stall detection is off: check \"Detect UI stalls\" or start with VBOX_TRACE=1.")
+        else:
+            counts = "   ".join(f"{label}: {count}" for label, count in zip(bucket_labels(), snapshot["histogram"]))
+            self.histogram_label.setText(f"Stalls by duration   {counts}")
+
+        selected = self.selected_location()
+        culprits = sorted(snapshot["culprits"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        self.stacks = {location: culprit["stack"] for location, culprit in culprits}
+        self.culprit_table.blockSignals(True)
+        self.culprit_table.setRowCount(len(culprits))
+        for row, (location, culprit) in enumerate(culprits):
+            self.culprit_table.setItem(row, 0, QTableWidgetItem(location))
+            for col, text in enumerate([f"{culprit['count']:,}", f"{culprit['total_ms']:,.0f}", f"{culprit['worst_ms']:,.0f}"], start=1):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.culprit_table.setItem(row, col, item)
+            if location == selected:
+                self.culprit_table.selectRow(row)
+        self.culprit_table.blockSignals(False)
+
+    def selected_location(self):
+        rows = self.culprit_table.selectionModel().selectedRows()
+        return self.culprit_table.item(rows[0].row(), 0).text() if rows else None
+
+    def show_stack(self):
+        self.stack_view.setPlainText(self.stacks.get(self.selected_location(), ""))
+
+    def on_stalls_toggled(self, checked):
+        if checked:
+            self.watchdog.start()
+        else:
+            self.watchdog.stop()
+        self.refresh_stalls()
+
+    def on_reset(self):
+        tracing.reset()
+        self.watchdog.reset()
+        self.stack_view.clear()
+        self.refresh()
+
+    def save_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Chrome Trace", "vbox-trace.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            tracing.dump_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Could not save the trace:\n{e}")
@@ -0,0 +1,266 @@
+import os
+import stat
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+NO_NODE = -1
+
+class DirTree:
+    """
+    Directory tree stored in flat arrays, one slot per directory.
+    Files are never stored: their sizes are folded into the directory holding them,
+    so memory grows with the number of directories, not the number of files.
+    """
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self.names = []
+        self.parent = array('q')
+        self.first_child = array('q')
+        self.next_sibling = array('q')
+        self.own_size = array('Q') # bytes allocated by the directory itself and its files
+        self.own_files = array('Q') # files directly in the directory
+        self.total_size = array('Q') # own_size of the whole subtree
+        self.file_count = array('Q') # files in the whole subtree
+        self.mtime = array('d')
+        self.complete = False
+        self.add(NO_NODE, root_path, 0.0)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, parent, name, mtime):
+        idx = len(self.names)
+        self.names.append(name)
+        self.parent.append(parent)
+        self.first_child.append(NO_NODE)
+        self.own_size.append(0)
+        self.own_files.append(0)
+        self.total_size.append(0)
+        self.file_count.append(0)
+        self.mtime.append(mtime)
+        # Link as first child; readers on other threads only ever see complete links
+        if parent != NO_NODE:
+            self.next_sibling.append(self.first_child[parent])
+            self.first_child[parent] = idx
+        else:
+            self.next_sibling.append(NO_NODE)
+        return idx
+
+    def add_size(self, idx, size, files=0):
+        """Adds bytes (and files) to a directory and all of its ancestors."""
+        self.own_size[idx] += size
+        self.own_files[idx] += files
+        while idx != NO_NODE:
+            self.total_size[idx] += size
+            self.file_count[idx] += files
+            idx = self.parent[idx]
+
+    def children(self, idx):
+        result = []
+        child = self.first_child[idx]
+        while child != NO_NODE:
+            result.append(child)
+            child = self.next_sibling[child]
+        return result
+
+    def path(self, idx):
+        parts = []
+        while idx > 0:
+            parts.append(self.names[idx])
+            idx = self.parent[idx]
+        return os.path.join(self.root_path, *reversed(parts))
+
+    def find(self, path):
+        """Returns the index of a directory below the root, or None."""
+        rel = os.path.relpath(path, self.root_path)
+        idx = 0
+        if rel == ".":
+            return idx
+        for part in rel.split(os.sep):
+            for child in self.children(idx):
+                if self.names[child] == part:
+                    idx = child
+                    break
+            else:
+                return None
+        return idx
+
+class DirectoryScanner:
+    """
+    Parallel os.scandir walker computing per-directory disk usage (allocated blocks, like du).
+    - Stays on the filesystem of the root directory.
+    - Files with several hard links are counted once, by (st_dev, st_ino).
+    - Totals are updated live, so another thread can read partial results from self.tree.
+    - Given the tree of an earlier scan (`previous`), directories whose mtime did not change
+      are not listed again: their own size and file count are reused and only their
+      subdirectories are stat()ed. Files that grew in place inside such a directory are
+      not noticed, the same trade-off other incremental disk usage tools make.
+      Reused directories also skip the hard link check: their inodes are not recorded,
+      so a file linked from both a reused and a re-listed directory is counted in each.
+    - file_visitor(dir_path, [(name, stat_result)]) is called from the worker threads once per
+      listed directory with its files (hard links deduplicated). Directories reused from
+      `previous` are not listed, so they are not visited either.
+    """
+    def __init__(self, root, workers=8, previous=None, file_visitor=None):
+        self.root = os.path.abspath(root)
+        self.workers = workers
+        self.file_visitor = file_visitor
+        self.tree = DirTree(self.root)
+        self.previous = None
+        self.set_previous(previous)
+        self.errors = 0
+        self.files = 0
+        self.reused = 0 # directories taken over from `previous`
+        self._old_index = {} # index in self.tree -> index in self.previous, for pending directories
+        self._cancel = threading.Event()
+        self._seen_inodes = set()
+        self._inode_lock = threading.Lock()
+
+    def set_previous(self, previous):
+        """Uses an earlier tree of the same root for an incremental scan (call before scan())."""
+        if previous is not None and previous.root_path == self.root:
+            self.previous = previous
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def scan(self, progress=None, progress_interval=0.25):
+        """
+        Walks the tree. progress(scanner) is called from this thread at most every
+        `progress_interval` seconds. Returns the DirTree (complete unless cancelled).
+        """
+        tree = self.tree
+        try:
+            st = os.stat(self.root)
+        except OSError as e:
+            print(f"Error scanning {self.root}: {e}")
+            return tree
+        self.root_dev = st.st_dev
+        tree.mtime[0] = st.st_mtime
+        tree.add_size(0, st.st_blocks * 512)
+
+        if self.previous is not None:
+            self._old_index[0] = 0
+
+        # Directories waiting to be listed (depth first keeps this small)
+        pending = deque([0])
+        in_flight = {}
+        max_in_flight = self.workers * 4
+        last_progress = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while (pending or in_flight) and not self.cancelled:
+                while pending and len(in_flight) < max_in_flight:
+                    idx = pending.pop()
+                    old = self._old_index.pop(idx, None)
+                    reuse = old is not None and self.previous.mtime[old] == tree.mtime[idx]
+                    if reuse:
+                        names = [self.previous.names[c] for c in self.previous.children(old)]
+                        future = executor.submit(self._stat_subdirs, tree.path(idx), names)
+                    else:
+                        future = executor.submit(self._scan_dir, tree.path(idx))
+                    in_flight[future] = (idx, old, reuse)
+
+                done, _ = wait(in_flight, timeout=progress_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, old, reuse = in_flight.pop(future)
+                    files_size, file_count, subdirs, error = future.result()
+                    if error:
+                        self.errors += 1
+                    if reuse:
+                        # Unchanged listing: take the files over from the previous scan.
+                        # own_size already holds the directory's own blocks at this point.
+                        # The files are not listed, so their inodes never reach _seen_inodes.
+                        files_size = max(self.previous.own_size[old] - tree.own_size[idx], 0)
+                        file_count = self.previous.own_files[old]
+                        self.reused += 1
+                    self.files += file_count
+                    tree.add_size(idx, files_size, file_count)
+
+                    old_children = {}
+                    if old is not None:
+                        old_children = {self.previous.names[c]: c for c in self.previous.children(old)}
+                    for name, mtime, blocks in subdirs:
+                        child = tree.add(idx, name, mtime)
+                        tree.add_size(child, blocks)
+                        if name in old_children:
+                            self._old_index[child] = old_children[name]
+                        pending.append(child)
+
+                now = time.monotonic()
+                if progress and now - last_progress >= progress_interval:
+                    last_progress = now
+                    progress(self)
+
+            if self.cancelled:
+                for future in in_flight:
+                    future.cancel()
+
+        tree.complete = not self.cancelled
+        if progress:
+            progress(self)
+        return tree
+
+    def _scan_dir(self, path):
+        """
+        Lists one directory. Returns (files_size, file_count, [(name, mtime, blocks)], error).
+        """
+        files_size = 0
+        file_count = 0
+        subdirs = []
+        files = [] if self.file_visitor else None
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if self._cancel.is_set():
+                        break
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if entry.is_dir(follow_symlinks=False):
+                            # Do not cross into other filesystems mounted below the root
+                            if st.st_dev == self.root_dev:
+                                subdirs.append((entry.name, st.st_mtime, st.st_blocks * 512))
+                            continue
+                    except OSError:
+                        continue
+
+                    if st.st_nlink > 1:
+                        key = (st.st_dev, st.st_ino)
+                        with self._inode_lock:
+                            if key in self._seen_inodes:
+                                continue
+                            self._seen_inodes.add(key)
+                    files_size += st.st_blocks * 512
+                    file_count += 1
+                    if files is not None:
+                        files.append((entry.name, st))
+        except OSError:
+            return files_size, file_count, subdirs, True
+        finally:
+            if files:
+                self.file_visitor(path, files)
+        return files_size, file_count, subdirs, False
+
+    def _stat_subdirs(self, path, names):
+        """
+        Re-checks the subdirectories of an unchanged directory without listing it.
+        Returns the same tuple as _scan_dir, with no files.
+        """
+        subdirs = []
+        for name in names:
+            if self._cancel.is_set():
+                break
+            try:
+                st = os.lstat(os.path.join(path, name))
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode) and st.st_dev == self.root_dev:
+                subdirs.append((name, st.st_mtime, st.st_blocks * 512))
+        return 0, 0, subdirs, False
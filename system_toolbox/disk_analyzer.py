@@ -0,0 +1,263 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QTabWidget
+)
+from PySide6.QtCore import Qt, QThread, Signal, QTimer
+from system_toolbox.dir_scanner import DirectoryScanner, NO_NODE
+from system_toolbox.scan_snapshot import save_snapshot, load_snapshot, list_snapshots, SnapshotDiff
+from system_toolbox.widgets import TreemapWidget
+from system_toolbox.large_files_dialog import LargeFilesDialog
+from system_toolbox.system_info import format_size
+import time
+
+# Rows shown per directory level; a level can have hundreds of thousands of children
+MAX_ROWS = 500
+
+def format_change(size):
+    if size == 0:
+        return "0 B"
+    sign = "+" if size > 0 else "-"
+    return sign + format_size(abs(size))
+
+class ScanWorker(QThread):
+    progress = Signal(object) # (directories, files, bytes); sizes overflow a C int
+    finished = Signal(object, object) # DirTree, previous snapshot tree (or None)
+
+    def __init__(self, scanner, previous_path=None):
+        super().__init__()
+        self.scanner = scanner
+        self.previous_path = previous_path
+
+    def run(self):
+        # The last snapshot lets unchanged directories be skipped
+        previous = None
+        if self.previous_path:
+            try:
+                previous = load_snapshot(self.previous_path)
+                self.scanner.set_previous(previous)
+            except (OSError, ValueError) as e:
+                print(f"Error loading snapshot: {e}")
+
+        tree = self.scanner.scan(progress=self.report)
+        if tree.complete:
+            try:
+                save_snapshot(tree)
+            except OSError as e:
+                print(f"Error saving snapshot: {e}")
+        self.finished.emit(tree, previous)
+
+    def report(self, scanner):
+        tree = scanner.tree
+        self.progress.emit((len(tree), scanner.files, tree.total_size[0]))
+
+class DiskAnalyzerDialog(QDialog):
+    """
+    Drill-down view of the directories using the most space below a mountpoint.
+    The view is refreshed from the live scan totals while the scan is running.
+    """
+    def __init__(self, mountpoint, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Disk Usage - {mountpoint}")
+        self.resize(800, 600)
+        self.mountpoint = mountpoint
+        self.scanner = None
+        self.worker = None
+        self.tree = None
+        self.current = 0 # directory index being shown
+        self.diff = None # SnapshotDiff against the snapshot picked in compare_combo
+
+        layout = QVBoxLayout(self)
+
+        # Navigation
+        nav = QHBoxLayout()
+        self.btn_up = QPushButton("Up")
+        self.btn_up.clicked.connect(self.go_up)
+        nav.addWidget(self.btn_up)
+        self.path_label = QLabel(mountpoint)
+        self.path_label.setObjectName("subHeaderLabel")
+        nav.addWidget(self.path_label, 1)
+        nav.addWidget(QLabel("Compare with:"))
+        self.compare_combo = QComboBox()
+        self.compare_combo.currentIndexChanged.connect(self.on_compare_changed)
+        nav.addWidget(self.compare_combo)
+        self.btn_files = QPushButton("Large Files...")
+        self.btn_files.setEnabled(False)
+        self.btn_files.clicked.connect(self.open_large_files)
+        nav.addWidget(self.btn_files)
+        self.btn_scan = QPushButton("Cancel")
+        self.btn_scan.setObjectName("primaryBtn")
+        self.btn_scan.clicked.connect(self.on_scan_button)
+        nav.addWidget(self.btn_scan)
+        layout.addLayout(nav)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["Name", "Size", "Files", "% of Parent", "Change"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setShowGrid(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.cellDoubleClicked.connect(self.on_row_activated)
+
+        # Treemap of the same directory; double-click a block to zoom into it
+        self.treemap = TreemapWidget()
+        self.treemap.directory_activated.connect(self.open_directory)
+
+        self.views = QTabWidget()
+        self.views.addTab(self.table, "List")
+        self.views.addTab(self.treemap, "Treemap")
+        self.views.currentChanged.connect(lambda index: self.render_current())
+        layout.addWidget(self.views)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        # Partial totals are pulled from the live tree, not pushed per directory
+        self.view_timer = QTimer(self)
+        self.view_timer.setInterval(500)
+        self.view_timer.timeout.connect(self.render_current)
+
+        self.start_scan()
+
+    def start_scan(self):
+        snapshots = list_snapshots(self.mountpoint)
+        self.scanner = DirectoryScanner(self.mountpoint)
+        self.tree = self.scanner.tree
+        self.current = 0
+        self.diff = None
+        self.compare_combo.setEnabled(False)
+        self.btn_files.setEnabled(False)
+        self.worker = ScanWorker(self.scanner, snapshots[0][0] if snapshots else None)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_scan_finished)
+        self.btn_scan.setText("Cancel")
+        self.scan_started = time.time()
+        self.worker.start()
+        self.view_timer.start()
+        self.render_current()
+
+    def on_scan_button(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.scanner.cancel()
+        else:
+            self.start_scan()
+
+    def on_progress(self, progress):
+        directories, files, size = progress
+        self.status_label.setText(f"Scanning... {directories:,} folders, {files:,} files, {format_size(size)}")
+
+    def on_scan_finished(self, tree, previous):
+        self.view_timer.stop()
+        self.btn_scan.setText("Rescan")
+        state = "Scan complete" if tree.complete else "Scan cancelled"
+        errors = f", {self.scanner.errors} folders not readable" if self.scanner.errors else ""
+        reused = f", {self.scanner.reused:,} unchanged folders reused" if self.scanner.reused else ""
+        self.status_label.setText(
+            f"{state}: {len(tree):,} folders, {self.scanner.files:,} files, "
+            f"{format_size(tree.total_size[0])}{reused}{errors}"
+        )
+
+        # Offer the earlier snapshots for comparison, defaulting to the one this scan started from
+        self.compare_combo.blockSignals(True)
+        self.compare_combo.clear()
+        self.compare_combo.addItem("Nothing", None)
+        for path, created in list_snapshots(self.mountpoint):
+            if tree.complete and created >= self.scan_started:
+                continue # the snapshot of this scan
+            self.compare_combo.addItem(time.strftime("%Y-%m-%d %H:%M", time.localtime(created)), path)
+        if previous is not None and tree.complete and self.compare_combo.count() > 1:
+            self.compare_combo.setCurrentIndex(1)
+            self.diff = SnapshotDiff(previous, tree)
+        self.compare_combo.blockSignals(False)
+        self.compare_combo.setEnabled(tree.complete)
+        self.btn_files.setEnabled(tree.complete)
+        self.render_current()
+
+    def on_compare_changed(self, index):
+        path = self.compare_combo.itemData(index)
+        self.diff = None
+        if path:
+            try:
+                self.diff = SnapshotDiff(load_snapshot(path), self.tree)
+            except (OSError, ValueError) as e:
+                self.status_label.setText(f"Could not load snapshot: {e}")
+        self.render_current()
+
+    def render_current(self):
+        tree = self.tree
+        idx = self.current
+        self.path_label.setText(tree.path(idx))
+        self.btn_up.setEnabled(idx != 0)
+
+        children = tree.children(idx)
+        children.sort(key=lambda child: tree.total_size[child], reverse=True)
+        children = children[:MAX_ROWS]
+        parent_total = tree.total_size[idx] or 1
+
+        rows = []
+        for child in children:
+            size = tree.total_size[child]
+            rows.append((child, [
+                tree.names[child],
+                format_size(size),
+                f"{tree.file_count[child]:,}",
+                f"{size * 100.0 / parent_total:.1f}%",
+                format_change(self.diff.growth(child)) if self.diff else "",
+            ]))
+        # Folders that only exist in the snapshot compared against
+        if self.diff:
+            for name, size in self.diff.removed_children(idx):
+                rows.append((None, [f"{name} (deleted)", "", "", "", format_change(-size)]))
+
+        # Rows are already ordered by size, items are reused between refreshes
+        self.table.setUpdatesEnabled(False)
+        self.table.setRowCount(len(rows))
+        for row, (child, values) in enumerate(rows):
+            for col, text in enumerate(values):
+                item = self.table.item(row, col)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if col:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(row, col, item)
+                item.setText(text)
+            self.table.item(row, 0).setData(Qt.UserRole, child)
+        self.table.setUpdatesEnabled(True)
+
+        # Laid out on a worker thread, and only while the tab is shown
+        if self.views.currentWidget() is self.treemap:
+            self.treemap.set_root(tree, idx)
+
+    def on_row_activated(self, row, column):
+        item = self.table.item(row, 0)
+        if item is None:
+            return
+        child = item.data(Qt.UserRole)
+        if child is not None:
+            self.open_directory(child)
+
+    def open_directory(self, idx):
+        if self.tree.first_child[idx] != NO_NODE:
+            self.current = idx
+            self.render_current()
+
+    def open_large_files(self):
+        # The finished tree tells which folders can hold large files, so no second walk
+        dialog = LargeFilesDialog(self.mountpoint, tree=self.tree, parent=self)
+        dialog.exec()
+
+    def go_up(self):
+        if self.current != 0:
+            self.current = self.tree.parent[self.current]
+            self.render_current()
+
+    def done(self, result):
+        # Stop the walk when the dialog goes away (close button, Esc)
+        self.view_timer.stop()
+        if self.worker is not None and self.worker.isRunning():
+            self.scanner.cancel()
+            self.worker.wait()
+        self.treemap.stop()
+        super().done(result)
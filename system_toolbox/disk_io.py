@@ -0,0 +1,177 @@
+import os
+import stat
+import time
+from collections import deque
+
+# /proc/diskstats counts 512-byte sectors whatever the device's sector size
+SECTOR_SIZE = 512
+
+# Samples kept per device (at the 2 s Disk tab tick this is 2 minutes)
+HISTORY_LENGTH = 60
+
+# Block devices that are not disks
+IGNORED_PREFIXES = ("loop", "ram", "zram", "fd")
+
+def read_diskstats(proc_root="/proc"):
+    """
+    Returns {device name: [reads, reads merged, sectors read, ms reading,
+    writes, writes merged, sectors written, ms writing, in flight, ms doing I/O, weighted ms]}.
+    """
+    stats = {}
+    try:
+        with open(os.path.join(proc_root, "diskstats")) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 14:
+                    continue
+                stats[parts[2]] = [int(value) for value in parts[3:14]]
+    except OSError as e:
+        print(f"Error reading diskstats: {e}")
+    return stats
+
+def block_device_name(dev, sys_root="/sys"):
+    """Kernel name ("sda1", "dm-0") of a "major:minor" block device, or None."""
+    path = os.path.join(sys_root, "dev", "block", dev)
+    if not os.path.exists(path):
+        return None
+    return os.path.basename(os.path.realpath(path))
+
+def device_number(device):
+    """"major:minor" of a block device node such as /dev/sda1 or /dev/mapper/vg-root, or None."""
+    try:
+        st = os.stat(device)
+    except (OSError, ValueError):
+        return None
+    if not stat.S_ISBLK(st.st_mode):
+        return None
+    return f"{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"
+
+def disk_of(name, sys_root="/sys"):
+    """The device whose statistics cover `name`: the disk of a partition, else the device itself."""
+    path = os.path.realpath(os.path.join(sys_root, "class", "block", name))
+    if os.path.exists(os.path.join(path, "partition")):
+        return os.path.basename(os.path.dirname(path))
+    return name
+
+def parent_disks(name, sys_root="/sys"):
+    """Physical disks below a device, following dm / md slaves (LVM, LUKS, RAID)."""
+    name = disk_of(name, sys_root)
+    slaves_dir = os.path.join(sys_root, "class", "block", name, "slaves")
+    try:
+        slaves = os.listdir(slaves_dir)
+    except OSError:
+        slaves = []
+    if not slaves:
+        return [name]
+    result = []
+    for slave in slaves:
+        for disk in parent_disks(slave, sys_root):
+            if disk not in result:
+                result.append(disk)
+    return result
+
+def map_mounts(disk_info, sys_root="/sys"):
+    """
+    Maps partitions (entries of get_disk_usage() / DiskUsageSampler.sample()) to the
+    block device whose statistics they show up in. Returns {device name: [mountpoints]}.
+    """
+    result = {}
+    for disk in disk_info:
+        # btrfs and friends report an anonymous dev in mountinfo; the device node is exact
+        dev = device_number(disk["device"]) or disk.get("dev")
+        name = block_device_name(dev, sys_root) if dev else None
+        if name is None:
+            continue
+        result.setdefault(disk_of(name, sys_root), []).append(disk["mountpoint"])
+    return result
+
+class DiskIOMonitor:
+    """
+    Per-device throughput, IOPS, latency and utilization from deltas of
+    /proc/diskstats, with a rolling history per device.
+    """
+    def __init__(self, history_length=HISTORY_LENGTH, proc_root="/proc", sys_root="/sys"):
+        self.history_length = history_length
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.previous = None
+        self.previous_time = None
+        self.rates = {}
+        self.history = {}
+        self.device_info = {} # device -> (label, parent disks), read once per device
+
+    def devices(self):
+        try:
+            names = os.listdir(os.path.join(self.sys_root, "block"))
+        except OSError:
+            return []
+        return sorted(name for name in names if not name.startswith(IGNORED_PREFIXES))
+
+    def label(self, name):
+        """dm devices are shown with their mapper name (vg-root, luks-...)."""
+        try:
+            with open(os.path.join(self.sys_root, "block", name, "dm", "name")) as f:
+                return f.read().strip()
+        except OSError:
+            return name
+
+    def sample(self):
+        now = time.monotonic()
+        stats = read_diskstats(self.proc_root)
+        devices = self.devices()
+
+        if self.previous is not None and now > self.previous_time:
+            elapsed = now - self.previous_time
+            rates = {}
+            for name in devices:
+                current = stats.get(name)
+                previous = self.previous.get(name)
+                if current is None or previous is None:
+                    continue
+                # Counters only go back on device re-creation; treat that as no activity
+                delta = [max(c - p, 0) for c, p in zip(current, previous)]
+                ios = delta[0] + delta[4]
+                rates[name] = {
+                    "read_bytes": delta[2] * SECTOR_SIZE / elapsed,
+                    "write_bytes": delta[6] * SECTOR_SIZE / elapsed,
+                    "read_iops": delta[0] / elapsed,
+                    "write_iops": delta[4] / elapsed,
+                    "latency_ms": (delta[3] + delta[7]) / ios if ios else 0.0,
+                    "utilization": min(delta[9] / (elapsed * 10.0), 100.0), # ms busy per second -> %
+                    "in_flight": current[8],
+                }
+            self.rates = rates
+
+            for name, values in rates.items():
+                history = self.history.setdefault(name, {
+                    key: deque(maxlen=self.history_length) for key in ("throughput", "utilization")
+                })
+                history["throughput"].append(values["read_bytes"] + values["write_bytes"])
+                history["utilization"].append(values["utilization"])
+            for name in list(self.history):
+                if name not in rates:
+                    del self.history[name]
+
+        # A device that comes back (re-created dm / loop device) is looked up again
+        for name in self.device_info.keys() - set(devices):
+            del self.device_info[name]
+
+        self.previous = stats
+        self.previous_time = now
+        return self.rates
+
+    def snapshot(self):
+        """Returns {device: {"label", "disks", "rates", "history"}} for the GUI thread."""
+        result = {}
+        for name, rates in self.rates.items():
+            info = self.device_info.get(name)
+            if info is None:
+                info = self.device_info[name] = (self.label(name), parent_disks(name, self.sys_root))
+            label, disks = info
+            result[name] = {
+                "label": label,
+                "disks": [disk for disk in disks if disk != name],
+                "rates": dict(rates),
+                "history": {key: list(values) for key, values in self.history[name].items()},
+            }
+        return result
@@ -1,11 +1,24 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, 
-    QHeaderView, QProgressBar, QPushButton, QHBoxLayout, 
-    QLabel, QCheckBox, QFrame
+    QWidget, QVBoxLayout, QTableView, QHeaderView, QPushButton, QHBoxLayout,
+    QLabel, QCheckBox, QFrame, QFileDialog, QGridLayout, QStyledItemDelegate, QStyle,
+    QStyleOptionViewItem, QApplication
 )
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QBrush
-from system_toolbox.system_info import get_disk_usage
+from PySide6.QtCore import (
+    Qt, QThread, Signal, QSocketNotifier, QTimer, QAbstractTableModel,
+    QModelIndex, QSortFilterProxyModel, QRectF
+)
+from PySide6.QtGui import QColor, QBrush, QPen, QPainter
+from system_toolbox.mounts import DiskUsageSampler
+from system_toolbox.collector import CollectorConnection, CollectorError
+from system_toolbox.disk_io import DiskIOMonitor, map_mounts
+from system_toolbox.disk_analyzer import DiskAnalyzerDialog
+from system_toolbox.system_info import format_size
+from system_toolbox.duplicates_dialog import DuplicatesDialog
+from system_toolbox.cleanup_dialog import CleanupDialog
+from system_toolbox.large_files_dialog import LargeFilesDialog
+from system_toolbox.widgets import Sparkline
+from system_toolbox.tracing import traced
+from system_toolbox.styles import set_style_state
 import os
 
 def is_system_mount(partition):
@@ -34,16 +47,273 @@ def is_system_mount(partition):
         
     return False
 
-class NumericTableWidgetItem(QTableWidgetItem):
-    """Custom Item to sort numbers correctly"""
-    def __lt__(self, other):
-        try:
-            # Remove " GB" or "%" to parse float
-            text_self = self.text().replace(" GB", "").replace("%", "")
-            text_other = other.text().replace(" GB", "").replace("%", "")
-            return float(text_self) < float(text_other)
-        except ValueError:
-            return super().__lt__(other)
+def mount_priority(disk):
+    """Display order before the user sorts: root first, then home and boot."""
+    return {"/": 0, "/home": 1, "/boot": 2, "/boot/efi": 3}.get(disk["mountpoint"], 4)
+
+def to_gb(bytes_val):
+    return f"{bytes_val / (1024**3):.2f} GB" if bytes_val is not None else "-"
+
+DISK_COLUMNS = ["Device", "Mountpoint", "Total", "Used", "Free", "Reserved", "Inodes %", "Usage %"]
+USAGE_COLUMN = 7
+INODES_COLUMN = 6
+
+# Alert thresholds (percent used)
+USAGE_ALERT = 90
+INODE_ALERT = 90
+METADATA_ALERT = 90
+QUOTA_ALERT = 90
+
+def percent_of(used, limit):
+    return used * 100.0 / limit if used is not None and limit else None
+
+def disk_alerts(disk):
+    """Warnings for a partition past one of the alert thresholds."""
+    if disk["state"] != "ok":
+        return [f"{disk['mountpoint']} is not responding"]
+    # squashfs, ISO images and friends are always full
+    if disk.get("readonly"):
+        return []
+    mountpoint = disk["mountpoint"]
+    alerts = []
+    if disk["percent"] >= USAGE_ALERT:
+        alerts.append(f"{mountpoint} is {disk['percent']:.0f}% full")
+    inodes = disk.get("inodes_percent")
+    if inodes is not None and inodes >= INODE_ALERT:
+        alerts.append(f"{mountpoint} has used {inodes:.0f}% of its inodes")
+    btrfs = disk.get("btrfs") or {}
+    metadata = percent_of(btrfs.get("metadata_used"), btrfs.get("metadata_total"))
+    if metadata is not None and metadata >= METADATA_ALERT:
+        alerts.append(f"{mountpoint} has used {metadata:.0f}% of its btrfs metadata space")
+    zfs = disk.get("zfs")
+    if zfs and zfs["state"] not in (None, "ONLINE"):
+        alerts.append(f"ZFS pool {zfs['pool']} is {zfs['state']}")
+    quota = disk.get("quota")
+    if quota:
+        space = percent_of(quota["used"], quota["soft"] or quota["hard"])
+        if space is not None and space >= QUOTA_ALERT:
+            alerts.append(f"You have used {space:.0f}% of your quota on {mountpoint}")
+        files = percent_of(quota["inodes"], quota["inodes_soft"] or quota["inodes_hard"])
+        if files is not None and files >= QUOTA_ALERT:
+            alerts.append(f"You have used {files:.0f}% of your file quota on {mountpoint}")
+    return alerts
+
+def disk_details(disk):
+    """Tooltip lines with the filesystem specifics of a partition."""
+    lines = [
+        f"Device: {disk['device']}",
+        f"Mountpoint: {disk['mountpoint']}",
+        f"Filesystem: {disk.get('fstype', 'Unknown')}",
+        f"Options: {disk.get('opts', 'Unknown')}",
+    ]
+    if disk["state"] != "ok":
+        return "\n".join(lines)
+    if disk["reserved"]:
+        lines.append(f"Reserved for root: {format_size(disk['reserved'])}")
+    if disk["inodes_total"]:
+        lines.append(f"Inodes: {disk['inodes_used']:,} of {disk['inodes_total']:,} used")
+    btrfs = disk.get("btrfs")
+    if btrfs:
+        for kind in ("data", "metadata", "system"):
+            if btrfs[f"{kind}_total"] is not None:
+                lines.append(
+                    f"btrfs {kind}: {format_size(btrfs[f'{kind}_used'] or 0)} "
+                    f"of {format_size(btrfs[f'{kind}_total'])} allocated"
+                )
+    zfs = disk.get("zfs")
+    if zfs:
+        lines.append(f"ZFS pool: {zfs['pool']} ({zfs['state'] or 'unknown state'})")
+    overlay = disk.get("overlay")
+    if overlay:
+        lines.append(f"Overlay: {overlay['lower_layers']} lower layers, writes to {overlay['upperdir'] or 'nowhere (read-only)'}")
+    quota = disk.get("quota")
+    if quota:
+        limit = quota["soft"] or quota["hard"]
+        lines.append(f"Your quota: {format_size(quota['used'])} of {format_size(limit) if limit else 'unlimited'}")
+    return "\n".join(lines)
+
+class DiskTableModel(QAbstractTableModel):
+    """
+    Partitions keyed by mountpoint. set_disks() applies only the differences,
+    so a refresh repaints the cells that changed and keeps the selection.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.disks = []
+        self.alert_brush = QBrush(QColor("#ef5350"))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.disks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(DISK_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return DISK_COLUMNS[section]
+        return None
+
+    def cell(self, disk, col):
+        """(text, sort value) of a cell."""
+        if col == 0:
+            return disk["device"], disk["device"]
+        if col == 1:
+            return disk["mountpoint"], disk["mountpoint"]
+        if col == USAGE_COLUMN:
+            if disk["state"] != "ok":
+                return ("Unresponsive" if disk["state"] == "unresponsive" else "Error"), -1.0
+            return f"{int(disk['percent'])}%", disk["percent"]
+        if col == INODES_COLUMN:
+            percent = disk.get("inodes_percent")
+            # btrfs, tmpfs without nr_inodes...: no inode limit
+            return (f"{percent:.0f}%", percent) if percent is not None else ("-", -1.0)
+        value = disk.get(("total", "used", "free", "reserved")[col - 2])
+        return to_gb(value), value if value is not None else -1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        disk = self.disks[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            return self.cell(disk, col)[0]
+        if role == Qt.UserRole:
+            return self.cell(disk, col)[1]
+        if role == Qt.TextAlignmentRole and col in (2, 3, 4, 5, 6):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.ForegroundRole and col == INODES_COLUMN:
+            percent = disk.get("inodes_percent")
+            if percent is not None and percent >= INODE_ALERT and not disk.get("readonly"):
+                return self.alert_brush
+            return None
+        if role == Qt.ToolTipRole:
+            if col == USAGE_COLUMN and disk["state"] != "ok":
+                return disk.get("error", "The filesystem did not answer in time")
+            return disk_details(disk)
+        return None
+
+    def disk(self, row):
+        return self.disks[row]
+
+    @traced("disk.update_model")
+    def set_disks(self, disks):
+        fresh = {disk["mountpoint"]: disk for disk in disks}
+
+        # 1. Rows that went away
+        for row in range(len(self.disks) - 1, -1, -1):
+            if self.disks[row]["mountpoint"] not in fresh:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.disks[row]
+                self.endRemoveRows()
+
+        # 2. Rows that changed: only the changed cells are reported
+        for row, disk in enumerate(self.disks):
+            new = fresh.pop(disk["mountpoint"])
+            if new == disk:
+                continue
+            changed = [col for col in range(len(DISK_COLUMNS)) if self.cell(disk, col) != self.cell(new, col)]
+            self.disks[row] = new
+            if changed:
+                self.dataChanged.emit(self.index(row, changed[0]), self.index(row, changed[-1]))
+
+        # 3. New rows
+        if fresh:
+            added = sorted(fresh.values(), key=mount_priority)
+            first = len(self.disks)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self.disks.extend(added)
+            self.endInsertRows()
+
+class DiskFilterProxy(QSortFilterProxyModel):
+    """Hides system / loop mounts unless show_all is set, and sorts on raw values."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.show_all = False
+        self.setSortRole(Qt.UserRole)
+
+    def set_show_all(self, show_all):
+        self.show_all = show_all
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.show_all or not is_system_mount(self.sourceModel().disk(source_row))
+
+class UsageBarDelegate(QStyledItemDelegate):
+    """
+    Paints the usage bar directly. Brushes, pens and the bold font are created once
+    and shared by every row, instead of a QProgressBar with its own stylesheet per row.
+    """
+    BAR_HEIGHT = 20
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.track = QBrush(QColor("#f5f5f5"))
+        # (lower bound of the usage %, fill)
+        self.levels = [
+            (90, QBrush(QColor("#ef5350"))), # Red
+            (75, QBrush(QColor("#ffa726"))), # Orange
+            (0, QBrush(QColor("#66bb6a"))), # Green
+        ]
+        self.text_pen = QPen(QColor("#424242"))
+        self.error_pen = QPen(QColor("#ef5350"))
+        self.font = None
+
+    def paint(self, painter, option, index):
+        # Background (selection, alternating rows) from the view's style, without the text
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        if self.font is None:
+            self.font = QApplication.font(opt.widget)
+            self.font.setBold(True)
+        percent = index.data(Qt.UserRole)
+        text = index.data(Qt.DisplayRole)
+        rect = option.rect.adjusted(10, 0, -10, 0)
+        bar = QRectF(rect.x(), rect.y() + (rect.height() - self.BAR_HEIGHT) / 2, rect.width(), self.BAR_HEIGHT)
+        radius = self.BAR_HEIGHT / 2
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self.font)
+        if percent < 0:
+            # Unresponsive / error: no bar
+            painter.setPen(self.error_pen)
+            painter.drawText(bar, Qt.AlignCenter, text)
+            painter.restore()
+            return
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.track)
+        painter.drawRoundedRect(bar, radius, radius)
+        fill = next(brush for bound, brush in self.levels if percent > bound or bound == 0)
+        width = bar.width() * min(percent, 100.0) / 100.0
+        if width > 0:
+            painter.setBrush(fill)
+            painter.drawRoundedRect(QRectF(bar.x(), bar.y(), max(width, 2 * radius), bar.height()), radius, radius)
+        painter.setPen(self.text_pen)
+        painter.drawText(bar, Qt.AlignCenter, text)
+        painter.restore()
+
+class DiskUsageWorker(QThread):
+    finished = Signal(list)
+
+    def __init__(self, sampler, collector=None):
+        super().__init__()
+        self.sampler = sampler
+        self.collector = collector
+
+    def run(self):
+        if self.collector is not None and self.collector.connected:
+            try:
+                self.finished.emit(list(self.collector.get("disks", fresh=True).values()))
+                return
+            except CollectorError as e:
+                print(f"Error reading from the collector, sampling locally: {e}")
+        # statvfs() on a dead network mount can hang; the sampler gives up on it after a timeout
+        self.finished.emit(self.sampler.sample())
 
 class DiskTab(QWidget):
     def __init__(self):
@@ -58,10 +328,32 @@ class DiskTab(QWidget):
         self.controls_layout = QHBoxLayout()
         
         self.chk_show_all = QCheckBox("Show system/loop mounts")
-        self.chk_show_all.stateChanged.connect(self.load_data)
+        self.chk_show_all.stateChanged.connect(self.on_show_all_changed)
         self.controls_layout.addWidget(self.chk_show_all)
         
         self.controls_layout.addStretch()
+
+        self.btn_analyze = QPushButton("Analyze...")
+        self.btn_analyze.setCursor(Qt.PointingHandCursor)
+        self.btn_analyze.setEnabled(False)
+        self.btn_analyze.clicked.connect(self.analyze_selected)
+        self.controls_layout.addWidget(self.btn_analyze)
+
+        self.btn_large_files = QPushButton("Large Files...")
+        self.btn_large_files.setCursor(Qt.PointingHandCursor)
+        self.btn_large_files.setEnabled(False)
+        self.btn_large_files.clicked.connect(self.find_large_files)
+        self.controls_layout.addWidget(self.btn_large_files)
+
+        self.btn_duplicates = QPushButton("Find Duplicates...")
+        self.btn_duplicates.setCursor(Qt.PointingHandCursor)
+        self.btn_duplicates.clicked.connect(self.find_duplicates)
+        self.controls_layout.addWidget(self.btn_duplicates)
+
+        self.btn_cleanup = QPushButton("Clean Up...")
+        self.btn_cleanup.setCursor(Qt.PointingHandCursor)
+        self.btn_cleanup.clicked.connect(self.open_cleanup)
+        self.controls_layout.addWidget(self.btn_cleanup)
         
         self.btn_refresh = QPushButton("Refresh")
         self.btn_refresh.setObjectName("primaryBtn")
@@ -71,167 +363,245 @@ class DiskTab(QWidget):
         
         self.layout.addLayout(self.controls_layout)
 
+        # Threshold alerts (inodes, quota, btrfs metadata...), hidden while all is well
+        self.alert_label = QLabel()
+        self.alert_label.setWordWrap(True)
+        self.alert_label.setObjectName("alertLabel")
+        self.alert_label.hide()
+        self.layout.addWidget(self.alert_label)
+
         # 3. Table Section
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "Device", "Mountpoint", "Total", "Used", "Free", "Usage %"
-        ])
+        self.model = DiskTableModel(self)
+        self.proxy = DiskFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setObjectName("diskTable") # styled in styles.py
+        self.table.setModel(self.proxy)
+        self.table.setItemDelegateForColumn(USAGE_COLUMN, UsageBarDelegate(self.table))
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
         self.table.verticalHeader().setVisible(False)
-        
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setSelectionMode(QTableView.SingleSelection)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.table.doubleClicked.connect(lambda index: self.analyze_selected())
+
         # Column resizing
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeToContents) # Device
         header.setSectionResizeMode(1, QHeaderView.Stretch)          # Mountpoint stretches
-        header.setSectionResizeMode(5, QHeaderView.Fixed)            # Usage % fixed width
-        self.table.setColumnWidth(5, 200) # Wider for better progress bar
+        header.setSectionResizeMode(USAGE_COLUMN, QHeaderView.Fixed) # Usage % fixed width
+        self.table.setColumnWidth(USAGE_COLUMN, 200) # Wider for better progress bar
 
-        # Enable sorting
+        # Enable sorting; no sort column until a header is clicked keeps root / home / boot first
+        header.setSortIndicator(-1, Qt.AscendingOrder)
         self.table.setSortingEnabled(True)
-        
+
         # Increase row height for better spacing
         self.table.verticalHeader().setDefaultSectionSize(50)
         
-        # Style the table
-        self.table.setStyleSheet("""
-            QTableWidget {
-                border: none;
-                background-color: white;
-                gridline-color: #f0f0f0;
-            }
-            QTableWidget::item {
-                padding-left: 10px;
-                padding-right: 10px;
-                border-bottom: 1px solid #f5f5f5;
-            }
-            QTableWidget::item:selected {
-                background-color: #e3f2fd;
-                color: black;
-            }
-            QHeaderView::section {
-                background-color: white;
-                border: none;
-                border-bottom: 2px solid #e0e0e0;
-                padding: 12px;
-                font-weight: bold;
-                color: #757575;
-                text-transform: uppercase;
-                font-size: 12px;
-            }
-        """)
-        
         self.layout.addWidget(self.table)
 
-        # Load initial data
-        self.load_data()
+        # 4. Disk Activity Section
+        self.io_monitor = DiskIOMonitor()
+        self.io_mounts = {} # block device -> mountpoints on it
+        self.io_rows = {} # block device -> row widgets
+        self.io_next_row = 2 # grid rows of removed devices are not reused
+        self.io_panel = self.build_io_panel()
+        self.layout.addWidget(self.io_panel)
+        self.io_timer = QTimer(self)
+        self.io_timer.setInterval(2000)
+        self.io_timer.timeout.connect(self.update_io)
+
+        # Partitions are read and stat'ed off the GUI thread
+        self.sampler = DiskUsageSampler()
+        self.collector = CollectorConnection() # shared samples when a collector daemon runs
+        self.worker = None
+        self.reload_pending = False
+
+        # mountinfo flags POLLPRI (an "exception" for QSocketNotifier) on every mount / unmount
+        self.mount_notifier = QSocketNotifier(self.sampler.watcher.fileno(), QSocketNotifier.Exception, self)
+        self.mount_notifier.activated.connect(self.on_mounts_changed)
+        self.mount_notifier.setEnabled(False)
+        self.loaded = False
+        self.recorded = False # showing a recording, see show_recorded()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.recorded or self.io_timer.isActive():
+            return
+        # Fresh baseline, so the first rates are not averaged over the time we were hidden
+        self.io_monitor.sample()
+        self.io_timer.start()
+        self.mount_notifier.setEnabled(True)
+        # Nobody polled mountinfo while hidden: a mount since then is still flagged
+        if not self.loaded or self.sampler.watcher.changed():
+            self.load_data()
+
+    def hideEvent(self, event):
+        # Another tab is open: stop sampling until we are back
+        super().hideEvent(event)
+        if not event.spontaneous():
+            self.io_timer.stop()
+            self.mount_notifier.setEnabled(False)
 
     def load_data(self):
-        # Disable sorting while updating to prevent jumping
-        self.table.setSortingEnabled(False)
-        
-        data = get_disk_usage()
-        self.table.setRowCount(0)
-        
+        if self.recorded:
+            return
+        if self.worker is not None and self.worker.isRunning():
+            self.reload_pending = True
+            return
+        self.reload_pending = False
+        self.worker = DiskUsageWorker(self.sampler, self.collector.client())
+        self.worker.finished.connect(self.on_data_loaded)
+        self.worker.start()
 
-        
-        # Filter data
-        show_all = self.chk_show_all.isChecked()
-        filtered_data = []
-        for disk in data:
-            if show_all or not is_system_mount(disk):
-                filtered_data.append(disk)
-        
-        # Custom Sort for Display (Root first, then Home, etc.)
-        # We assign a priority score for sorting
-        def sort_key(d):
-            mp = d["mountpoint"]
-            if mp == "/": return 0
-            if mp == "/home": return 1
-            if mp == "/boot": return 2
-            if mp == "/boot/efi": return 3
-            return 4 # Others
-            
-        filtered_data.sort(key=sort_key)
-        
-        # Populate Table
-        for row_idx, disk in enumerate(filtered_data):
-            self.table.insertRow(row_idx)
-            
-            # Helper to format bytes to GB
-            def to_gb(bytes_val):
-                return f"{bytes_val / (1024**3):.2f} GB"
-
-            # Device
-            item_device = QTableWidgetItem(disk["device"])
-            self._set_tooltip(item_device, disk)
-            self.table.setItem(row_idx, 0, item_device)
-            
-            # Mountpoint
-            item_mount = QTableWidgetItem(disk["mountpoint"])
-            self._set_tooltip(item_mount, disk)
-            self.table.setItem(row_idx, 1, item_mount)
-            
-            # Numeric Columns (Right Aligned)
-            self._add_numeric_item(row_idx, 2, to_gb(disk["total"]), disk)
-            self._add_numeric_item(row_idx, 3, to_gb(disk["used"]), disk)
-            self._add_numeric_item(row_idx, 4, to_gb(disk["free"]), disk)
-            
-            # Usage % Progress Bar
-            progress_container = QWidget()
-            progress_layout = QHBoxLayout(progress_container)
-            progress_layout.setContentsMargins(10, 5, 10, 5)
-            progress_layout.setAlignment(Qt.AlignCenter)
-            
-            progress = QProgressBar()
-            percent = disk["percent"]
-            progress.setValue(int(percent))
-            progress.setAlignment(Qt.AlignCenter)
-            progress.setFixedHeight(20)
-            
-            # Color Coding
-            if percent > 90:
-                color = "#ef5350" # Red
-            elif percent > 75:
-                color = "#ffa726" # Orange
-            else:
-                color = "#66bb6a" # Green
-                
-            progress.setStyleSheet(f"""
-                QProgressBar {{
-                    border: none;
-                    background-color: #f5f5f5;
-                    border-radius: 10px;
-                    text-align: center;
-                    color: #424242;
-                    font-weight: bold;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {color};
-                    border-radius: 10px;
-                }}
-            """)
-            
-            progress_layout.addWidget(progress)
-            self.table.setCellWidget(row_idx, 5, progress_container)
-
-        # Re-enable sorting
-        self.table.setSortingEnabled(True)
+    def start_pending_reload(self):
+        # The worker emits finished from run(), just before its thread exits
+        if not self.reload_pending:
+            return
+        if self.worker is not None and self.worker.isRunning():
+            QTimer.singleShot(10, self.start_pending_reload)
+            return
+        self.load_data()
+
+    def on_show_all_changed(self, state):
+        self.proxy.set_show_all(self.chk_show_all.isChecked())
+        self.update_alerts()
+
+    def on_mounts_changed(self):
+        # The notifier's poll consumed the change flag; tell the watcher
+        self.sampler.watcher.invalidate()
+        self.load_data()
+
+    def on_data_loaded(self, data):
+        self.loaded = True
+        if self.recorded:
+            return # sampled before the replay started
+        if self.reload_pending:
+            self.start_pending_reload()
+        self.io_mounts = map_mounts(data)
+
+        # Only the differences reach the view; the selection and sort order stay put
+        self.model.set_disks(data)
+        self.update_alerts()
+
+    def show_recorded(self, disks):
+        """
+        Shows the partitions of one sample of a recording (see recording.Replayer).
+        Live sampling stops for good; disk activity is not recorded and is hidden.
+        """
+        if not self.recorded:
+            self.recorded = True
+            self.io_timer.stop()
+            self.mount_notifier.setEnabled(False)
+            self.io_panel.hide()
+            self.btn_refresh.setEnabled(False)
+        self.model.set_disks(disks)
+        self.update_alerts()
 
+    def update_alerts(self):
+        alerts = []
+        for disk in self.model.disks:
+            if self.proxy.show_all or not is_system_mount(disk):
+                alerts.extend(disk_alerts(disk))
+        self.alert_label.setText("\n".join(alerts))
+        self.alert_label.setVisible(bool(alerts))
 
+    def build_io_panel(self):
+        frame = QFrame()
+        frame.setObjectName("summaryFrame")
+        self.io_grid = QGridLayout(frame)
+        self.io_grid.setContentsMargins(0, 0, 0, 0)
+        self.io_grid.setHorizontalSpacing(20)
 
-    def _add_numeric_item(self, row, col, text, disk_data):
-        item = NumericTableWidgetItem(text)
-        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self._set_tooltip(item, disk_data)
-        self.table.setItem(row, col, item)
+        title = QLabel("Disk Activity")
+        title.setObjectName("subHeaderLabel")
+        self.io_grid.addWidget(title, 0, 0, 1, 4)
+        for col, caption in enumerate(["Device", "Read", "Write", "IOPS (r/w)", "Latency", "Busy", "Throughput", "Utilization"]):
+            self.io_grid.addWidget(QLabel(f"<b>{caption}</b>"), 1, col)
+        return frame
 
-    def _set_tooltip(self, item, disk):
-        tooltip = (
-            f"Device: {disk['device']}\n"
-            f"Mountpoint: {disk['mountpoint']}\n"
-            f"Filesystem: {disk.get('fstype', 'Unknown')}\n"
-            f"Options: {disk.get('opts', 'Unknown')}"
-        )
-        item.setToolTip(tooltip)
+    def io_row(self, name):
+        """Widgets of one device row, created the first time the device shows up."""
+        if name not in self.io_rows:
+            row = self.io_next_row
+            self.io_next_row += 1
+            labels = [QLabel() for _ in range(6)]
+            for col, label in enumerate(labels):
+                self.io_grid.addWidget(label, row, col)
+            throughput = Sparkline("#0d6efd")
+            utilization = Sparkline("#dc3545", 100.0)
+            self.io_grid.addWidget(throughput, row, 6)
+            self.io_grid.addWidget(utilization, row, 7)
+            self.io_rows[name] = (labels, throughput, utilization)
+        return self.io_rows[name]
+
+    def update_io(self):
+        self.io_monitor.sample()
+        snapshot = self.io_monitor.snapshot()
+        for name in list(self.io_rows):
+            if name not in snapshot:
+                # Device removed (USB stick pulled): drop its row
+                labels, throughput, utilization = self.io_rows.pop(name)
+                for widget in labels + [throughput, utilization]:
+                    widget.deleteLater()
+
+        for name, device in snapshot.items():
+            labels, throughput, utilization = self.io_row(name)
+            rates = device["rates"]
+            caption = device["label"]
+            if device["disks"]:
+                caption += f" on {', '.join(device['disks'])}"
+            mounts = self.io_mounts.get(name)
+            labels[0].setText(f"{caption} ({', '.join(mounts)})" if mounts else caption)
+            labels[1].setText(f"{format_size(int(rates['read_bytes']))}/s")
+            labels[2].setText(f"{format_size(int(rates['write_bytes']))}/s")
+            labels[3].setText(f"{rates['read_iops']:.0f} / {rates['write_iops']:.0f}")
+            labels[4].setText(f"{rates['latency_ms']:.1f} ms")
+            busy = rates["utilization"]
+            labels[5].setText(f"{busy:.0f}%")
+            set_style_state(labels[5], "alert", busy >= 90)
+            throughput.set_values(device["history"]["throughput"])
+            utilization.set_values(device["history"]["utilization"])
+
+    def selected_mountpoint(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.model.disk(self.proxy.mapToSource(rows[0]).row())["mountpoint"]
+
+    def on_selection_changed(self, *args):
+        selected = self.selected_mountpoint() is not None
+        self.btn_analyze.setEnabled(selected)
+        self.btn_large_files.setEnabled(selected)
+
+    def analyze_selected(self):
+        mountpoint = self.selected_mountpoint()
+        if not mountpoint:
+            return
+        dialog = DiskAnalyzerDialog(mountpoint, self)
+        dialog.exec()
+
+    def find_large_files(self):
+        mountpoint = self.selected_mountpoint()
+        if not mountpoint:
+            return
+        dialog = LargeFilesDialog(mountpoint, parent=self)
+        dialog.exec()
+
+    def find_duplicates(self):
+        start = self.selected_mountpoint() or os.path.expanduser("~")
+        folder = QFileDialog.getExistingDirectory(self, "Find Duplicates In", start)
+        if not folder:
+            return
+        dialog = DuplicatesDialog(folder, self)
+        dialog.exec()
+
+    def open_cleanup(self):
+        dialog = CleanupDialog(self)
+        dialog.exec()
+        # Freed space shows up in the usage bars
+        self.load_data()
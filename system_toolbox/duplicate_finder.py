@@ -0,0 +1,260 @@
+import os
+import stat
+import sqlite3
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Bytes hashed from each end of a file in the partial stage
+HEAD_TAIL = 64 * 1024
+# Read buffer of the full hash stage
+BUFFER_SIZE = 1024 * 1024
+# Files below this size are not worth reporting
+MIN_SIZE = 1
+
+# Stages reported to progress(stage, done, total)
+STAGE_WALK = "walk"
+STAGE_PARTIAL = "partial"
+STAGE_FULL = "full"
+
+def cache_path():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "vbox", "hashes.sqlite")
+
+def hash_partial(path, size):
+    """
+    Hashes the first and last HEAD_TAIL bytes of a file (the whole file when it is small).
+    Returns (path, digest) with digest None when the file could not be read.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            if size <= 2 * HEAD_TAIL:
+                digest.update(f.read())
+            else:
+                digest.update(f.read(HEAD_TAIL))
+                f.seek(-HEAD_TAIL, os.SEEK_END)
+                digest.update(f.read(HEAD_TAIL))
+    except OSError:
+        return path, None
+    return path, digest.digest()
+
+def hash_full(path, cancel=None):
+    """
+    Streams a whole file through the hash with one reused buffer.
+    Reads and hashlib updates of this size release the GIL, so threads hash in parallel.
+    Gives up with a None digest once the `cancel` event is set, so big files do not delay a cancel.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    buffer = bytearray(BUFFER_SIZE)
+    view = memoryview(buffer)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                if cancel is not None and cancel.is_set():
+                    return path, None
+                digest.update(view[:count])
+    except OSError:
+        return path, None
+    return path, digest.digest()
+
+class HashCache:
+    """
+    SQLite cache of file hashes keyed by (dev, inode, mtime, size).
+    A file that was modified, replaced or resized gets a new key, so stale hashes are never used.
+    """
+    def __init__(self, path=None):
+        self.path = path or cache_path()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "dev INTEGER, ino INTEGER, mtime_ns INTEGER, size INTEGER, kind TEXT, digest BLOB, "
+            "PRIMARY KEY (dev, ino, kind))"
+        )
+        self.pending = []
+
+    def get(self, info, kind):
+        row = self.db.execute(
+            "SELECT digest FROM hashes WHERE dev = ? AND ino = ? AND kind = ? AND mtime_ns = ? AND size = ?",
+            (info[1], info[2], kind, info[3], info[4])
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, info, kind, digest):
+        self.pending.append((info[1], info[2], info[3], info[4], kind, digest))
+        if len(self.pending) >= 1000:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)", self.pending)
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+class DuplicateFinder:
+    """
+    Finds files with identical contents below a directory, in stages that each
+    only see the files the previous one could not tell apart:
+    1. group by size (from the walk, no reads),
+    2. hash the first and last 64 KiB,
+    3. hash the whole file.
+    Hard links to the same inode are one file, not duplicates.
+    """
+    def __init__(self, root, min_size=MIN_SIZE, workers=None, cache=None):
+        self.root = os.path.abspath(root)
+        self.min_size = min_size
+        self.workers = workers or min(os.cpu_count() or 1, 8)
+        self.cache = cache
+        self.errors = 0
+        self.cached = 0 # hashes taken from the cache
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def find(self, progress=None, progress_interval=0.25):
+        """
+        Returns [{"size", "digest", "paths"}] for every set of identical files,
+        the groups wasting the most space first. Returns [] when cancelled.
+        progress(stage, done, total) is called at most every `progress_interval` seconds.
+        """
+        last_report = [0.0]
+        def report(stage, done, total):
+            now = time.monotonic()
+            if progress and (now - last_report[0] >= progress_interval or done == total):
+                last_report[0] = now
+                progress(stage, done, total)
+
+        # 1. Size
+        by_size = {}
+        for info in self._walk(report):
+            by_size.setdefault(info[4], []).append(info)
+        candidates = [group for group in by_size.values() if len(group) > 1]
+        by_size = None
+
+        # 2. Head and tail
+        total = sum(len(group) for group in candidates)
+        partial = self._hash_stage(candidates, "partial", total, report)
+
+        # 3. Full contents, unless the partial hash already covered the whole file
+        finished = [(digest, group) for digest, group in partial if group[0][4] <= 2 * HEAD_TAIL]
+        full_needed = [group for digest, group in partial if group[0][4] > 2 * HEAD_TAIL]
+        total = sum(len(group) for group in full_needed)
+        finished += self._hash_stage(full_needed, "full", total, report)
+
+        if self.cache is not None:
+            self.cache.flush()
+        if self.cancelled:
+            return []
+
+        result = [
+            {"size": group[0][4], "digest": digest.hex(), "paths": sorted(info[0] for info in group)}
+            for digest, group in finished
+        ]
+        result.sort(key=lambda g: g["size"] * (len(g["paths"]) - 1), reverse=True)
+        return result
+
+    def _walk(self, report):
+        """Yields (path, dev, ino, mtime_ns, size) of the regular files on the root's filesystem."""
+        try:
+            root_dev = os.stat(self.root).st_dev
+        except OSError as e:
+            print(f"Error scanning {self.root}: {e}")
+            return
+        seen_inodes = set()
+        stack = [self.root]
+        count = 0
+        while stack and not self.cancelled:
+            path = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if stat.S_ISDIR(st.st_mode):
+                            if st.st_dev == root_dev:
+                                stack.append(entry.path)
+                            continue
+                        if not stat.S_ISREG(st.st_mode) or st.st_size < self.min_size:
+                            continue
+                        if st.st_nlink > 1:
+                            key = (st.st_dev, st.st_ino)
+                            if key in seen_inodes:
+                                continue
+                            seen_inodes.add(key)
+                        count += 1
+                        yield entry.path, st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size
+            except OSError:
+                self.errors += 1
+            report(STAGE_WALK, count, 0)
+
+    def _hash_stage(self, groups, kind, total, report):
+        """
+        Hashes every file of `groups` and splits each group by digest.
+        Returns [(digest, group)] for the new groups that still hold more than one file.
+        """
+        digests = {}
+        todo = []
+        for group in groups:
+            for info in group:
+                digest = self.cache.get(info, kind) if self.cache is not None else None
+                if digest is not None:
+                    digests[info[0]] = digest
+                    self.cached += 1
+                else:
+                    todo.append(info)
+
+        done = len(digests)
+        report(STAGE_PARTIAL if kind == "partial" else STAGE_FULL, done, total)
+        if todo and not self.cancelled:
+            infos = {info[0]: info for info in todo}
+            # Threads: no worker processes to start, and nothing to re-run in the frozen (PyInstaller) build
+            executor = ThreadPoolExecutor(max_workers=self.workers)
+            if kind == "partial":
+                futures = [executor.submit(hash_partial, info[0], info[4]) for info in todo]
+            else:
+                # Biggest first, so one large file does not finish alone at the end
+                todo.sort(key=lambda info: info[4], reverse=True)
+                futures = [executor.submit(hash_full, info[0], self._cancel) for info in todo]
+            try:
+                for future in as_completed(futures):
+                    if self.cancelled:
+                        break
+                    path, digest = future.result()
+                    done += 1
+                    if digest is None:
+                        self.errors += 1
+                    else:
+                        digests[path] = digest
+                        if self.cache is not None:
+                            self.cache.put(infos[path], kind, digest)
+                    report(STAGE_PARTIAL if kind == "partial" else STAGE_FULL, done, total)
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        result = []
+        for group in groups:
+            split = {}
+            for info in group:
+                digest = digests.get(info[0])
+                if digest is not None:
+                    split.setdefault(digest, []).append(info)
+            for digest, same in split.items():
+                if len(same) > 1:
+                    result.append((digest, same))
+        return result
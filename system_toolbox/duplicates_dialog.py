@@ -0,0 +1,220 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTreeWidget, QTreeWidgetItem, QHeaderView, QMessageBox
+)
+from PySide6.QtCore import Qt, QThread, Signal
+from system_toolbox.duplicate_finder import DuplicateFinder, HashCache, STAGE_WALK, STAGE_PARTIAL
+from system_toolbox.system_info import format_size
+import os
+import sqlite3
+
+# Groups shown at once; the rest only add to the totals
+MAX_GROUPS = 1000
+
+class DuplicateWorker(QThread):
+    progress = Signal(str, object, object) # stage, done, total
+    finished = Signal(list)
+
+    def __init__(self, finder):
+        super().__init__()
+        self.finder = finder
+
+    def run(self):
+        # sqlite connections stay on the thread that opened them
+        cache = None
+        try:
+            cache = HashCache()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error opening hash cache: {e}")
+        self.finder.cache = cache
+        groups = self.finder.find(progress=lambda stage, done, total: self.progress.emit(stage, done, total))
+        if cache is not None:
+            cache.close()
+        self.finished.emit(groups)
+
+class DeleteWorker(QThread):
+    finished = Signal(list, int) # deleted paths, failures
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = paths
+
+    def run(self):
+        deleted = []
+        failed = 0
+        for path in self.paths:
+            try:
+                os.remove(path)
+                deleted.append(path)
+            except OSError as e:
+                print(f"Error deleting {path}: {e}")
+                failed += 1
+        self.finished.emit(deleted, failed)
+
+class DuplicatesDialog(QDialog):
+    """
+    Lists sets of identical files below a folder and deletes the copies the user ticks.
+    At least one file of every set is always kept.
+    """
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Duplicate Files - {root}")
+        self.resize(850, 600)
+        self.root = root
+        self.finder = None
+        self.worker = None
+        self.delete_worker = None
+
+        layout = QVBoxLayout(self)
+
+        header = QHBoxLayout()
+        self.summary_label = QLabel(root)
+        self.summary_label.setObjectName("subHeaderLabel")
+        header.addWidget(self.summary_label, 1)
+        self.btn_scan = QPushButton("Cancel")
+        self.btn_scan.clicked.connect(self.on_scan_button)
+        header.addWidget(self.btn_scan)
+        self.btn_delete = QPushButton("Delete Selected")
+        self.btn_delete.setObjectName("primaryBtn")
+        self.btn_delete.setEnabled(False)
+        self.btn_delete.clicked.connect(self.delete_checked)
+        header.addWidget(self.btn_delete)
+        layout.addLayout(header)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderLabels(["File", "Size"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.setAlternatingRowColors(True)
+        self.tree.itemChanged.connect(self.on_item_changed)
+        layout.addWidget(self.tree)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.start_scan()
+
+    def start_scan(self):
+        self.tree.clear()
+        self.btn_delete.setEnabled(False)
+        self.finder = DuplicateFinder(self.root)
+        self.worker = DuplicateWorker(self.finder)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.finished.connect(self.on_finished)
+        self.btn_scan.setText("Cancel")
+        self.worker.start()
+
+    def on_scan_button(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.finder.cancel()
+        else:
+            self.start_scan()
+
+    def on_progress(self, stage, done, total):
+        if stage == STAGE_WALK:
+            self.status_label.setText(f"Listing files... {done:,} found")
+        elif stage == STAGE_PARTIAL:
+            self.status_label.setText(f"Comparing file starts and ends... {done:,} / {total:,}")
+        else:
+            self.status_label.setText(f"Comparing full contents... {done:,} / {total:,}")
+
+    def on_finished(self, groups):
+        self.btn_scan.setText("Rescan")
+        if self.finder.cancelled:
+            self.status_label.setText("Search cancelled")
+            return
+
+        wasted = sum(g["size"] * (len(g["paths"]) - 1) for g in groups)
+        self.summary_label.setText(f"{len(groups):,} sets of duplicates, {format_size(wasted)} reclaimable")
+        errors = f", {self.finder.errors} files not readable" if self.finder.errors else ""
+        cached = f", {self.finder.cached:,} hashes from cache" if self.finder.cached else ""
+        self.status_label.setText(f"Search complete{cached}{errors}")
+
+        self.tree.blockSignals(True)
+        self.tree.setUpdatesEnabled(False)
+        for group in groups[:MAX_GROUPS]:
+            count = len(group["paths"])
+            top = QTreeWidgetItem([
+                f"{count} copies, {format_size(group['size'] * (count - 1))} reclaimable",
+                format_size(group["size"])
+            ])
+            for path in group["paths"]:
+                child = QTreeWidgetItem([path, ""])
+                child.setFlags(child.flags() | Qt.ItemIsUserCheckable)
+                child.setCheckState(0, Qt.Unchecked)
+                child.setData(0, Qt.UserRole, path)
+                top.addChild(child)
+            self.tree.addTopLevelItem(top)
+        self.tree.setUpdatesEnabled(True)
+        self.tree.blockSignals(False)
+
+    def checked_items(self):
+        """Returns [(group item, [checked child items])] for groups with ticked files."""
+        result = []
+        for i in range(self.tree.topLevelItemCount()):
+            top = self.tree.topLevelItem(i)
+            checked = [
+                top.child(j) for j in range(top.childCount())
+                if top.child(j).checkState(0) == Qt.Checked
+            ]
+            if checked:
+                result.append((top, checked))
+        return result
+
+    def on_item_changed(self, item, column):
+        self.btn_delete.setEnabled(bool(self.checked_items()))
+
+    def delete_checked(self):
+        selection = self.checked_items()
+        for top, checked in selection:
+            if len(checked) == top.childCount():
+                QMessageBox.warning(
+                    self, "Delete Duplicates",
+                    "Every copy of a file is selected. Leave at least one copy unticked."
+                )
+                return
+
+        files = sum(len(checked) for _, checked in selection)
+        reply = QMessageBox.question(
+            self, "Delete Duplicates",
+            f"Permanently delete {files:,} duplicate files?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        # Deleting (slow on network or USB drives) runs in the background
+        paths = [item.data(0, Qt.UserRole) for _, checked in selection for item in checked]
+        self.tree.setEnabled(False)
+        self.btn_delete.setEnabled(False)
+        self.btn_scan.setEnabled(False)
+        self.status_label.setText(f"Deleting {files:,} files...")
+        self.delete_worker = DeleteWorker(paths)
+        self.delete_worker.finished.connect(self.on_deleted)
+        self.delete_worker.start()
+
+    def on_deleted(self, deleted, failed):
+        deleted = set(deleted)
+        self.tree.blockSignals(True)
+        for i in reversed(range(self.tree.topLevelItemCount())):
+            top = self.tree.topLevelItem(i)
+            for j in reversed(range(top.childCount())):
+                if top.child(j).data(0, Qt.UserRole) in deleted:
+                    top.removeChild(top.child(j))
+            if top.childCount() < 2:
+                self.tree.takeTopLevelItem(i)
+        self.tree.blockSignals(False)
+        self.tree.setEnabled(True)
+        self.btn_scan.setEnabled(True)
+        self.btn_delete.setEnabled(bool(self.checked_items()))
+        failed_text = f", {failed} could not be deleted" if failed else ""
+        self.status_label.setText(f"Deleted {len(deleted):,} files{failed_text}")
+
+    def done(self, result):
+        if self.worker is not None and self.worker.isRunning():
+            self.finder.cancel()
+            self.worker.wait()
+        if self.delete_worker is not None:
+            # Let the files already confirmed finish deleting
+            self.delete_worker.wait()
+        super().done(result)
@@ -0,0 +1,203 @@
+"""
+Prometheus / OpenMetrics exporter:
+
+    python -m system_toolbox exporter [--address 127.0.0.1] [--port 9877] [--interval 15] [--top 20]
+
+Serves the RAM, process, disk and package data of VBox on /metrics.
+"""
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from system_toolbox.collector import connect_collector, CollectorError
+
+DEFAULT_PORT = 9877
+# A scrape within this many seconds of the last sample is answered from the cache
+SAMPLE_INTERVAL = 15.0
+# Processes exported with their own labels; the rest are summed up
+TOP_PROCESSES = 20
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class MetricsWriter:
+    """Prometheus text format: the samples of a metric family follow its HELP / TYPE header."""
+    def __init__(self):
+        self.families = {} # name -> lines, in the order families were first added
+
+    def add(self, name, value, help_text, labels=None, kind="gauge"):
+        if value is None:
+            return
+        lines = self.families.get(name)
+        if lines is None:
+            lines = self.families[name] = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        if labels:
+            label_text = ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items())
+            lines.append(f"{name}{{{label_text}}} {float(value)!r}")
+        else:
+            lines.append(f"{name} {float(value)!r}")
+
+    def text(self):
+        return "".join(line + "\n" for lines in self.families.values() for line in lines)
+
+class MetricsCollector:
+    """
+    Builds the /metrics page. The page is cached for `interval` seconds and built by
+    one thread at a time, so scrapes arriving together cause one walk of /proc.
+    Samples come from the collector daemon when one is running.
+    """
+    def __init__(self, interval=SAMPLE_INTERVAL, top=TOP_PROCESSES):
+        self.interval = interval
+        self.top = top
+        self.lock = threading.Lock()
+        self.page = None
+        self.sampled = None
+        self.client = connect_collector()
+        self.tree = None
+        self.sampler = None
+        self.manager = None
+        self.packages = None
+        self.package_signature = None
+
+    def page_text(self):
+        with self.lock:
+            if self.page is None or time.monotonic() - self.sampled >= self.interval:
+                started = time.monotonic()
+                writer = MetricsWriter()
+                self.collect(writer)
+                self.sampled = time.monotonic()
+                writer.add("vbox_exporter_collect_seconds", self.sampled - started, "Time spent building this page")
+                self.page = writer.text()
+            return self.page
+
+    # 1. Data, from the daemon or in-process
+
+    def get(self, topic):
+        if self.client is not None and self.client.connected:
+            try:
+                return self.client.get(topic)
+            except CollectorError as e:
+                print(f"Error reading from the collector, sampling locally: {e}")
+        return None
+
+    def ram(self):
+        data = self.get("ram")
+        if data is not None:
+            return data["usage"], data["pressure"]["psi"]
+        from system_toolbox.system_info import get_ram_usage, get_memory_pressure
+        return get_ram_usage(), get_memory_pressure()["psi"]
+
+    def processes(self):
+        data = self.get("processes")
+        if data is not None:
+            return list(data.values())
+        if self.tree is None:
+            from system_toolbox.process_tree import ProcessTree
+            self.tree = ProcessTree()
+        self.tree.update()
+        return self.tree.process_rows()
+
+    def disks(self):
+        data = self.get("disks")
+        if data is not None:
+            return list(data.values())
+        if self.sampler is None:
+            from system_toolbox.mounts import DiskUsageSampler
+            self.sampler = DiskUsageSampler()
+        return self.sampler.sample()
+
+    def package_counts(self):
+        """{type: count}; the inventory is only listed again after the package database changed."""
+        from system_toolbox.package_manager import get_package_manager, package_db_signature
+        signature = package_db_signature()
+        if self.packages is not None and signature == self.package_signature:
+            return self.packages
+        data = self.get("packages")
+        if data is not None:
+            packages = [pkg["type"] for pkg in data.values()]
+        else:
+            if self.manager is None:
+                self.manager = get_package_manager()
+            if self.manager is None:
+                return {}
+            packages = [pkg.type for pkg in self.manager.list_installed()]
+        self.package_signature = signature
+        self.packages = {}
+        for kind in packages:
+            self.packages[kind] = self.packages.get(kind, 0) + 1
+        return self.packages
+
+    # 2. Metrics
+
+    def collect(self, writer):
+        ram, psi = self.ram()
+        writer.add("vbox_memory_total_bytes", ram["total"], "Total physical memory")
+        writer.add("vbox_memory_used_bytes", ram["used"], "Used physical memory")
+        writer.add("vbox_memory_available_bytes", ram["available"], "Memory available for new allocations")
+        for kind in ("some", "full"):
+            if kind in psi:
+                writer.add(f"vbox_memory_pressure_{kind}_percent", psi[kind]["avg10"],
+                           f"Share of time {kind} tasks stalled on memory over 10 s (PSI)")
+
+        processes = self.processes()
+        processes.sort(key=lambda p: p["memory_rss"], reverse=True)
+        writer.add("vbox_processes", len(processes), "Number of processes")
+        # Labels only for the largest processes: every pid label is a new time series
+        for proc in processes[:self.top]:
+            labels = {"pid": proc["pid"], "name": proc["name"]}
+            writer.add("vbox_process_resident_bytes", proc["memory_rss"], "Resident memory of the largest processes", labels)
+            writer.add("vbox_process_cpu_percent", proc.get("cpu_percent"), "CPU use of the largest processes", labels)
+            writer.add("vbox_process_swap_bytes", proc.get("swap"), "Swapped out memory of the largest processes", labels)
+        writer.add("vbox_process_other_resident_bytes", sum(p["memory_rss"] for p in processes[self.top:]),
+                   "Resident memory of all processes not exported individually")
+
+        for disk in self.disks():
+            labels = {"device": disk["device"], "mountpoint": disk["mountpoint"], "fstype": disk["fstype"]}
+            writer.add("vbox_filesystem_responsive", 1 if disk["state"] == "ok" else 0,
+                       "Whether statvfs() answered in time", labels)
+            if disk["state"] != "ok":
+                continue
+            writer.add("vbox_filesystem_size_bytes", disk["total"], "Filesystem size", labels)
+            writer.add("vbox_filesystem_used_bytes", disk["used"], "Used space", labels)
+            writer.add("vbox_filesystem_avail_bytes", disk["free"], "Space available to unprivileged users", labels)
+            writer.add("vbox_filesystem_reserved_bytes", disk.get("reserved"), "Space reserved for root", labels)
+            if disk.get("inodes_total"):
+                writer.add("vbox_filesystem_inodes", disk["inodes_total"], "Total inodes", labels)
+                writer.add("vbox_filesystem_inodes_used", disk["inodes_used"], "Used inodes", labels)
+
+        for kind, count in sorted(self.package_counts().items()):
+            writer.add("vbox_packages_installed", count, "Installed packages by type", {"type": kind})
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    collector = None # set by serve()
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404, "Only /metrics is served")
+            return
+        try:
+            body = self.collector.page_text().encode("utf-8")
+        except Exception as e:
+            self.send_error(500, f"Error collecting metrics: {e}")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # one line per scrape is noise
+
+def serve(address="127.0.0.1", port=DEFAULT_PORT, interval=SAMPLE_INTERVAL, top=TOP_PROCESSES):
+    handler = type("Handler", (MetricsHandler,), {"collector": MetricsCollector(interval, top)})
+    server = ThreadingHTTPServer((address, port), handler)
+    server.daemon_threads = True
+    print(f"Serving metrics on http://{address}:{server.server_address[1]}/metrics")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
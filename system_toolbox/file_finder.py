@@ -0,0 +1,132 @@
+import os
+import stat
+import time
+import heapq
+import threading
+from system_toolbox.dir_scanner import DirectoryScanner
+
+# Files kept per list
+TOP_COUNT = 200
+# Default age for the "not used" list
+STALE_DAYS = 180
+
+class TopFiles:
+    """
+    Bounded min-heap of the `count` largest files offered so far.
+    Memory stays at `count` entries however many files are offered.
+    """
+    def __init__(self, count=TOP_COUNT):
+        self.count = count
+        self.heap = [] # (size, path, last_used)
+
+    def threshold(self):
+        """Smallest size that can still get in (0 while the heap is not full)."""
+        return self.heap[0][0] if len(self.heap) >= self.count else 0
+
+    def offer(self, size, path, last_used):
+        if len(self.heap) < self.count:
+            heapq.heappush(self.heap, (size, path, last_used))
+        elif size > self.heap[0][0]:
+            heapq.heapreplace(self.heap, (size, path, last_used))
+
+    def items(self):
+        """[(size, path, last_used)], largest first."""
+        return sorted(self.heap, reverse=True)
+
+class FileFinder:
+    """
+    Finds the largest files and the largest files not used for `stale_days`
+    below a directory, without ever holding the full file list.
+    - Without a tree, files are collected during a DirectoryScanner walk.
+    - Given a complete DirTree of the same root (from the folder analyzer), no walk is needed:
+      directories are listed largest own_size first, and the search stops once no remaining
+      directory holds enough bytes to beat the smallest file in both lists.
+    The lists can be read from another thread at any time via results().
+    """
+    def __init__(self, root, count=TOP_COUNT, stale_days=STALE_DAYS, tree=None, workers=8):
+        self.root = os.path.abspath(root)
+        self.tree = tree if tree is not None and tree.complete and tree.root_path == self.root else None
+        self.workers = workers
+        self.largest = TopFiles(count)
+        self.stale = TopFiles(count)
+        self.cutoff = time.time() - stale_days * 86400
+        self.files = 0
+        self.directories = 0
+        self.scanner = None
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.scanner is not None:
+            self.scanner.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def results(self):
+        """Returns (largest, stale) as sorted lists; safe to call while find() runs."""
+        with self._lock:
+            return self.largest.items(), self.stale.items()
+
+    def visit(self, dir_path, files):
+        """DirectoryScanner file_visitor: one lock round trip per directory."""
+        with self._lock:
+            self.directories += 1
+            for name, st in files:
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                self.files += 1
+                size = st.st_blocks * 512
+                # noatime / relatime mounts: a write is a use too
+                last_used = max(st.st_atime, st.st_mtime)
+                self.largest.offer(size, os.path.join(dir_path, name), last_used)
+                if last_used < self.cutoff:
+                    self.stale.offer(size, os.path.join(dir_path, name), last_used)
+
+    def find(self):
+        if self.tree is not None:
+            self._find_in_tree()
+        else:
+            self.scanner = DirectoryScanner(self.root, workers=self.workers, file_visitor=self.visit)
+            if self.cancelled:
+                self.scanner.cancel()
+            self.scanner.scan()
+        return self.results()
+
+    def _find_in_tree(self):
+        tree = self.tree
+        own_size = tree.own_size
+        order = sorted(range(len(tree)), key=own_size.__getitem__, reverse=True)
+        seen_inodes = set()
+        for idx in order:
+            if self.cancelled:
+                break
+            # No file can be bigger than the directory's own total
+            with self._lock:
+                bound = min(self.largest.threshold(), self.stale.threshold())
+            if own_size[idx] <= bound:
+                break
+            if tree.own_files[idx] == 0:
+                continue
+            path = tree.path(idx)
+            files = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if not stat.S_ISREG(st.st_mode):
+                            continue
+                        if st.st_nlink > 1:
+                            key = (st.st_dev, st.st_ino)
+                            if key in seen_inodes:
+                                continue
+                            seen_inodes.add(key)
+                        files.append((entry.name, st))
+            except OSError:
+                continue
+            self.visit(path, files)
@@ -0,0 +1,154 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpinBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QTabWidget
+)
+from PySide6.QtCore import Qt, QThread, Signal, QTimer, QUrl
+from PySide6.QtGui import QDesktopServices
+from system_toolbox.file_finder import FileFinder, STALE_DAYS
+from system_toolbox.system_info import format_size
+import os
+import time
+
+class FileFinderWorker(QThread):
+    finished = Signal()
+
+    def __init__(self, finder):
+        super().__init__()
+        self.finder = finder
+
+    def run(self):
+        self.finder.find()
+        self.finished.emit()
+
+class LargeFilesDialog(QDialog):
+    """
+    Largest files, and largest files not used for a number of days, below a mountpoint.
+    The lists fill in while the search runs. With the tree of a finished folder
+    analyzer scan the search only lists the few directories that can matter.
+    """
+    def __init__(self, root, tree=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Large Files - {root}")
+        self.resize(850, 600)
+        self.root = root
+        self.tree = tree
+        self.finder = None
+        self.worker = None
+
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.summary_label = QLabel(root)
+        self.summary_label.setObjectName("subHeaderLabel")
+        controls.addWidget(self.summary_label, 1)
+        controls.addWidget(QLabel("Not used for"))
+        self.days_spin = QSpinBox()
+        self.days_spin.setRange(1, 3650)
+        self.days_spin.setValue(STALE_DAYS)
+        self.days_spin.setSuffix(" days")
+        controls.addWidget(self.days_spin)
+        self.btn_search = QPushButton("Cancel")
+        self.btn_search.setObjectName("primaryBtn")
+        self.btn_search.clicked.connect(self.on_search_button)
+        controls.addWidget(self.btn_search)
+        layout.addLayout(controls)
+
+        self.largest_table = self.create_table()
+        self.stale_table = self.create_table()
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.largest_table, "Largest Files")
+        self.tabs.addTab(self.stale_table, "Not Recently Used")
+        layout.addWidget(self.tabs)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        # The heaps are read every half second while the search runs
+        self.view_timer = QTimer(self)
+        self.view_timer.setInterval(500)
+        self.view_timer.timeout.connect(self.render_results)
+
+        self.start_search()
+
+    def create_table(self):
+        table = QTableWidget()
+        table.setColumnCount(3)
+        table.setHorizontalHeaderLabels(["Size", "Last Used", "Path"])
+        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setShowGrid(False)
+        table.setAlternatingRowColors(True)
+        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setToolTip("Double-click to open the containing folder")
+        table.cellDoubleClicked.connect(lambda row, col, t=table: self.open_folder(t, row))
+        return table
+
+    def start_search(self):
+        self.finder = FileFinder(self.root, stale_days=self.days_spin.value(), tree=self.tree)
+        self.worker = FileFinderWorker(self.finder)
+        self.worker.finished.connect(self.on_search_finished)
+        self.btn_search.setText("Cancel")
+        self.days_spin.setEnabled(False)
+        self.tabs.setTabText(1, f"Not Used in {self.days_spin.value()} Days")
+        self.status_label.setText("Searching...")
+        self.started = time.monotonic()
+        self.worker.start()
+        self.view_timer.start()
+
+    def on_search_button(self):
+        if self.worker is not None and self.worker.isRunning():
+            self.finder.cancel()
+        else:
+            self.start_search()
+
+    def on_search_finished(self):
+        self.view_timer.stop()
+        self.render_results()
+        self.btn_search.setText("Search Again")
+        self.days_spin.setEnabled(True)
+        state = "Search cancelled" if self.finder.cancelled else "Search complete"
+        source = ", from the folder analyzer scan" if self.finder.tree is not None else ""
+        self.status_label.setText(
+            f"{state}: {self.finder.files:,} files in {self.finder.directories:,} folders checked "
+            f"in {time.monotonic() - self.started:.1f} s{source}"
+        )
+
+    def render_results(self):
+        largest, stale = self.finder.results()
+        self.fill_table(self.largest_table, largest)
+        self.fill_table(self.stale_table, stale)
+        self.summary_label.setText(
+            f"Largest: {format_size(sum(f[0] for f in largest))}, "
+            f"not recently used: {format_size(sum(f[0] for f in stale))}"
+        )
+        if self.worker.isRunning():
+            self.status_label.setText(f"Searching... {self.finder.files:,} files checked")
+
+    def fill_table(self, table, files):
+        # Items are reused between refreshes; rows are already ordered by size
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(files))
+        for row, (size, path, last_used) in enumerate(files):
+            values = [format_size(size), time.strftime("%Y-%m-%d", time.localtime(last_used)), path]
+            for col, text in enumerate(values):
+                item = table.item(row, col)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if col == 0:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    table.setItem(row, col, item)
+                item.setText(text)
+        table.setUpdatesEnabled(True)
+
+    def open_folder(self, table, row):
+        item = table.item(row, 2)
+        if item is not None:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.dirname(item.text())))
+
+    def done(self, result):
+        self.view_timer.stop()
+        if self.worker is not None and self.worker.isRunning():
+            self.finder.cancel()
+            self.worker.wait()
+        super().done(result)
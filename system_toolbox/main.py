@@ -2,13 +2,25 @@ import sys
 import os
 from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QSpacerItem, QSizePolicy
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QAction
+from PySide6.QtGui import QIcon, QAction, QShortcut, QKeySequence
 
-# Import tabs
-from system_toolbox.apps_tab import AppsTab
-from system_toolbox.disk_tab import DiskTab
-from system_toolbox.ram_tab import RamTab
 from system_toolbox.styles import get_stylesheet
+from system_toolbox.widgets import LazyTab
+from system_toolbox.watchdog import StallWatchdog
+from system_toolbox import tracing
+
+# Tabs are imported and built the first time they are opened
+def create_apps_tab():
+    from system_toolbox.apps_tab import AppsTab
+    return AppsTab()
+
+def create_disk_tab():
+    from system_toolbox.disk_tab import DiskTab
+    return DiskTab()
+
+def create_ram_tab():
+    from system_toolbox.ram_tab import RamTab
+    return RamTab()
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -40,10 +52,10 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.layout.addWidget(self.tabs)
 
-        # Create Tabs
-        self.tab_apps = AppsTab()
-        self.tab_disk = DiskTab()
-        self.tab_ram = RamTab()
+        # Create Tabs (placeholders until first shown; the real tab is in .widget)
+        self.tab_apps = LazyTab(create_apps_tab)
+        self.tab_disk = LazyTab(create_disk_tab)
+        self.tab_ram = LazyTab(create_ram_tab)
 
         # Add tabs to the widget
         self.tabs.addTab(self.tab_apps, "Applications")
@@ -53,6 +65,25 @@ class MainWindow(QMainWindow):
         # Apply Theme (Light Mode Only)
         self.apply_theme()
 
+        # Hidden diagnostics panel with the timing spans (see tracing.py) and GUI stalls
+        self.diagnostics = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.show_diagnostics)
+        self.watchdog = StallWatchdog(parent=self)
+        if tracing.enabled or os.environ.get("VBOX_WATCHDOG"):
+            self.watchdog.start()
+
+    def closeEvent(self, event):
+        # Shutdown work is not a stall
+        self.watchdog.stop()
+        super().closeEvent(event)
+
+    def show_diagnostics(self):
+        if self.diagnostics is None:
+            from system_toolbox.diagnostics_dialog import DiagnosticsDialog
+            self.diagnostics = DiagnosticsDialog(self.watchdog, self)
+        self.diagnostics.show()
+        self.diagnostics.raise_()
+
     def apply_theme(self):
         app = QApplication.instance()
         app.setStyleSheet(get_stylesheet())
@@ -0,0 +1,107 @@
+import time
+from collections import deque
+from system_toolbox.system_info import get_memory_pressure
+from system_toolbox.tracing import traced
+
+# Samples kept per history (at the 3 s RAM tab tick this is 6 minutes)
+HISTORY_LENGTH = 120
+
+# vmstat counters turned into per-second rates
+RATE_COUNTERS = ["pgmajfault", "pswpin", "pswpout", "workingset_refault_file"]
+
+# Thresholds used by MemoryPressureMonitor.status()
+PSI_FULL_STARVATION = 5.0 # % of time all non-idle tasks stalled on memory (avg10)
+PSI_SOME_PRESSURE = 10.0 # % of time at least one task stalled on memory (avg10)
+MAJFAULT_STARVATION = 500 # major faults per second
+LOW_AVAILABLE_PERCENT = 10.0
+REFAULT_CACHE_PRESSURE = 100 # page cache refaults per second
+
+class MemoryPressureMonitor:
+    """
+    Samples get_memory_pressure() and keeps rolling histories of the
+    values that separate cache pressure from real memory starvation.
+    """
+    def __init__(self, history_length=HISTORY_LENGTH, proc_root="/proc", sys_root="/sys"):
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.previous = None
+        self.previous_time = None
+        self.latest = None
+        self.rates = {key: 0.0 for key in RATE_COUNTERS}
+        self.history = {
+            key: deque(maxlen=history_length)
+            for key in ("available_percent", "cache", "psi_some", "psi_full", "pgmajfault", "pswpin", "pswpout")
+        }
+
+    @traced("memory.pressure_sample")
+    def sample(self):
+        now = time.monotonic()
+        data = get_memory_pressure(self.proc_root, self.sys_root)
+
+        # Rates from the cumulative vmstat counters
+        vmstat = data["vmstat"]
+        if self.previous is not None and now > self.previous_time:
+            elapsed = now - self.previous_time
+            for key in RATE_COUNTERS:
+                delta = vmstat.get(key, 0) - self.previous["vmstat"].get(key, 0)
+                self.rates[key] = max(delta, 0) / elapsed
+        self.previous = data
+        self.previous_time = now
+        self.latest = data
+
+        meminfo = data["meminfo"]
+        total = meminfo.get("MemTotal", 0) or 1
+        psi = data["psi"]
+        self.history["available_percent"].append(meminfo.get("MemAvailable", 0) * 100.0 / total)
+        self.history["cache"].append(self.cache_bytes())
+        self.history["psi_some"].append(psi.get("some", {}).get("avg10", 0.0))
+        self.history["psi_full"].append(psi.get("full", {}).get("avg10", 0.0))
+        for key in ("pgmajfault", "pswpin", "pswpout"):
+            self.history[key].append(self.rates[key])
+        return data
+
+    def cache_bytes(self):
+        """Page cache, buffers and reclaimable slab: memory the kernel can drop under pressure."""
+        meminfo = self.latest["meminfo"] if self.latest else {}
+        return (
+            meminfo.get("Cached", 0) + meminfo.get("Buffers", 0)
+            + meminfo.get("SReclaimable", 0) - meminfo.get("Shmem", 0)
+        )
+
+    def status(self):
+        """
+        Returns (level, text) with level "ok", "cache" (reclaiming cache, nothing stalls),
+        "pressure" (tasks stall on memory) or "starvation" (the whole system stalls / thrashes).
+        """
+        if not self.latest:
+            return "ok", "No data"
+        meminfo = self.latest["meminfo"]
+        psi = self.latest["psi"]
+        total = meminfo.get("MemTotal", 0) or 1
+        available_percent = meminfo.get("MemAvailable", 0) * 100.0 / total
+        some = psi.get("some", {}).get("avg10", 0.0)
+        full = psi.get("full", {}).get("avg10", 0.0)
+        swapping = self.rates["pswpin"] > 0 and self.rates["pswpout"] > 0
+
+        if full >= PSI_FULL_STARVATION or (self.rates["pgmajfault"] >= MAJFAULT_STARVATION and swapping):
+            return "starvation", "Memory starvation: tasks are stalled waiting for memory"
+        if some >= PSI_SOME_PRESSURE:
+            return "pressure", "Memory pressure: some tasks are stalling on reclaim"
+        if available_percent < LOW_AVAILABLE_PERCENT or self.rates["workingset_refault_file"] >= REFAULT_CACHE_PRESSURE:
+            return "cache", "Cache pressure: the kernel is reclaiming page cache, no stalls"
+        return "ok", "No memory pressure"
+
+    def snapshot(self):
+        """Returns a copy of the latest sample, rates, status and histories for the GUI thread."""
+        level, text = self.status()
+        meminfo = self.latest["meminfo"] if self.latest else {}
+        return {
+            "level": level,
+            "status": text,
+            "meminfo": dict(meminfo),
+            "psi": dict(self.latest["psi"]) if self.latest else {},
+            "zram": list(self.latest["zram"]) if self.latest else [],
+            "cache": self.cache_bytes(),
+            "rates": dict(self.rates),
+            "history": {key: list(values) for key, values in self.history.items()}
+        }
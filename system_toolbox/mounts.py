@@ -0,0 +1,332 @@
+import os
+import re
+import time
+import ctypes
+import select
+import threading
+from system_toolbox.disk_io import device_number, block_device_name
+from system_toolbox.tracing import traced
+
+MOUNTINFO = "/proc/self/mountinfo"
+
+# Seconds statvfs() may take before a mount is reported as unresponsive
+STAT_TIMEOUT = 2.0
+
+# Listed even though /proc/filesystems marks them "nodev"
+NETWORK_FSTYPES = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p", "ceph", "glusterfs", "zfs"}
+
+def _unescape(field):
+    # Spaces, tabs, newlines and backslashes are written as \040, \011, \012, \134
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+def parse_mountinfo(text):
+    """
+    Parses /proc/<pid>/mountinfo. Returns a list of dicts with
+    mount_id, parent_id, dev, root, mountpoint, opts, fstype, device, super_opts.
+    """
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            # Optional fields (shared:N, master:N) end with a lone "-"
+            separator = fields.index("-", 6)
+            mounts.append({
+                "mount_id": int(fields[0]),
+                "parent_id": int(fields[1]),
+                "dev": fields[2],
+                "root": _unescape(fields[3]),
+                "mountpoint": _unescape(fields[4]),
+                "opts": fields[5],
+                "fstype": fields[separator + 1],
+                "device": _unescape(fields[separator + 2]),
+                "super_opts": fields[separator + 3] if len(fields) > separator + 3 else "",
+            })
+        except (ValueError, IndexError):
+            continue
+    return mounts
+
+def physical_fstypes(proc_root="/proc"):
+    """Filesystem types backed by a device (the ones /proc/filesystems does not mark "nodev")."""
+    result = set()
+    try:
+        with open(os.path.join(proc_root, "filesystems")) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 1:
+                    result.add(parts[0])
+    except OSError:
+        pass
+    return result
+
+class MountWatcher:
+    """
+    Keeps /proc/self/mountinfo open and re-reads it only after the kernel flags
+    a change: the file reports POLLPRI when anything is mounted or unmounted.
+    The flag is cleared by the poll that sees it, so code polling fileno() itself
+    (a QSocketNotifier) must call invalidate() when it fires.
+    """
+    def __init__(self, path=MOUNTINFO):
+        self.path = path
+        self.file = open(path, "rb", buffering=0)
+        self.poller = select.poll()
+        self.poller.register(self.file.fileno(), select.POLLPRI | select.POLLERR)
+        self.mounts = None
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def invalidate(self):
+        self.dirty = True
+
+    def changed(self):
+        """True if the mount table changed since it was last read (never blocks)."""
+        if self.poller.poll(0):
+            self.dirty = True
+        return self.dirty
+
+    def read(self):
+        """Returns the parsed mount table, re-reading it only when it changed."""
+        with self.lock:
+            if self.mounts is None or self.changed():
+                self.dirty = False
+                self.file.seek(0)
+                chunks = []
+                while True:
+                    chunk = self.file.read(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                self.mounts = parse_mountinfo(b"".join(chunks).decode("utf-8", "surrogateescape"))
+            return self.mounts
+
+    def close(self):
+        self.file.close()
+
+def usage_from_statvfs(st):
+    """
+    total / used / free / percent like psutil.disk_usage() (free is what non-root users can use),
+    plus the blocks reserved for root and inode usage. inodes_percent is None on filesystems
+    without a fixed inode table (btrfs reports 0 inodes).
+    """
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    usable = used + free
+    inodes_used = st.f_files - st.f_ffree
+    return {
+        "total": total,
+        "used": used,
+        "free": free,
+        "percent": round(used * 100.0 / usable, 1) if usable else 0.0,
+        "reserved": (st.f_bfree - st.f_bavail) * st.f_frsize,
+        "inodes_total": st.f_files,
+        "inodes_used": inodes_used,
+        "inodes_percent": round(inodes_used * 100.0 / st.f_files, 1) if st.f_files else None,
+        "readonly": bool(st.f_flag & os.ST_RDONLY),
+    }
+
+def _read_int(path):
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def btrfs_allocation(mount, sys_root="/sys"):
+    """
+    Chunk allocation of a btrfs filesystem from /sys/fs/btrfs/<fsid>/allocation.
+    btrfs runs out of metadata space long before free bytes hit zero, the way
+    other filesystems run out of inodes.
+    """
+    dev = device_number(mount["device"])
+    name = block_device_name(dev, sys_root) if dev else None
+    if name is None:
+        return None
+    base = os.path.join(sys_root, "fs", "btrfs")
+    try:
+        fsids = os.listdir(base)
+    except OSError:
+        return None
+    for fsid in fsids:
+        if not os.path.exists(os.path.join(base, fsid, "devices", name)):
+            continue
+        result = {}
+        for kind in ("data", "metadata", "system"):
+            result[f"{kind}_total"] = _read_int(os.path.join(base, fsid, "allocation", kind, "total_bytes"))
+            result[f"{kind}_used"] = _read_int(os.path.join(base, fsid, "allocation", kind, "bytes_used"))
+        return result
+    return None
+
+def zfs_pool(mount, proc_root="/proc"):
+    """Pool name and health ("ONLINE", "DEGRADED", ...) of a ZFS dataset."""
+    pool = mount["device"].split("/")[0]
+    state = None
+    try:
+        with open(os.path.join(proc_root, "spl", "kstat", "zfs", pool, "state")) as f:
+            state = f.read().strip()
+    except OSError:
+        pass
+    return {"pool": pool, "state": state}
+
+def overlay_layers(mount):
+    """Upper directory (where writes land) and lower layer count of an overlay mount."""
+    options = {}
+    for option in mount.get("super_opts", "").split(","):
+        key, _, value = option.partition("=")
+        options[key] = value
+    lower = options.get("lowerdir", "")
+    return {
+        "upperdir": options.get("upperdir"),
+        "lower_layers": len(lower.split(":")) if lower else 0,
+    }
+
+# quotactl(2); limits are in 1 KiB blocks, current space in bytes
+Q_GETQUOTA = 0x800007
+USRQUOTA = 0
+QUOTA_BLOCK = 1024
+
+class _DqBlk(ctypes.Structure):
+    _fields_ = [
+        ("bhardlimit", ctypes.c_uint64), ("bsoftlimit", ctypes.c_uint64), ("curspace", ctypes.c_uint64),
+        ("ihardlimit", ctypes.c_uint64), ("isoftlimit", ctypes.c_uint64), ("curinodes", ctypes.c_uint64),
+        ("btime", ctypes.c_uint64), ("itime", ctypes.c_uint64), ("valid", ctypes.c_uint32),
+    ]
+
+_libc = None
+
+def user_quota(mount, uid=None):
+    """
+    The user's quota on a local filesystem mounted with quotas enabled, or None.
+    Returns {"used", "soft", "hard", "inodes", "inodes_soft", "inodes_hard"}; 0 means no limit.
+    """
+    global _libc
+    options = set(mount["opts"].split(",")) | set(mount.get("super_opts", "").split(","))
+    if not options & {"quota", "usrquota"} and not any(o.startswith("usrjquota=") for o in options):
+        return None
+    if _libc is None:
+        _libc = ctypes.CDLL(None, use_errno=True)
+    dqblk = _DqBlk()
+    uid = os.getuid() if uid is None else uid
+    if _libc.quotactl((Q_GETQUOTA << 8) | USRQUOTA, mount["device"].encode(), uid, ctypes.byref(dqblk)) != 0:
+        return None
+    return {
+        "used": dqblk.curspace,
+        "soft": dqblk.bsoftlimit * QUOTA_BLOCK,
+        "hard": dqblk.bhardlimit * QUOTA_BLOCK,
+        "inodes": dqblk.curinodes,
+        "inodes_soft": dqblk.isoftlimit,
+        "inodes_hard": dqblk.ihardlimit,
+    }
+
+@traced("disks.stat")
+def mount_details(mount):
+    """
+    Everything known about one mount from a single statvfs() call, plus what
+    /sys, /proc and quotactl report about it. Raises OSError like os.statvfs().
+    """
+    details = usage_from_statvfs(os.statvfs(mount["mountpoint"]))
+    fstype = mount["fstype"]
+    if fstype == "btrfs":
+        details["btrfs"] = btrfs_allocation(mount)
+    elif fstype == "zfs":
+        details["zfs"] = zfs_pool(mount)
+    elif fstype == "overlay":
+        details["overlay"] = overlay_layers(mount)
+    if fstype not in NETWORK_FSTYPES:
+        quota = user_quota(mount)
+        if quota:
+            details["quota"] = quota
+    return details
+
+class DiskUsageSampler:
+    """
+    Partition usage without ever blocking the caller on a hung filesystem.
+    statvfs() runs on a daemon thread per mount; a mount that does not answer
+    within `timeout` is returned with state "unresponsive". While that call is
+    still stuck, later samples do not start another thread for the same mount.
+    """
+    def __init__(self, timeout=STAT_TIMEOUT, watcher=None, proc_root="/proc"):
+        self.timeout = timeout
+        self.watcher = watcher or MountWatcher()
+        self.physical = physical_fstypes(proc_root)
+        self.pending = {} # mountpoint -> thread of a statvfs() that has not returned yet
+        self.lock = threading.Lock()
+
+    def partitions(self, all=False):
+        """Mounts from mountinfo; without `all`, only device-backed and network filesystems (like psutil)."""
+        result = []
+        seen = set()
+        for mount in self.watcher.read():
+            if not all:
+                if mount["device"] in ("", "none"):
+                    continue
+                if mount["fstype"] not in self.physical and mount["fstype"] not in NETWORK_FSTYPES:
+                    continue
+            # A mountpoint mounted over again is only reachable through the last mount
+            if mount["mountpoint"] in seen:
+                result = [m for m in result if m["mountpoint"] != mount["mountpoint"]]
+            seen.add(mount["mountpoint"])
+            result.append(mount)
+        return result
+
+    def _stat(self, mount, results):
+        mountpoint = mount["mountpoint"]
+        try:
+            results[mountpoint] = mount_details(mount)
+        except OSError as e:
+            results[mountpoint] = e
+        finally:
+            with self.lock:
+                self.pending.pop(mountpoint, None)
+
+    @traced("disks.sample")
+    def sample(self, all=False):
+        """
+        Returns a list of dicts like get_disk_usage() plus "state":
+        "ok", "unresponsive" (sizes are None) or "error" (sizes are None, "error" holds the message).
+        "ok" entries also carry the mount_details() fields.
+        """
+        partitions = self.partitions(all)
+        results = {}
+        threads = []
+        with self.lock:
+            for mount in partitions:
+                mountpoint = mount["mountpoint"]
+                if mountpoint in self.pending:
+                    continue # still hung from an earlier sample
+                thread = threading.Thread(target=self._stat, args=(mount, results), daemon=True)
+                self.pending[mountpoint] = thread
+                threads.append(thread)
+        for thread in threads:
+            thread.start()
+
+        # One shared deadline: the whole sample takes at most `timeout`
+        deadline = time.monotonic() + self.timeout
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+        disk_info = []
+        for mount in partitions:
+            entry = {
+                "device": mount["device"],
+                "mountpoint": mount["mountpoint"],
+                "fstype": mount["fstype"],
+                "opts": mount["opts"],
+                "dev": mount["dev"],
+                "total": None, "used": None, "free": None, "percent": None,
+            }
+            result = results.get(mount["mountpoint"])
+            if result is None:
+                entry["state"] = "unresponsive"
+            elif isinstance(result, OSError):
+                if isinstance(result, PermissionError):
+                    continue # like get_disk_usage(), skip what we may not look at
+                entry["state"] = "error"
+                entry["error"] = str(result)
+            else:
+                entry.update(result)
+                entry["state"] = "ok"
+            disk_info.append(entry)
+        return disk_info
@@ -1,33 +1,156 @@
 import subprocess
 import os
-from dataclasses import dataclass
+import sys
+from array import array
 from typing import List, Optional
 
-@dataclass
+PACKAGE_FIELDS = ["name", "size_mb", "version", "type", "status", "desktop_file_path", "exec_path"]
+
+class PackageList:
+    """
+    Package inventory stored by column: names and versions in lists, sizes in a float array,
+    and each package's (type, status) pair as an index into the few distinct pairs.
+    Only desktop apps have paths, so those live in a dict. Items are PackageInfo views
+    onto one row, created on access, so a package costs its two strings and a few bytes.
+    """
+    def __init__(self, packages=()):
+        self.names = []
+        self.versions = []
+        self.sizes = array('d')
+        self.kinds = array('H') # index into kind_values
+        self.kind_values = [] # distinct (type, status)
+        self.kind_index = {}
+        self.paths = {} # row -> (desktop_file_path, exec_path)
+        self.extend(packages)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [PackageInfo.at(self, i) for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("package index out of range")
+        return PackageInfo.at(self, row)
+
+    def __iter__(self):
+        for row in range(len(self.names)):
+            yield PackageInfo.at(self, row)
+
+    def __repr__(self):
+        return f"PackageList({len(self)} packages)"
+
+    def add(self, name, size_mb, version, type, status="Installed", desktop_file_path=None, exec_path=None):
+        row = len(self.names)
+        kind = (type, status)
+        index = self.kind_index.get(kind)
+        if index is None:
+            index = self.kind_index[kind] = len(self.kind_values)
+            self.kind_values.append((sys.intern(type), sys.intern(status)))
+        self.names.append(name)
+        # Many packages share a version ("1.0-1", "N/A"...)
+        self.versions.append(sys.intern(version))
+        self.sizes.append(size_mb)
+        self.kinds.append(index)
+        if desktop_file_path is not None or exec_path is not None:
+            self.paths[row] = (desktop_file_path, exec_path)
+        return row
+
+    def append(self, pkg):
+        self.add(pkg.name, pkg.size_mb, pkg.version, pkg.type, pkg.status, pkg.desktop_file_path, pkg.exec_path)
+
+    def extend(self, packages):
+        for pkg in packages:
+            self.append(pkg)
+
 class PackageInfo:
-    name: str
-    size_mb: float
-    version: str
-    type: str  # "apt" / "rpm" / "AppImage" / "Flatpak" / "Snap"
-    status: str = "Installed"
-    desktop_file_path: Optional[str] = None
-    exec_path: Optional[str] = None
+    """
+    One installed package: a view onto a row of a PackageList. Built directly, a package
+    gets a one-row list of its own.
+    """
+    __slots__ = ("store", "row")
+
+    def __init__(self, name, size_mb, version, type, status="Installed", desktop_file_path=None, exec_path=None):
+        self.store = PackageList()
+        self.row = self.store.add(name, size_mb, version, type, status, desktop_file_path, exec_path)
+
+    @classmethod
+    def at(cls, store, row):
+        pkg = cls.__new__(cls)
+        pkg.store = store
+        pkg.row = row
+        return pkg
+
+    @property
+    def name(self) -> str:
+        return self.store.names[self.row]
+
+    @property
+    def size_mb(self) -> float:
+        return self.store.sizes[self.row]
+
+    @property
+    def version(self) -> str:
+        return self.store.versions[self.row]
+
+    @property
+    def type(self) -> str:  # "apt" / "rpm" / "Desktop App" / "AppImage" / "Flatpak" / "Snap"
+        return self.store.kind_values[self.store.kinds[self.row]][0]
+
+    @property
+    def status(self) -> str:
+        return self.store.kind_values[self.store.kinds[self.row]][1]
+
+    @property
+    def desktop_file_path(self) -> Optional[str]:
+        return self.store.paths.get(self.row, (None, None))[0]
+
+    @property
+    def exec_path(self) -> Optional[str]:
+        return self.store.paths.get(self.row, (None, None))[1]
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in PACKAGE_FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, PackageInfo):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in PACKAGE_FIELDS)
+        return f"PackageInfo({fields})"
 
 class BasePackageManager:
-    def list_installed(self) -> List[PackageInfo]:
+    def list_installed(self) -> PackageList:
         raise NotImplementedError
 
     def uninstall_cmd(self, pkg_name: str) -> List[str]:
         """Returns the command list to be used with subprocess.Popen."""
         raise NotImplementedError
 
+    def uninstall_many_cmd(self, pkg_names: List[str]) -> List[str]:
+        """Like uninstall_cmd(), for several packages in one transaction."""
+        raise NotImplementedError
+
 class AptPackageManager(BasePackageManager):
-    def list_installed(self) -> List[PackageInfo]:
-        packages = []
+    def __init__(self, admindir: Optional[str] = None):
+        # dpkg database directory (holding "status"); None is dpkg's default, /var/lib/dpkg
+        self.admindir = admindir
+
+    def list_installed(self) -> PackageList:
+        packages = PackageList()
+        command = ["dpkg-query", "-W", "-f=${Package}\t${Installed-Size}\t${Version}\n"]
+        if self.admindir:
+            command.insert(1, f"--admindir={self.admindir}")
         try:
             # Run dpkg-query to get package name, installed size (KB), and version
             result = subprocess.run(
-                ["dpkg-query", "-W", "-f=${Package}\t${Installed-Size}\t${Version}\n"],
+                command,
                 capture_output=True,
                 text=True,
                 check=True
@@ -42,12 +165,12 @@ class AptPackageManager(BasePackageManager):
                         name = parts[0]
                         size_kb = float(parts[1])
                         version = parts[2]
-                        packages.append(PackageInfo(
+                        packages.add(
                             name=name,
                             size_mb=size_kb / 1024,
                             version=version,
                             type="apt"
-                        ))
+                        )
                 except ValueError:
                     continue
                     
@@ -62,9 +185,12 @@ class AptPackageManager(BasePackageManager):
         # Use purge to remove config files and related data
         return ["pkexec", "apt", "purge", "-y", pkg_name]
 
+    def uninstall_many_cmd(self, pkg_names: List[str]) -> List[str]:
+        return ["pkexec", "apt", "purge", "-y", *pkg_names]
+
 class DnfRpmPackageManager(BasePackageManager):
-    def list_installed(self) -> List[PackageInfo]:
-        packages = []
+    def list_installed(self) -> PackageList:
+        packages = PackageList()
         try:
             # Run rpm -qa to get package name, size (bytes), and version
             result = subprocess.run(
@@ -83,12 +209,12 @@ class DnfRpmPackageManager(BasePackageManager):
                         name = parts[0]
                         size_bytes = float(parts[1])
                         version = parts[2]
-                        packages.append(PackageInfo(
+                        packages.add(
                             name=name,
                             size_mb=size_bytes / (1024 * 1024),
                             version=version,
                             type="rpm"
-                        ))
+                        )
                 except ValueError:
                     continue
                     
@@ -102,6 +228,22 @@ class DnfRpmPackageManager(BasePackageManager):
     def uninstall_cmd(self, pkg_name: str) -> List[str]:
         return ["pkexec", "dnf", "remove", "-y", pkg_name]
 
+    def uninstall_many_cmd(self, pkg_names: List[str]) -> List[str]:
+        return ["pkexec", "dnf", "remove", "-y", *pkg_names]
+
+# A package install / removal touches one of these
+PACKAGE_DATABASES = ["/var/lib/dpkg/status", "/var/lib/rpm", "/usr/lib/sysimage/rpm"]
+
+def package_db_signature():
+    """Modification times of the package databases: changes whenever packages do."""
+    signature = []
+    for path in PACKAGE_DATABASES:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return signature
+
 def detect_distro():
     """
     Reads /etc/os-release to detect the distribution.
@@ -0,0 +1,177 @@
+import os
+import select
+import signal
+import time
+
+# Result of delivering a signal to one PID
+EXITED = "exited"
+KILLED = "killed" # exited only after escalation to SIGKILL
+ALIVE = "alive" # still running when the wait ended (handled or ignored signal)
+SENT = "sent" # delivered a signal that is not meant to end the process (not waited for)
+NOT_FOUND = "not found"
+DENIED = "permission denied"
+
+# Signals a process may well survive (or handle, like SIGINT): delivered without waiting for an exit
+NO_WAIT_SIGNALS = (signal.SIGINT, signal.SIGSTOP, signal.SIGCONT, signal.SIGHUP, signal.SIGUSR1, signal.SIGUSR2)
+
+def descendants(pid, proc_root="/proc"):
+    """
+    Returns the PIDs of all descendants of `pid`, parents before children,
+    read from the ppid field of /proc/<pid>/stat.
+    """
+    children = {}
+    try:
+        names = os.listdir(proc_root)
+    except OSError:
+        return []
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"{proc_root}/{name}/stat", "rb") as f:
+                data = f.read()
+            ppid = int(data[data.rfind(b")") + 2:].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    result = []
+    queue = list(children.get(pid, []))
+    while queue:
+        child = queue.pop(0)
+        result.append(child)
+        queue.extend(children.get(child, []))
+    return result
+
+class _Target:
+    """One signalled process; the pidfd (when supported) makes the exit pollable."""
+    __slots__ = ("pid", "fd")
+
+    def __init__(self, pid, fd):
+        self.pid = pid
+        self.fd = fd
+
+    def send(self, sig):
+        if self.fd is not None:
+            # Signalling through the pidfd cannot hit a recycled PID
+            signal.pidfd_send_signal(self.fd, sig)
+        else:
+            os.kill(self.pid, sig)
+
+    def has_exited(self):
+        """Exit check for targets without a pidfd (those are polled instead)."""
+        try:
+            os.kill(self.pid, 0)
+            return False
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+def _open_target(pid):
+    try:
+        return _Target(pid, os.pidfd_open(pid))
+    except ProcessLookupError:
+        raise
+    except (AttributeError, OSError):
+        # pidfd_open needs Linux 5.3+, fall back to plain PIDs
+        return _Target(pid, None)
+
+def deliver_signals(pids, sig=signal.SIGTERM, escalate_after=5.0, on_exit=None, is_cancelled=None):
+    """
+    Sends `sig` to every PID and waits for them to exit.
+    Processes still alive after `escalate_after` seconds get SIGKILL (pass None to disable).
+    on_exit(pid, result) is called as soon as each process goes away.
+    Returns {pid: result}.
+    """
+    results = {}
+    targets = {}
+
+    # 1. Deliver the signal to the whole batch first
+    for pid in pids:
+        if pid in results or pid in targets:
+            continue
+        target = None
+        try:
+            target = _open_target(pid)
+            target.send(sig)
+        except ProcessLookupError:
+            results[pid] = NOT_FOUND
+        except PermissionError:
+            results[pid] = DENIED
+        else:
+            targets[pid] = target
+            continue
+        if target is not None:
+            target.close()
+
+    if sig == signal.SIGKILL:
+        escalate_after = None
+    # Signals that do not terminate are not waited for
+    if sig in NO_WAIT_SIGNALS:
+        for pid, target in targets.items():
+            results[pid] = SENT
+            target.close()
+        return results
+
+    # 2. Wait for exits, escalating once the grace period is over
+    poller = select.poll()
+    polling = {}
+    for target in targets.values():
+        if target.fd is not None:
+            poller.register(target.fd, select.POLLIN)
+            polling[target.fd] = target
+
+    def finish(target, result):
+        if target.fd is not None:
+            poller.unregister(target.fd)
+            del polling[target.fd]
+        target.close()
+        del targets[target.pid]
+        results[target.pid] = result
+        if on_exit:
+            on_exit(target.pid, result)
+
+    escalated = False
+    start = time.monotonic()
+    # After SIGKILL the kernel reaps quickly, give it a short grace period only
+    kill_grace = 2.0
+    deadline = start + (escalate_after if escalate_after is not None else kill_grace)
+
+    while targets:
+        if is_cancelled and is_cancelled():
+            break
+        now = time.monotonic()
+        if now >= deadline:
+            if escalate_after is not None and not escalated:
+                escalated = True
+                for target in list(targets.values()):
+                    try:
+                        target.send(signal.SIGKILL)
+                    except ProcessLookupError:
+                        finish(target, EXITED)
+                    except PermissionError:
+                        pass
+                deadline = now + kill_grace
+                continue
+            break
+
+        # pidfds become readable on exit; processes without one are re-checked every 100 ms
+        timeout = min(deadline - now, 0.1) if len(polling) < len(targets) else deadline - now
+        for fd, _ in poller.poll(max(timeout, 0) * 1000):
+            target = polling.get(fd)
+            if target is not None:
+                finish(target, KILLED if escalated else EXITED)
+        for target in [t for t in targets.values() if t.fd is None]:
+            if target.has_exited():
+                finish(target, KILLED if escalated else EXITED)
+
+    for target in list(targets.values()):
+        target.close()
+        results[target.pid] = ALIVE
+    return results
@@ -0,0 +1,398 @@
+import os
+import time
+import heapq
+from operator import attrgetter
+from system_toolbox.tracing import traced
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+# Sortable process columns: row key -> ProcNode attribute
+METRICS = {
+    "pid": "pid",
+    "name": "name",
+    "cpu_percent": "cpu_percent",
+    "memory_percent": "rss",
+    "memory_rss": "rss",
+    "swap": "swap",
+    "read_rate": "read_rate",
+    "write_rate": "write_rate",
+}
+
+# Suffixes stripped from executable / package names before matching (same idea as IconLoader)
+NAME_SUFFIXES = ["-stable", "-bin", "-git", "-edition", "-core", "-browser"]
+
+def clean_name(name):
+    for suffix in NAME_SUFFIXES:
+        name = name.replace(suffix, "")
+    return name
+
+def build_app_index(desktop_entries):
+    """
+    Builds a lookup of executable / WM class / launcher names to application names
+    from the dictionaries returned by desktop_entries.parse_desktop_file.
+    """
+    index = {}
+    for res in desktop_entries:
+        if not res:
+            continue
+        app_name = res['app_name'] or res['key_filename'].title()
+        for key in (res['exec_name'], res['startup_class'], res['key_filename']):
+            if key:
+                index.setdefault(key, app_name)
+                index.setdefault(clean_name(key), app_name)
+    return index
+
+def unit_from_cgroup(cgroup_path):
+    """
+    Returns the systemd unit (service/scope/slice) a cgroup v2 path belongs to.
+    e.g. /user.slice/user-1000.slice/user@1000.service/app.slice/app-firefox-123.scope
+    -> app-firefox-123.scope
+    """
+    parts = [p for p in cgroup_path.split("/") if p]
+    if not parts:
+        return "-.slice"
+    # Skip leaf sub-cgroups that some services create below their unit
+    for part in reversed(parts):
+        if part.endswith((".service", ".scope", ".slice")):
+            return part
+    return parts[-1]
+
+class ProcNode:
+    """Per-PID state kept across samples."""
+    __slots__ = (
+        "pid", "ppid", "name", "exe", "unit", "app",
+        "starttime", "rss", "pss", "swap", "children",
+        # Cumulative counters from the previous sample and the rates derived from them
+        "cpu_ticks", "read_bytes", "write_bytes",
+        "cpu_percent", "read_rate", "write_rate"
+    )
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.ppid = 0
+        self.name = ""
+        self.exe = ""
+        self.unit = ""
+        self.app = None
+        self.starttime = 0
+        self.rss = 0
+        self.pss = None # None when smaps_rollup is not readable
+        self.swap = 0
+        self.children = set()
+        self.cpu_ticks = 0
+        self.read_bytes = None # None when /proc/<pid>/io is not readable
+        self.write_bytes = None
+        self.cpu_percent = 0.0
+        self.read_rate = 0.0
+        self.write_rate = 0.0
+
+    @property
+    def memory(self):
+        """PSS when available, RSS otherwise."""
+        return self.pss if self.pss is not None else self.rss
+
+class ProcessTree:
+    """
+    Process tree built from the ppid links in /proc/<pid>/stat.
+    The tree is kept between calls to update(): only new PIDs are read in full,
+    dead PIDs are unlinked and existing PIDs only have their counters refreshed.
+    """
+    def __init__(self, proc_root="/proc"):
+        self.proc_root = proc_root
+        self.nodes = {}
+        self.app_index = {}
+        self.mem_total = self._read_mem_total()
+        self.last_sample = None
+
+    def _read_mem_total(self):
+        try:
+            with open(os.path.join(self.proc_root, "meminfo"), "r") as f:
+                for line in f:
+                    if line.startswith("MemTotal:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass
+        return 0
+
+    def set_desktop_entries(self, desktop_entries):
+        self.app_index = build_app_index(desktop_entries)
+        for node in self.nodes.values():
+            node.app = None
+        self._resolve_apps(self.nodes.values())
+
+    @traced("processes.sample")
+    def update(self):
+        """
+        Refreshes the tree from /proc. Returns the set of PIDs that appeared.
+        """
+        try:
+            current = {int(name) for name in os.listdir(self.proc_root) if name.isdigit()}
+        except OSError as e:
+            print(f"Error listing processes: {e}")
+            return set()
+
+        now = time.monotonic()
+        elapsed = now - self.last_sample if self.last_sample is not None else 0.0
+        self.last_sample = now
+
+        # 1. Unlink processes that exited
+        for pid in self.nodes.keys() - current:
+            self._remove(pid)
+
+        # 2. Refresh existing processes and read new ones
+        added = []
+        for pid in current:
+            stat = self._read_stat(pid)
+            if stat is None:
+                if pid in self.nodes:
+                    self._remove(pid)
+                continue
+
+            node = self.nodes.get(pid)
+            if node is not None and node.starttime != stat[2]:
+                # PID was reused by a new process since the last sample
+                self._remove(pid)
+                node = None
+
+            is_new = node is None
+            if is_new:
+                node = ProcNode(pid)
+                node.starttime = stat[2]
+                self._read_static(node)
+                self.nodes[pid] = node
+                added.append(node)
+
+            node.name = stat[0]
+            if node.ppid != stat[1]:
+                self._relink(node, stat[1])
+            node.rss = stat[3]
+            node.pss, node.swap = self._read_memory(pid)
+
+            # Rates are deltas of cumulative counters, new processes start at zero
+            read_bytes, write_bytes = self._read_io(pid)
+            if not is_new and elapsed > 0:
+                node.cpu_percent = (stat[4] - node.cpu_ticks) * 100.0 / CLK_TCK / elapsed
+                if read_bytes is not None and node.read_bytes is not None:
+                    node.read_rate = (read_bytes - node.read_bytes) / elapsed
+                    node.write_rate = (write_bytes - node.write_bytes) / elapsed
+            node.cpu_ticks = stat[4]
+            node.read_bytes = read_bytes
+            node.write_bytes = write_bytes
+
+        # Parents may have been read after their children; link orphans now
+        for node in added:
+            parent = self.nodes.get(node.ppid)
+            if parent is not None:
+                parent.children.add(node.pid)
+
+        self._resolve_apps(added)
+        return {node.pid for node in added}
+
+    def _read_stat(self, pid):
+        try:
+            with open(f"{self.proc_root}/{pid}/stat", "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # comm may contain spaces and parentheses, so split on the last ')'
+        lpar = data.find(b"(")
+        rpar = data.rfind(b")")
+        if lpar < 0 or rpar < 0:
+            return None
+        name = data[lpar + 1:rpar].decode(errors="replace")
+        fields = data[rpar + 2:].split()
+        try:
+            ppid = int(fields[1])
+            cpu_ticks = int(fields[11]) + int(fields[12]) # utime + stime
+            starttime = int(fields[19])
+            rss = int(fields[21]) * PAGE_SIZE
+        except (IndexError, ValueError):
+            return None
+        return name, ppid, starttime, rss, cpu_ticks
+
+    def _read_static(self, node):
+        # Executable and cgroup never change for the lifetime of a process, read them once
+        try:
+            node.exe = os.readlink(f"{self.proc_root}/{node.pid}/exe")
+        except OSError:
+            node.exe = ""
+        try:
+            with open(f"{self.proc_root}/{node.pid}/cgroup", "r") as f:
+                for line in f:
+                    # cgroup v2 unified hierarchy line: "0::/path"
+                    if line.startswith("0::"):
+                        node.unit = unit_from_cgroup(line[3:].strip())
+                        break
+                else:
+                    node.unit = ""
+        except OSError:
+            node.unit = ""
+
+    def _read_memory(self, pid):
+        """
+        Returns (pss, swap) in bytes. smaps_rollup is only readable for our own
+        processes; for the others PSS is None and swap comes from the world-readable status.
+        """
+        pss = None
+        swap = 0
+        try:
+            with open(f"{self.proc_root}/{pid}/smaps_rollup", "rb") as f:
+                for line in f:
+                    if line.startswith(b"Pss:"):
+                        pss = int(line.split()[1]) * 1024
+                    elif line.startswith(b"Swap:"):
+                        swap = int(line.split()[1]) * 1024
+            return pss, swap
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(f"{self.proc_root}/{pid}/status", "rb") as f:
+                for line in f:
+                    if line.startswith(b"VmSwap:"):
+                        swap = int(line.split()[1]) * 1024
+                        break
+        except (OSError, ValueError):
+            pass
+        return pss, swap
+
+    def _read_io(self, pid):
+        """Returns cumulative (read_bytes, write_bytes), or (None, None) without permission."""
+        read_bytes = write_bytes = None
+        try:
+            with open(f"{self.proc_root}/{pid}/io", "rb") as f:
+                for line in f:
+                    if line.startswith(b"read_bytes:"):
+                        read_bytes = int(line.split()[1])
+                    elif line.startswith(b"write_bytes:"):
+                        write_bytes = int(line.split()[1])
+        except (OSError, ValueError):
+            return None, None
+        if read_bytes is None or write_bytes is None:
+            return None, None
+        return read_bytes, write_bytes
+
+    def _relink(self, node, new_ppid):
+        old_parent = self.nodes.get(node.ppid)
+        if old_parent is not None:
+            old_parent.children.discard(node.pid)
+        node.ppid = new_ppid
+        new_parent = self.nodes.get(new_ppid)
+        if new_parent is not None:
+            new_parent.children.add(node.pid)
+
+    def _remove(self, pid):
+        node = self.nodes.pop(pid, None)
+        if node is None:
+            return
+        parent = self.nodes.get(node.ppid)
+        if parent is not None:
+            parent.children.discard(pid)
+
+    def _match_app(self, node):
+        candidates = []
+        if node.exe:
+            exe_name = os.path.basename(node.exe).lower()
+            if exe_name.endswith(" (deleted)"):
+                exe_name = exe_name[:-10]
+            candidates.append(exe_name)
+        if node.name:
+            candidates.append(node.name.lower())
+        for cand in candidates:
+            app = self.app_index.get(cand) or self.app_index.get(clean_name(cand))
+            if app:
+                return app
+        return None
+
+    def _resolve_apps(self, nodes):
+        if not self.app_index:
+            return
+        # Resolve parents before children so helpers can inherit the app of their launcher
+        for node in sorted(nodes, key=lambda n: n.starttime):
+            app = self._match_app(node)
+            if app is None:
+                # Inherit only within the same cgroup unit, so processes spawned
+                # by the shell or session manager are not attributed to it
+                parent = self.nodes.get(node.ppid)
+                if parent is not None and parent.app and parent.unit == node.unit:
+                    app = parent.app
+            node.app = app
+
+    def roots(self):
+        """Returns PIDs whose parent is not part of the tree (init, kthreadd)."""
+        return [pid for pid, node in self.nodes.items() if node.ppid not in self.nodes]
+
+    def subtree_totals(self):
+        """
+        Returns {pid: (rss, pss, count)} summed over each process and all its descendants.
+        """
+        totals = {}
+        # Iterative post-order walk, the tree can be deeper than the recursion limit
+        for root in self.roots():
+            stack = [(root, False)]
+            while stack:
+                pid, visited = stack.pop()
+                node = self.nodes[pid]
+                if not visited:
+                    stack.append((pid, True))
+                    for child in node.children:
+                        if child in self.nodes:
+                            stack.append((child, False))
+                    continue
+                rss = node.rss
+                pss = node.memory
+                count = 1
+                for child in node.children:
+                    child_totals = totals.get(child)
+                    if child_totals:
+                        rss += child_totals[0]
+                        pss += child_totals[1]
+                        count += child_totals[2]
+                totals[pid] = (rss, pss, count)
+        return totals
+
+    def aggregate(self, key):
+        """
+        Groups processes by an attribute ("unit" or "app").
+        Returns a list of dictionaries sorted by PSS, largest first.
+        """
+        groups = {}
+        for node in self.nodes.values():
+            group_key = getattr(node, key) or "Other"
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = {"name": group_key, "rss": 0, "pss": 0, "pids": []}
+            group["rss"] += node.rss
+            group["pss"] += node.memory
+            group["pids"].append(node.pid)
+        result = list(groups.values())
+        result.sort(key=lambda g: g["pss"], reverse=True)
+        return result
+
+    def top(self, metric="memory_rss", count=50, descending=True):
+        """
+        Returns the top `count` processes by one of the METRICS keys.
+        Uses a bounded heap, so only the selected rows are ordered, not the whole list.
+        """
+        key = attrgetter(METRICS[metric])
+        select = heapq.nlargest if descending else heapq.nsmallest
+        return [self.process_row(node) for node in select(count, self.nodes.values(), key=key)]
+
+    def process_row(self, node):
+        """
+        Returns a process in the format of system_info.get_process_list, plus the rate columns.
+        """
+        mem_total = self.mem_total or 1
+        return {
+            "pid": node.pid,
+            "name": node.name,
+            "memory_percent": node.rss * 100.0 / mem_total,
+            "memory_rss": node.rss,
+            "cpu_percent": node.cpu_percent,
+            "swap": node.swap,
+            "read_rate": node.read_rate,
+            "write_rate": node.write_rate
+        }
+
+    def process_rows(self):
+        return [self.process_row(node) for node in self.nodes.values()]
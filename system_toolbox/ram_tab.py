@@ -1,19 +1,181 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QProgressBar, QTableWidget, 
-    QTableWidgetItem, QHeaderView, QHBoxLayout, QMenu, QMessageBox
+    QTableWidgetItem, QHeaderView, QHBoxLayout, QMenu, QMessageBox,
+    QComboBox, QTreeWidget, QTreeWidgetItem, QFrame, QGridLayout
 )
 from PySide6.QtCore import QTimer, QThread, Signal, Qt, QPoint
 from PySide6.QtGui import QAction
-from system_toolbox.system_info import get_ram_usage, get_process_list
+from system_toolbox.system_info import get_ram_usage
+from system_toolbox.process_tree import ProcessTree
+from system_toolbox.memory_pressure import MemoryPressureMonitor
+from system_toolbox.widgets import Sparkline
+from system_toolbox.tracing import traced
+from system_toolbox.styles import set_style_state
+from system_toolbox.collector import CollectorConnection, CollectorError
+from system_toolbox.desktop_entries import find_desktop_files, parse_desktop_file
+from system_toolbox.process_control import (
+    deliver_signals, descendants, EXITED, KILLED, DENIED, ALIVE, SENT, NO_WAIT_SIGNALS
+)
 import os
+import heapq
 import signal
+import time
+from operator import itemgetter
+
+# Seconds to wait after SIGTERM before escalating to SIGKILL
+ESCALATE_AFTER = 5.0
+
+# Signals offered in the "Send Signal" menu
+OTHER_SIGNALS = [signal.SIGINT, signal.SIGHUP, signal.SIGSTOP, signal.SIGCONT]
+
+# View modes for the process section: (label, grouping)
+VIEW_MODES = [
+    ("Processes", None),
+    ("Process Tree", "tree"),
+    ("By Application", "app"),
+    ("By Service (cgroup)", "unit"),
+]
+
+# Process table columns: (header, row key used for sorting, sort descending by default)
+PROCESS_COLUMNS = [
+    ("PID", "pid", False),
+    ("Name", "name", False),
+    ("CPU %", "cpu_percent", True),
+    ("Memory %", "memory_percent", True),
+    ("Memory (MB)", "memory_rss", True),
+    ("Swap (MB)", "swap", True),
+    ("Read/s", "read_rate", True),
+    ("Write/s", "write_rate", True),
+]
+
+def format_rate(bytes_per_sec):
+    if bytes_per_sec >= 1024**2:
+        return f"{bytes_per_sec / (1024**2):.1f} MB/s"
+    if bytes_per_sec >= 1024:
+        return f"{bytes_per_sec / 1024:.1f} KB/s"
+    return f"{bytes_per_sec:.0f} B/s"
 
 class ProcessWorker(QThread):
-    finished = Signal(list)
+    finished = Signal(list, list, float) # top processes, tree rows, sample start time
+    pressure_sampled = Signal(object) # MemoryPressureMonitor.snapshot()
+
+    def __init__(self, tree, grouping, sort_metric="memory_rss", descending=True, pressure_monitor=None, collector=None):
+        super().__init__()
+        self.tree = tree
+        self.collector = collector
+        self.pressure_monitor = pressure_monitor
+        self.grouping = grouping
+        self.sort_metric = sort_metric
+        self.descending = descending
+
+    def run(self):
+        started_at = time.monotonic()
+
+        # A collector daemon already samples processes and memory; the grouped views need the local tree
+        if self.collector is not None and self.collector.connected and self.grouping is None:
+            try:
+                rows = self.collector.get("processes")
+                ram = self.collector.get("ram")
+            except CollectorError as e:
+                print(f"Error reading from the collector, sampling locally: {e}")
+            else:
+                self.pressure_sampled.emit(ram["pressure"])
+                select = heapq.nlargest if self.descending else heapq.nsmallest
+                processes = select(50, rows.values(), key=itemgetter(self.sort_metric))
+                self.finished.emit(processes, [], started_at)
+                return
+
+        # Desktop entries are only needed to attribute processes to applications
+        if self.grouping == "app" and not self.tree.app_index:
+            entries = [parse_desktop_file(path) for path in find_desktop_files()]
+            self.tree.set_desktop_entries(entries)
+
+        # System-wide pressure is sampled on the same tick as the processes
+        if self.pressure_monitor is not None:
+            self.pressure_monitor.sample()
+            self.pressure_sampled.emit(self.pressure_monitor.snapshot())
+
+        self.tree.update()
+
+        # Show top 50 processes by the selected column
+        processes = self.tree.top(self.sort_metric, 50, self.descending)
+
+        rows = []
+        if self.grouping == "tree":
+            rows = self.tree_rows()
+        elif self.grouping:
+            rows = self.group_rows(self.grouping)
+        self.finished.emit(processes, rows, started_at)
+
+    def tree_rows(self):
+        """
+        Rows are (key, parent_key, name, pid, count, rss, pss), parents before children.
+        """
+        nodes = self.tree.nodes
+        totals = self.tree.subtree_totals()
+        rows = []
+        stack = [(pid, None) for pid in self.tree.roots()]
+        while stack:
+            pid, parent_key = stack.pop()
+            rss, pss, count = totals[pid]
+            # Kernel threads (kthreadd subtree) have no memory of their own
+            if rss == 0:
+                continue
+            node = nodes[pid]
+            rows.append((pid, parent_key, node.name, pid, count, rss, pss))
+            for child in node.children:
+                if child in nodes:
+                    stack.append((child, pid))
+        return rows
+
+    def group_rows(self, key):
+        nodes = self.tree.nodes
+        rows = []
+        for group in self.tree.aggregate(key):
+            if group["rss"] == 0:
+                continue
+            group_key = ("group", group["name"])
+            rows.append((group_key, None, group["name"], None, len(group["pids"]), group["rss"], group["pss"]))
+            for pid in group["pids"]:
+                node = nodes[pid]
+                if node.rss:
+                    rows.append((pid, group_key, node.name, pid, 1, node.rss, node.memory))
+        return rows
+
+class SignalWorker(QThread):
+    process_exited = Signal(int, str) # pid, result
+    finished = Signal(object) # {pid: result}, int keys do not survive a QVariantMap
+
+    def __init__(self, pids, sig, escalate_after, include_tree=False):
+        super().__init__()
+        self.pids = pids
+        self.sig = sig
+        self.escalate_after = escalate_after
+        self.include_tree = include_tree
 
     def run(self):
-        data = get_process_list()
-        self.finished.emit(data)
+        pids = list(self.pids)
+        if self.include_tree:
+            for pid in self.pids:
+                pids.extend(descendants(pid))
+        # Never signal ourselves through a selected parent (e.g. the terminal VBox runs in)
+        pids = [pid for pid in pids if pid != os.getpid()]
+
+        results = deliver_signals(
+            pids, self.sig, self.escalate_after,
+            on_exit=self.process_exited.emit
+        )
+        self.finished.emit(results)
+
+class NumericTreeWidgetItem(QTreeWidgetItem):
+    """Tree item sorting numeric columns by the raw value stored in UserRole"""
+    def __lt__(self, other):
+        column = self.treeWidget().sortColumn() if self.treeWidget() else 0
+        my_value = self.data(column, Qt.UserRole)
+        other_value = other.data(column, Qt.UserRole)
+        if my_value is not None and other_value is not None:
+            return my_value < other_value
+        return super().__lt__(other)
 
 class RamTab(QWidget):
     def __init__(self):
@@ -29,23 +191,60 @@ class RamTab(QWidget):
         self.layout.addWidget(self.ram_label)
 
         self.ram_progress = QProgressBar()
+        self.ram_progress.setObjectName("ramBar")
+        self.ram_progress.setProperty("level", "normal")
         self.ram_progress.setAlignment(Qt.AlignCenter)
         self.ram_progress.setFixedHeight(25)
         self.layout.addWidget(self.ram_progress)
 
+        # Memory Pressure Panel
+        self.pressure_monitor = MemoryPressureMonitor()
+        self.layout.addWidget(self.build_pressure_panel())
+
         # Process Table
         self.layout.addSpacing(10)
+        proc_header = QHBoxLayout()
         lbl_proc = QLabel("Top Processes by Memory:")
         lbl_proc.setObjectName("subHeaderLabel")
-        self.layout.addWidget(lbl_proc)
+        proc_header.addWidget(lbl_proc)
+        proc_header.addStretch()
+
+        self.view_combo = QComboBox()
+        for label, _ in VIEW_MODES:
+            self.view_combo.addItem(label)
+        self.view_combo.currentIndexChanged.connect(self.on_view_changed)
+        proc_header.addWidget(self.view_combo)
+        self.layout.addLayout(proc_header)
+
+        # Process tree is kept across samples and updated incrementally
+        self.process_tree = ProcessTree()
+        # Samples come from the collector daemon when one is running
+        self.collector = CollectorConnection()
+        self.grouping = None
+        self.worker = None
+        self.resample_pending = False
+        self.signal_workers = []
+        self.exited_pids = {} # pid -> time the exit was seen, hidden until the next sample
+        self.recorded = None # (ram, processes, pressure) of a replayed recording, see show_recorded()
         
         self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["PID", "Name", "Memory %", "Memory (MB)"])
+        self.table.setColumnCount(len(PROCESS_COLUMNS))
+        self.table.setHorizontalHeaderLabels([col[0] for col in PROCESS_COLUMNS])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
         self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.ExtendedSelection)
+
+        # Sorting is done by the worker (top-N by the selected column), not by the table
+        self.sort_col = 4 # Memory (MB)
+        self.sort_descending = True
+        header = self.table.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(self.sort_col, Qt.DescendingOrder)
+        header.sectionClicked.connect(self.on_header_clicked)
         
         # Context Menu Setup
         self.table.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -53,17 +252,85 @@ class RamTab(QWidget):
         
         self.layout.addWidget(self.table)
 
-        # Timer for auto-refresh
-        self.timer = QTimer()
+        # Tree view for the process tree and application / service groups
+        self.tree_view = QTreeWidget()
+        self.tree_view.setColumnCount(5)
+        self.tree_view.setHeaderLabels(["Name", "PID", "Processes", "RSS (MB)", "PSS (MB)"])
+        self.tree_view.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree_view.setAlternatingRowColors(True)
+        self.tree_view.setSelectionMode(QTreeWidget.ExtendedSelection)
+        self.tree_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.tree_view.customContextMenuRequested.connect(self.show_context_menu)
+        self.tree_view.setSortingEnabled(True)
+        self.tree_view.sortByColumn(4, Qt.DescendingOrder)
+        self.tree_items = {} # row key -> QTreeWidgetItem
+        self.tree_parents = {} # row key -> parent row key (None for top level)
+        self.layout.addWidget(self.tree_view)
+        self.tree_view.hide()
+
+        # Result of the last signal delivery
+        self.status_label = QLabel()
+        self.status_label.setObjectName("subHeaderLabel")
+        self.layout.addWidget(self.status_label)
+        self.status_label.hide()
+
+        # Timer for auto-refresh, running only while the tab is visible
+        self.timer = QTimer(self)
+        self.timer.setInterval(3000) # 3 seconds
         self.timer.timeout.connect(self.refresh_data)
-        self.timer.start(3000) # 3 seconds
 
-        # Initial load
-        self.refresh_data()
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.recorded is None and not self.timer.isActive():
+            self.timer.start()
+            self.refresh_data()
+
+    def hideEvent(self, event):
+        # Another tab is open: stop sampling until we are back
+        super().hideEvent(event)
+        if not event.spontaneous():
+            self.timer.stop()
 
     def refresh_data(self):
+        # A recording is shown: sort order changes re-render its sample
+        if self.recorded is not None:
+            self.show_recorded(*self.recorded)
+            return
+
         # Update RAM usage (fast, main thread is fine)
-        ram = get_ram_usage()
+        self.update_ram(get_ram_usage())
+
+        # Update Process List (slow, use thread)
+        # The tree is shared with the worker, so wait for the running sample to finish
+        if self.worker is not None and self.worker.isRunning():
+            self.resample_pending = True
+            return
+        self.resample_pending = False
+        self.worker = ProcessWorker(
+            self.process_tree, self.grouping,
+            PROCESS_COLUMNS[self.sort_col][1], self.sort_descending,
+            self.pressure_monitor, self.collector.client()
+        )
+        self.worker.finished.connect(self.on_processes_loaded)
+        self.worker.pressure_sampled.connect(self.update_pressure)
+        self.worker.start()
+
+    def show_recorded(self, ram, processes, pressure):
+        """
+        Shows one sample of a recording (see recording.Replayer) instead of live data.
+        Live sampling stops for good; only the flat process view has recorded data.
+        """
+        self.recorded = (ram, processes, pressure)
+        self.timer.stop()
+        if self.grouping is not None:
+            self.view_combo.setCurrentIndex(0)
+        self.view_combo.setEnabled(False)
+        self.update_ram(ram)
+        self.update_pressure(pressure)
+        select = heapq.nlargest if self.sort_descending else heapq.nsmallest
+        self.update_table(select(50, processes, key=itemgetter(PROCESS_COLUMNS[self.sort_col][1])))
+
+    def update_ram(self, ram):
         total_gb = ram['total'] / (1024**3)
         used_gb = ram['used'] / (1024**3)
         self.ram_label.setText(f"RAM: {used_gb:.2f} GB / {total_gb:.2f} GB ({ram['percent']}%)")
@@ -71,17 +338,215 @@ class RamTab(QWidget):
         
         # Color coding for RAM
         if ram['percent'] > 90:
-            self.ram_progress.setStyleSheet("QProgressBar::chunk { background-color: #d9534f; }")
+            set_style_state(self.ram_progress, "level", "critical")
         elif ram['percent'] > 70:
-            self.ram_progress.setStyleSheet("QProgressBar::chunk { background-color: #f0ad4e; }")
+            set_style_state(self.ram_progress, "level", "warning")
         else:
-            self.ram_progress.setStyleSheet("QProgressBar::chunk { background-color: #5cb85c; }")
+            set_style_state(self.ram_progress, "level", "normal")
 
-        # Update Process List (slow, use thread)
-        self.worker = ProcessWorker()
-        self.worker.finished.connect(self.update_table)
-        self.worker.start()
+    def build_pressure_panel(self):
+        frame = QFrame()
+        frame.setObjectName("summaryFrame")
+        grid = QGridLayout(frame)
+        grid.setContentsMargins(0, 0, 0, 0)
+        grid.setHorizontalSpacing(20)
+
+        self.pressure_status = QLabel("Memory pressure: ...")
+        self.pressure_status.setObjectName("subHeaderLabel")
+        grid.addWidget(self.pressure_status, 0, 0, 1, 4)
+
+        # Static values: (key, caption)
+        self.pressure_values = {}
+        for col, (key, caption) in enumerate([
+            ("available", "Available"),
+            ("cache", "Page Cache"),
+            ("dirty", "Dirty / Writeback"),
+            ("swap", "Swap Used"),
+        ]):
+            label = QLabel(f"{caption}: ...")
+            grid.addWidget(label, 1, col)
+            self.pressure_values[key] = (label, caption)
+
+        # Values with a rolling history: (key, caption, color, fixed maximum)
+        self.pressure_sparks = {}
+        for col, (key, caption, color, maximum) in enumerate([
+            ("psi_some", "PSI some (avg10)", "#ffc107", 100.0),
+            ("psi_full", "PSI full (avg10)", "#dc3545", 100.0),
+            ("pgmajfault", "Major faults/s", "#6c757d", None),
+            ("pswpin", "Swap in/s", "#0d6efd", None),
+        ]):
+            label = QLabel(f"{caption}: ...")
+            grid.addWidget(label, 2, col)
+            spark = Sparkline(color, maximum)
+            grid.addWidget(spark, 3, col)
+            self.pressure_sparks[key] = (label, caption, spark)
+
+        self.zram_label = QLabel()
+        grid.addWidget(self.zram_label, 4, 0, 1, 4)
+        self.zram_label.hide()
+        return frame
+
+    def update_pressure(self, snapshot):
+        meminfo = snapshot["meminfo"]
+        gb = 1024**3
+        self.pressure_status.setText(snapshot["status"])
+
+        texts = {
+            "available": f"{meminfo.get('MemAvailable', 0) / gb:.2f} GB",
+            "cache": f"{snapshot['cache'] / gb:.2f} GB",
+            "dirty": f"{meminfo.get('Dirty', 0) / 1024**2:.0f} / {meminfo.get('Writeback', 0) / 1024**2:.0f} MB",
+            "swap": f"{(meminfo.get('SwapTotal', 0) - meminfo.get('SwapFree', 0)) / gb:.2f} GB",
+        }
+        for key, (label, caption) in self.pressure_values.items():
+            label.setText(f"{caption}: {texts[key]}")
+
+        history = snapshot["history"]
+        for key, (label, caption, spark) in self.pressure_sparks.items():
+            values = history[key]
+            current = values[-1] if values else 0.0
+            if key.startswith("psi"):
+                label.setText(f"{caption}: {current:.2f}%")
+            else:
+                label.setText(f"{caption}: {current:.0f}")
+            spark.set_values(values)
 
+        # zram: compression ratio and the RAM it actually uses
+        zram = snapshot["zram"]
+        if zram:
+            parts = []
+            for dev in zram:
+                ratio = f"{dev['orig_data_size'] / dev['compr_data_size']:.1f}x" if dev["compr_data_size"] else "-"
+                parts.append(
+                    f"{dev['device']}: {dev['orig_data_size'] / 1024**2:.0f} MB stored in "
+                    f"{dev['mem_used_total'] / 1024**2:.0f} MB (ratio {ratio})"
+                )
+            self.zram_label.setText("zram  " + "   ".join(parts))
+            self.zram_label.show()
+        else:
+            self.zram_label.hide()
+
+    def on_header_clicked(self, logicalIndex):
+        if logicalIndex == self.sort_col:
+            # Toggle
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_col = logicalIndex
+            self.sort_descending = PROCESS_COLUMNS[logicalIndex][2]
+
+        order = Qt.DescendingOrder if self.sort_descending else Qt.AscendingOrder
+        self.table.horizontalHeader().setSortIndicator(self.sort_col, order)
+        self.refresh_data()
+
+    def on_view_changed(self, index):
+        self.grouping = VIEW_MODES[index][1]
+        self.table.setVisible(self.grouping is None)
+        self.tree_view.setVisible(self.grouping is not None)
+        self.tree_view.clear()
+        self.tree_items = {}
+        self.tree_parents = {}
+        self.refresh_data()
+
+    def on_processes_loaded(self, processes, rows, started_at):
+        if self.recorded is not None:
+            return # sampled before the replay started
+        # Keep processes that exited hidden if the sample was taken before they did
+        if self.exited_pids:
+            processes = [p for p in processes if p['pid'] not in self.exited_pids]
+            rows = [r for r in rows if r[0] not in self.exited_pids]
+            self.exited_pids = {pid: t for pid, t in self.exited_pids.items() if t >= started_at}
+
+        # The view may have changed while the worker was running
+        if self.grouping is None:
+            self.update_table(processes)
+        elif rows:
+            self.update_tree(rows)
+
+        # View or sort order changed while the worker was busy
+        if self.resample_pending:
+            self.refresh_data()
+
+    @traced("ram.update_tree")
+    def update_tree(self, rows):
+        self.tree_view.setUpdatesEnabled(False)
+        self.tree_view.setSortingEnabled(False)
+
+        seen = set()
+        for key, parent_key, name, pid, count, rss, pss in rows:
+            seen.add(key)
+            parent_item = self.tree_items.get(parent_key) if parent_key is not None else None
+            # A parent filtered out (exited) leaves the row at the top level, recorded as such
+            if parent_item is None:
+                parent_key = None
+            item = self.tree_items.get(key)
+
+            if item is None:
+                item = NumericTreeWidgetItem()
+                for col in (1, 2, 3, 4):
+                    item.setTextAlignment(col, Qt.AlignCenter)
+                if parent_item is not None:
+                    parent_item.addChild(item)
+                else:
+                    self.tree_view.addTopLevelItem(item)
+                self.tree_items[key] = item
+                self.tree_parents[key] = parent_key
+            elif self.tree_parents[key] != parent_key:
+                # Process was reparented (e.g. its parent exited)
+                self._detach_tree_item(key)
+                if parent_item is not None:
+                    parent_item.addChild(item)
+                else:
+                    self.tree_view.addTopLevelItem(item)
+                self.tree_parents[key] = parent_key
+
+            item.setText(0, name)
+            item.setText(1, str(pid) if pid is not None else "")
+            item.setData(1, Qt.UserRole, pid if pid is not None else 0)
+            item.setText(2, str(count))
+            item.setData(2, Qt.UserRole, count)
+            item.setText(3, f"{rss / (1024**2):.1f}")
+            item.setData(3, Qt.UserRole, rss)
+            item.setText(4, f"{pss / (1024**2):.1f}")
+            item.setData(4, Qt.UserRole, pss)
+
+        # Drop rows for processes / groups that disappeared.
+        # Children of a removed row go away together with their parent.
+        removed = self.tree_items.keys() - seen
+        for key in removed:
+            if self.tree_parents[key] not in removed:
+                self._detach_tree_item(key)
+        for key in removed:
+            del self.tree_items[key]
+            del self.tree_parents[key]
+
+        self.tree_view.setSortingEnabled(True)
+        self.tree_view.setUpdatesEnabled(True)
+
+    def _remove_tree_key(self, key):
+        """Removes a row and forgets all rows below it."""
+        removed = {key}
+        changed = True
+        while changed:
+            changed = False
+            for child_key, parent_key in self.tree_parents.items():
+                if parent_key in removed and child_key not in removed:
+                    removed.add(child_key)
+                    changed = True
+        self._detach_tree_item(key)
+        for removed_key in removed:
+            del self.tree_items[removed_key]
+            del self.tree_parents[removed_key]
+
+    def _detach_tree_item(self, key):
+        item = self.tree_items[key]
+        parent_item = self.tree_items.get(self.tree_parents[key])
+        if parent_item is not None:
+            parent_item.removeChild(item)
+        else:
+            index = self.tree_view.indexOfTopLevelItem(item)
+            if index >= 0:
+                self.tree_view.takeTopLevelItem(index)
+
+    @traced("ram.update_table")
     def update_table(self, processes):
         # Save current scroll position
         current_scroll = self.table.verticalScrollBar().value()
@@ -107,22 +572,24 @@ class RamTab(QWidget):
             if row_idx >= current_count:
                 self.table.insertRow(row_idx)
                 # Create items if new row
-                self.table.setItem(row_idx, 0, QTableWidgetItem())
-                self.table.setItem(row_idx, 1, QTableWidgetItem())
-                self.table.setItem(row_idx, 2, QTableWidgetItem())
-                self.table.setItem(row_idx, 3, QTableWidgetItem())
-                
-                # Alignments for numeric columns
-                self.table.item(row_idx, 2).setTextAlignment(Qt.AlignCenter)
-                self.table.item(row_idx, 3).setTextAlignment(Qt.AlignCenter)
+                for col in range(len(PROCESS_COLUMNS)):
+                    item = QTableWidgetItem()
+                    # Alignments for numeric columns
+                    if col >= 2:
+                        item.setTextAlignment(Qt.AlignCenter)
+                    self.table.setItem(row_idx, col, item)
 
             # Update Data
             self.table.item(row_idx, 0).setText(str(proc['pid']))
             self.table.item(row_idx, 1).setText(proc['name'])
-            self.table.item(row_idx, 2).setText(f"{proc['memory_percent']:.2f}%")
+            self.table.item(row_idx, 2).setText(f"{proc['cpu_percent']:.1f}%")
+            self.table.item(row_idx, 3).setText(f"{proc['memory_percent']:.2f}%")
             
             mem_mb = proc['memory_rss'] / (1024**2)
-            self.table.item(row_idx, 3).setText(f"{mem_mb:.2f} MB")
+            self.table.item(row_idx, 4).setText(f"{mem_mb:.2f} MB")
+            self.table.item(row_idx, 5).setText(f"{proc['swap'] / (1024**2):.2f} MB")
+            self.table.item(row_idx, 6).setText(format_rate(proc['read_rate']))
+            self.table.item(row_idx, 7).setText(format_rate(proc['write_rate']))
             
             # Restore selection
             if str(proc['pid']) in selected_pids:
@@ -139,48 +606,128 @@ class RamTab(QWidget):
         if self.table.rowCount() > 0:
              self.table.verticalScrollBar().setValue(current_scroll)
 
+    def selected_processes(self):
+        """
+        Returns [(pid, name)] for the selected rows of the visible view.
+        Selecting an application / service group selects all of its processes.
+        """
+        targets = {}
+        if self.grouping is None:
+            for index in self.table.selectionModel().selectedRows():
+                pid_item = self.table.item(index.row(), 0)
+                name_item = self.table.item(index.row(), 1)
+                if pid_item and name_item and pid_item.text():
+                    targets[int(pid_item.text())] = name_item.text()
+        else:
+            for item in self.tree_view.selectedItems():
+                pid = item.data(1, Qt.UserRole)
+                if pid:
+                    targets[pid] = item.text(0)
+                else:
+                    for i in range(item.childCount()):
+                        child = item.child(i)
+                        if child.data(1, Qt.UserRole):
+                            targets[child.data(1, Qt.UserRole)] = child.text(0)
+        return list(targets.items())
+
     def show_context_menu(self, pos: QPoint):
-        item = self.table.itemAt(pos)
-        if item is None:
+        view = self.table if self.grouping is None else self.tree_view
+        # Recorded pids may belong to other processes by now
+        if self.recorded is not None or view.itemAt(pos) is None:
             return
-            
-        row = item.row()
-        pid_item = self.table.item(row, 0)
-        name_item = self.table.item(row, 1)
-        
-        if not pid_item or not name_item:
+
+        targets = self.selected_processes()
+        if not targets:
             return
-            
-        pid = pid_item.text()
-        name = name_item.text()
-        
-        menu = QMenu(self.table)
-        kill_action = QAction(f"Kill Process {pid} ({name})", self)
-        kill_action.triggered.connect(lambda: self.kill_process(pid, name))
+
+        if len(targets) == 1:
+            pid, name = targets[0]
+            label = f"Process {pid} ({name})"
+        else:
+            label = f"{len(targets)} Processes"
+
+        menu = QMenu(view)
+
+        term_action = QAction(f"Terminate {label}", self)
+        term_action.triggered.connect(lambda: self.kill_processes(targets, signal.SIGTERM))
+        menu.addAction(term_action)
+
+        kill_action = QAction(f"Kill {label}", self)
+        kill_action.triggered.connect(lambda: self.kill_processes(targets, signal.SIGKILL))
         menu.addAction(kill_action)
-        
-        menu.exec(self.table.viewport().mapToGlobal(pos))
 
-    def kill_process(self, pid_str, name):
-        try:
-            pid = int(pid_str)
-            
+        tree_action = QAction("Kill Process Tree", self)
+        tree_action.triggered.connect(lambda: self.kill_processes(targets, signal.SIGTERM, include_tree=True))
+        menu.addAction(tree_action)
+
+        # Other signals are sent without waiting for the process to exit
+        signal_menu = menu.addMenu("Send Signal")
+        for sig in OTHER_SIGNALS:
+            action = QAction(sig.name, self)
+            action.triggered.connect(lambda checked=False, sig=sig: self.kill_processes(targets, sig))
+            signal_menu.addAction(action)
+
+        menu.exec(view.viewport().mapToGlobal(pos))
+
+    def kill_processes(self, targets, sig, include_tree=False):
+        pids = [pid for pid, _ in targets]
+
+        if sig in (signal.SIGTERM, signal.SIGKILL):
+            if len(targets) == 1:
+                pid, name = targets[0]
+                what = f"process '{name}' (PID: {pid})"
+            else:
+                what = f"{len(targets)} processes"
+            if include_tree:
+                what += " and all of its child processes"
+            detail = ""
+            if sig == signal.SIGTERM:
+                detail = f"\nProcesses still running after {ESCALATE_AFTER:.0f} seconds will be killed."
+
             reply = QMessageBox.question(
-                self, "Confirm Kill", 
-                f"Are you sure you want to kill process '{name}' (PID: {pid})?\nUnsaved data may be lost.",
+                self, "Confirm Kill",
+                f"Are you sure you want to kill {what}?\nUnsaved data may be lost.{detail}",
                 QMessageBox.Yes | QMessageBox.No
             )
-            
-            if reply == QMessageBox.Yes:
-                os.kill(pid, signal.SIGKILL)
-                QMessageBox.information(self, "Success", f"Process {pid} killed.")
-                self.refresh_data() # Refresh immediately
-                
-        except ValueError:
-            QMessageBox.warning(self, "Error", "Invalid PID.")
-        except ProcessLookupError:
-            QMessageBox.warning(self, "Error", "Process not found (already terminated?).")
-        except PermissionError:
-            QMessageBox.warning(self, "Error", "Permission denied. You may need root privileges to kill this process.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to kill process: {e}")
+            if reply != QMessageBox.Yes:
+                return
+
+        # Delivery and exit tracking run in the background, rows are removed as processes exit
+        worker = SignalWorker(pids, sig, ESCALATE_AFTER if sig == signal.SIGTERM else None, include_tree)
+        worker.process_exited.connect(self.on_process_exited)
+        worker.finished.connect(lambda results, worker=worker: self.on_signals_delivered(worker, results))
+        self.signal_workers.append(worker)
+        self.status_label.setText(f"Sending {sig.name} to {len(pids)} process(es)...")
+        self.status_label.show()
+        worker.start()
+
+    def on_process_exited(self, pid, result):
+        # Optimistic update: drop the row now instead of waiting for the next sample
+        self.exited_pids[pid] = time.monotonic()
+
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, 0)
+            if item and item.text() == str(pid):
+                self.table.removeRow(row)
+                break
+
+        if pid in self.tree_items:
+            self._remove_tree_key(pid)
+
+    def on_signals_delivered(self, worker, results):
+        self.signal_workers.remove(worker)
+
+        exited = sum(1 for r in results.values() if r in (EXITED, KILLED))
+        sent = sum(1 for r in results.values() if r == SENT)
+        failed = [(pid, r) for pid, r in results.items() if r in (DENIED, ALIVE)]
+        if worker.sig in NO_WAIT_SIGNALS:
+            self.status_label.setText(f"Sent {worker.sig.name} to {sent} process(es).")
+        else:
+            self.status_label.setText(f"{exited} process(es) exited.")
+
+        if failed:
+            lines = "\n".join(f"PID {pid}: {r}" for pid, r in failed[:10])
+            if any(r == DENIED for _, r in failed):
+                lines += "\n\nYou may need root privileges to signal these processes."
+            action = "signalled" if worker.sig in NO_WAIT_SIGNALS else "stopped"
+            QMessageBox.warning(self, "Error", f"Some processes could not be {action}:\n{lines}")
@@ -0,0 +1,293 @@
+import os
+import time
+import zlib
+import struct
+import bisect
+from collections import OrderedDict
+from system_toolbox import wire
+
+MAGIC = b"VBOXREC1"
+# Samples per compressed chunk (one minute at the default interval)
+CHUNK_SAMPLES = 30
+RECORD_INTERVAL = 2.0
+# Samples of history given to the pressure panel on replay
+PRESSURE_HISTORY = 120
+# Decoded chunks kept by Replayer; enough for the pressure history
+CACHED_CHUNKS = 8
+
+# Chunk header: payload length, samples, time of the first and last sample
+_CHUNK_HEADER = struct.Struct(">IIdd")
+
+# Columns of each table: "int" is stored as deltas from the previous row, "fixed" as
+# deltas of hundredths, "str" as an index into the chunk's string table, "raw" as is.
+COLUMNS = {
+    "memory": [
+        ("total", "int"), ("used", "int"), ("available", "int"), ("percent", "fixed"),
+        ("cache", "int"), ("dirty", "int"), ("writeback", "int"), ("swap_total", "int"), ("swap_free", "int"),
+        ("psi_some", "fixed"), ("psi_full", "fixed"), ("pgmajfault", "fixed"), ("pswpin", "fixed"),
+        ("status", "str"),
+    ],
+    "processes": [
+        ("pid", "int"), ("name", "str"), ("memory_rss", "int"), ("memory_percent", "fixed"),
+        ("cpu_percent", "fixed"), ("swap", "int"), ("read_rate", "int"), ("write_rate", "int"),
+    ],
+    "disks": [
+        ("device", "str"), ("mountpoint", "str"), ("fstype", "str"), ("opts", "str"), ("state", "str"),
+        ("total", "int"), ("used", "int"), ("free", "int"), ("percent", "fixed"), ("reserved", "int"),
+        ("inodes_total", "int"), ("inodes_used", "int"), ("inodes_percent", "fixed"),
+        ("readonly", "raw"), ("error", "str"),
+    ],
+}
+
+class RecordingError(Exception):
+    pass
+
+def memory_sample(ram, pressure):
+    """The memory row of a sample, from get_ram_usage() and MemoryPressureMonitor.snapshot()."""
+    meminfo = pressure["meminfo"]
+    psi = pressure["psi"]
+    return {
+        "total": ram["total"], "used": ram["used"], "available": ram["available"], "percent": ram["percent"],
+        "cache": pressure["cache"],
+        "dirty": meminfo.get("Dirty", 0), "writeback": meminfo.get("Writeback", 0),
+        "swap_total": meminfo.get("SwapTotal", 0), "swap_free": meminfo.get("SwapFree", 0),
+        "psi_some": psi.get("some", {}).get("avg10", 0.0), "psi_full": psi.get("full", {}).get("avg10", 0.0),
+        "pgmajfault": pressure["rates"].get("pgmajfault", 0.0), "pswpin": pressure["rates"].get("pswpin", 0.0),
+        "status": pressure["status"],
+    }
+
+def encode_column(values, kind, strings):
+    if kind == "raw":
+        return values
+    if kind == "str":
+        return [None if value is None else strings.setdefault(value, len(strings)) for value in values]
+    scale = 100 if kind == "fixed" else 1
+    result = []
+    previous = 0
+    for value in values:
+        if value is None:
+            result.append(None) # missing values (unresponsive mounts) keep the running value
+            continue
+        value = int(round(value * scale))
+        result.append(value - previous)
+        previous = value
+    return result
+
+def decode_column(values, kind, strings):
+    if kind == "raw":
+        return values
+    if kind == "str":
+        return [None if value is None else strings[value] for value in values]
+    result = []
+    previous = 0
+    for value in values:
+        if value is None:
+            result.append(None)
+            continue
+        previous += value
+        result.append(previous / 100.0 if kind == "fixed" else previous)
+    return result
+
+def encode_chunk(samples):
+    """Columnar, delta encoded form of a list of samples, zlib compressed."""
+    strings = {}
+    times = encode_column([sample["time"] * 1000 for sample in samples], "int", strings)
+    chunk = {"times": times, "memory": {}, "processes": {}, "disks": {}}
+    for name in ("memory", "processes", "disks"):
+        if name == "memory":
+            rows = [sample["memory"] for sample in samples]
+        else:
+            # Rows sorted by key, so pids / sizes change little from one row to the next
+            per_sample = [sorted(sample[name], key=lambda row: row["pid" if name == "processes" else "mountpoint"])
+                          for sample in samples]
+            chunk[name]["rows"] = [len(rows) for rows in per_sample]
+            rows = [row for rows in per_sample for row in rows]
+        for column, kind in COLUMNS[name]:
+            chunk[name][column] = encode_column([row.get(column) for row in rows], kind, strings)
+    chunk["strings"] = list(strings)
+    return zlib.compress(wire.encode(chunk), 6)
+
+def decode_chunk(data):
+    """Inverse of encode_chunk(): the list of samples."""
+    chunk = wire.decode(zlib.decompress(data))
+    strings = chunk["strings"]
+    times = [value / 1000.0 for value in decode_column(chunk["times"], "int", strings)]
+    tables = {}
+    for name in ("memory", "processes", "disks"):
+        columns = [(column, decode_column(chunk[name][column], kind, strings)) for column, kind in COLUMNS[name]]
+        count = len(columns[0][1])
+        tables[name] = [{column: values[i] for column, values in columns} for i in range(count)]
+    samples = []
+    offsets = {"processes": 0, "disks": 0}
+    for i, timestamp in enumerate(times):
+        sample = {"time": timestamp, "memory": tables["memory"][i]}
+        for name in ("processes", "disks"):
+            count = chunk[name]["rows"][i]
+            sample[name] = tables[name][offsets[name]:offsets[name] + count]
+            offsets[name] += count
+        samples.append(sample)
+    return samples
+
+def scan_chunks(f):
+    """
+    Yields (offset, payload length, samples, first time, last time) of each complete chunk,
+    reading only the chunk headers. Stops at a chunk cut short by a crash.
+    """
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise RecordingError("Not a VBox recording")
+    size = os.fstat(f.fileno()).st_size
+    offset = len(MAGIC)
+    while True:
+        header = f.read(_CHUNK_HEADER.size)
+        if len(header) < _CHUNK_HEADER.size:
+            return
+        length, count, first, last = _CHUNK_HEADER.unpack(header)
+        end = offset + _CHUNK_HEADER.size + length
+        if end > size:
+            return
+        yield offset, length, count, first, last
+        offset = end
+        f.seek(offset)
+
+class Recorder:
+    """
+    Appends samples to a recording: the magic bytes, then chunks of CHUNK_SAMPLES samples,
+    each a header (length, samples, first and last time) and the encode_chunk() payload.
+    Chunks are only ever appended; a chunk cut short by a crash is dropped the next
+    time the file is opened.
+    """
+    def __init__(self, path, chunk_samples=CHUNK_SAMPLES):
+        self.path = path
+        self.chunk_samples = chunk_samples
+        self.pending = []
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.file = open(path, "r+b")
+            end = len(MAGIC)
+            for offset, length, _, _, _ in scan_chunks(self.file):
+                end = offset + _CHUNK_HEADER.size + length
+            self.file.truncate(end)
+            self.file.seek(end)
+        else:
+            self.file = open(path, "wb")
+            self.file.write(MAGIC)
+
+    def add(self, memory, processes, disks, timestamp=None):
+        self.pending.append({
+            "time": time.time() if timestamp is None else timestamp,
+            "memory": memory, "processes": processes, "disks": disks,
+        })
+        if len(self.pending) >= self.chunk_samples:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        payload = encode_chunk(self.pending)
+        header = _CHUNK_HEADER.pack(len(payload), len(self.pending), self.pending[0]["time"], self.pending[-1]["time"])
+        self.file.write(header + payload)
+        self.file.flush()
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+class Replayer:
+    """
+    Random access to the samples of a recording. Opening it reads only the chunk headers;
+    chunks are decoded when a sample in them is asked for, and the last few are cached.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.chunks = [] # (offset, length, first sample index)
+        self.first_times = []
+        self.count = 0
+        self.start = self.end = None
+        self.cache = OrderedDict() # chunk number -> samples
+        with open(path, "rb") as f:
+            for offset, length, count, first, last in scan_chunks(f):
+                self.chunks.append((offset, length, self.count))
+                self.first_times.append(first)
+                self.count += count
+                if self.start is None:
+                    self.start = first
+                self.end = last
+        if not self.count:
+            raise RecordingError("The recording has no samples")
+        self.starts = [start for _, _, start in self.chunks]
+
+    def __len__(self):
+        return self.count
+
+    def _chunk(self, number):
+        samples = self.cache.get(number)
+        if samples is None:
+            offset, length, _ = self.chunks[number]
+            with open(self.path, "rb") as f:
+                f.seek(offset + _CHUNK_HEADER.size)
+                samples = self.cache[number] = decode_chunk(f.read(length))
+            if len(self.cache) > CACHED_CHUNKS:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(number)
+        return samples
+
+    def sample(self, index):
+        number = bisect.bisect_right(self.starts, index) - 1
+        return self._chunk(number)[index - self.starts[number]]
+
+    def index_at(self, timestamp):
+        """Index of the last sample taken at or before `timestamp`."""
+        number = max(bisect.bisect_right(self.first_times, timestamp) - 1, 0)
+        times = [sample["time"] for sample in self._chunk(number)]
+        return self.starts[number] + max(bisect.bisect_right(times, timestamp) - 1, 0)
+
+    def pressure_snapshot(self, index):
+        """A MemoryPressureMonitor.snapshot() lookalike for the pressure panel."""
+        memory = self.sample(index)["memory"]
+        history = {"psi_some": [], "psi_full": [], "pgmajfault": [], "pswpin": []}
+        for i in range(max(index - PRESSURE_HISTORY + 1, 0), index + 1):
+            past = self.sample(i)["memory"]
+            for key, values in history.items():
+                values.append(past[key])
+        return {
+            "status": memory["status"],
+            "meminfo": {
+                "MemAvailable": memory["available"], "Dirty": memory["dirty"], "Writeback": memory["writeback"],
+                "SwapTotal": memory["swap_total"], "SwapFree": memory["swap_free"],
+            },
+            "cache": memory["cache"],
+            "zram": [],
+            "history": history,
+        }
+
+def record(path, interval=RECORD_INTERVAL, duration=None, on_sample=None):
+    """Samples memory, processes and disks every `interval` seconds into `path` until interrupted."""
+    from system_toolbox.system_info import get_ram_usage
+    from system_toolbox.process_tree import ProcessTree
+    from system_toolbox.memory_pressure import MemoryPressureMonitor
+    from system_toolbox.mounts import DiskUsageSampler
+
+    tree = ProcessTree()
+    monitor = MemoryPressureMonitor()
+    sampler = DiskUsageSampler()
+    recorder = Recorder(path)
+    started = time.monotonic()
+    next_sample = started
+    count = 0
+    try:
+        while duration is None or time.monotonic() - started < duration:
+            tree.update()
+            monitor.sample()
+            recorder.add(memory_sample(get_ram_usage(), monitor.snapshot()), tree.process_rows(), sampler.sample())
+            count += 1
+            if on_sample is not None:
+                on_sample(count)
+            next_sample += interval
+            time.sleep(max(next_sample - time.monotonic(), 0))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.close()
+    return count
@@ -0,0 +1,129 @@
+import sys
+import time
+from PySide6.QtWidgets import (
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QPushButton,
+    QComboBox, QSlider, QLabel, QApplication
+)
+from PySide6.QtCore import Qt, QTimer
+from system_toolbox.ram_tab import RamTab
+from system_toolbox.disk_tab import DiskTab
+
+# Playback speeds offered: (label, recorded seconds per second)
+SPEEDS = [("0.5x", 0.5), ("1x", 1.0), ("2x", 2.0), ("5x", 5.0), ("10x", 10.0), ("30x", 30.0), ("60x", 60.0), ("300x", 300.0)]
+TICK_MS = 100
+# Pauses in the recording longer than this (recorder stopped) are skipped
+GAP_SKIP = 60.0
+
+def format_time(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+class ReplayWindow(QMainWindow):
+    """
+    Plays a recording (see recording.py) through the RAM and Disk tabs,
+    at any speed; the slider scrubs through it.
+    """
+    def __init__(self, replayer, speed=1.0):
+        super().__init__()
+        self.replayer = replayer
+        self.setWindowTitle(f"VBox - Replay of {replayer.path}")
+        self.resize(1100, 750)
+
+        central = QWidget()
+        self.setCentralWidget(central)
+        layout = QVBoxLayout(central)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(10)
+
+        self.tabs = QTabWidget()
+        self.tab_ram = RamTab()
+        self.tab_disk = DiskTab()
+        self.tabs.addTab(self.tab_ram, "RAM Processes")
+        self.tabs.addTab(self.tab_disk, "Disk Usage")
+        layout.addWidget(self.tabs)
+
+        # Playback controls
+        controls = QHBoxLayout()
+        self.btn_play = QPushButton("Play")
+        self.btn_play.setObjectName("primaryBtn")
+        self.btn_play.setCursor(Qt.PointingHandCursor)
+        self.btn_play.clicked.connect(self.toggle_playback)
+        controls.addWidget(self.btn_play)
+
+        self.speed_combo = QComboBox()
+        for label, _ in SPEEDS:
+            self.speed_combo.addItem(label)
+        self.speed_combo.setCurrentIndex(min(range(len(SPEEDS)), key=lambda i: abs(SPEEDS[i][1] - speed)))
+        controls.addWidget(self.speed_combo)
+
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, len(replayer) - 1)
+        self.slider.valueChanged.connect(self.on_slider_moved)
+        controls.addWidget(self.slider, 1)
+
+        self.time_label = QLabel()
+        self.time_label.setObjectName("subHeaderLabel")
+        controls.addWidget(self.time_label)
+        layout.addLayout(controls)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(TICK_MS)
+        self.timer.timeout.connect(self.advance)
+
+        # Playback position in recorded time
+        self.position = replayer.start
+        self.index = None
+        self.show_index(0)
+
+    def toggle_playback(self):
+        if self.timer.isActive():
+            self.timer.stop()
+            self.btn_play.setText("Play")
+            return
+        if self.index == len(self.replayer) - 1:
+            self.show_index(0) # at the end: start over
+        self.timer.start()
+        self.btn_play.setText("Pause")
+
+    def advance(self):
+        self.position += TICK_MS / 1000.0 * SPEEDS[self.speed_combo.currentIndex()][1]
+        if self.position >= self.replayer.end:
+            self.show_index(len(self.replayer) - 1)
+            self.toggle_playback()
+            return
+        index = self.replayer.index_at(self.position)
+        if index + 1 < len(self.replayer):
+            following = self.replayer.sample(index + 1)["time"]
+            if following - self.position > GAP_SKIP:
+                self.position = following
+                index += 1
+        if index != self.index:
+            self.show_index(index, follow=False)
+
+    def on_slider_moved(self, value):
+        if value != self.index:
+            self.show_index(value)
+
+    def show_index(self, index, follow=True):
+        """Shows a sample; `follow` moves the playback position to it."""
+        self.index = index
+        sample = self.replayer.sample(index)
+        if follow:
+            self.position = sample["time"]
+        self.tab_ram.show_recorded(sample["memory"], sample["processes"], self.replayer.pressure_snapshot(index))
+        self.tab_disk.show_recorded(sample["disks"])
+        self.slider.blockSignals(True)
+        self.slider.setValue(index)
+        self.slider.blockSignals(False)
+        self.time_label.setText(f"{format_time(sample['time'])}  ({index + 1} / {len(self.replayer)})")
+
+def main(path, speed=1.0):
+    from system_toolbox.styles import get_stylesheet
+    from system_toolbox.recording import Replayer
+
+    replayer = Replayer(path)
+    app = QApplication(sys.argv[:1])
+    app.setStyle("Fusion")
+    app.setStyleSheet(get_stylesheet())
+    window = ReplayWindow(replayer, speed)
+    window.show()
+    return app.exec()
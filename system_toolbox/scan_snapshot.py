@@ -0,0 +1,229 @@
+import os
+import re
+import mmap
+import struct
+import time
+from array import array
+from system_toolbox.dir_scanner import DirTree, NO_NODE
+
+# File layout (little endian):
+#   header    magic, version, complete flag, directory count, names size, created, root path size
+#   root path utf-8, padded to 8 bytes
+#   columns   parent (int64), name offset (uint64), own size (uint64), mtime (float64),
+#             own file count (uint64), each `count` entries long
+#   names     utf-8 names separated by NUL bytes
+MAGIC = b"VBOXSNAP"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQdQ")
+COLUMNS = [("parent", "q"), ("name_offset", "Q"), ("own_size", "Q"), ("mtime", "d"), ("own_files", "Q")]
+
+# Snapshots kept per mountpoint
+KEEP_SNAPSHOTS = 10
+
+def snapshot_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "vbox", "snapshots")
+
+def _slug(root):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", root).strip("_")
+    return slug or "root"
+
+def _pad(size):
+    return (8 - size % 8) % 8
+
+def save_snapshot(tree, path=None):
+    """
+    Writes a DirTree to a snapshot file. Returns the path written.
+    """
+    if path is None:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(snapshot_dir(), f"{_slug(tree.root_path)}-{stamp}.vbs")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    names = bytearray()
+    offsets = array('Q')
+    for name in tree.names:
+        offsets.append(len(names))
+        names += name.encode("utf-8", "surrogateescape")
+        names += b"\0"
+    root = tree.root_path.encode("utf-8", "surrogateescape")
+
+    columns = {
+        "parent": tree.parent,
+        "name_offset": offsets,
+        "own_size": tree.own_size,
+        "mtime": tree.mtime,
+        "own_files": tree.own_files,
+    }
+
+    # Write next to the target and rename, so readers never see a partial file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, int(tree.complete), len(tree), len(names), time.time(), len(root)))
+        f.write(root + b"\0" * _pad(len(root)))
+        for key, typecode in COLUMNS:
+            f.write(array(typecode, columns[key]).tobytes())
+        f.write(names)
+    os.replace(tmp_path, path)
+    _prune(tree.root_path)
+    return path
+
+def load_snapshot(path):
+    """
+    Maps a snapshot file and returns it as a read-only DirTree.
+    The numeric columns are views into the mapping; only the child links
+    and subtree totals are built in memory.
+    """
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapping) < HEADER.size:
+        mapping.close()
+        raise ValueError(f"Not a VBox snapshot: {path}")
+    magic, version, complete, count, names_size, created, root_size = HEADER.unpack_from(mapping, 0)
+    if magic != MAGIC or version != VERSION:
+        mapping.close()
+        raise ValueError(f"Not a VBox snapshot: {path}")
+    # A truncated file (disk full, crash while copying) is rejected before any view is made
+    expected = HEADER.size + root_size + _pad(root_size) + count * 8 * len(COLUMNS) + names_size
+    if count < 1 or len(mapping) < expected:
+        mapping.close()
+        raise ValueError(f"Truncated or corrupt snapshot: {path}")
+
+    view = memoryview(mapping)
+    offset = HEADER.size
+    root_path = bytes(view[offset:offset + root_size]).decode("utf-8", "surrogateescape")
+    offset += root_size + _pad(root_size)
+
+    # Names follow the columns; checked before any column view holds the mapping open
+    names_offset = offset + count * 8 * len(COLUMNS)
+    names = bytes(view[names_offset:names_offset + names_size]).split(b"\0")
+    if len(names) < count:
+        view.release()
+        mapping.close()
+        raise ValueError(f"Truncated or corrupt snapshot: {path}")
+
+    tree = DirTree.__new__(DirTree)
+    tree.root_path = root_path
+    tree.complete = bool(complete)
+    tree.created = created
+    tree.mapping = mapping # keeps the views below valid
+    columns = []
+    for key, typecode in COLUMNS:
+        size = count * 8
+        columns.append(view[offset:offset + size].cast(typecode))
+        setattr(tree, key, columns[-1])
+        offset += size
+
+    tree.names = [name.decode("utf-8", "surrogateescape") for name in names[:count]]
+    tree.names[0] = root_path
+    del tree.name_offset
+
+    # Parents always come before their children, so links and totals need one pass each
+    tree.first_child = array('q', [NO_NODE]) * count
+    tree.next_sibling = array('q', [NO_NODE]) * count
+    tree.total_size = array('Q', tree.own_size)
+    tree.file_count = array('Q', tree.own_files)
+    parent = tree.parent
+    for idx in range(count - 1, 0, -1):
+        p = parent[idx]
+        if not 0 <= p < idx:
+            # Nothing may still point into the mapping when it is closed
+            for column in columns:
+                column.release()
+            view.release()
+            mapping.close()
+            raise ValueError(f"Truncated or corrupt snapshot: {path}")
+        tree.next_sibling[idx] = tree.first_child[p]
+        tree.first_child[p] = idx
+        tree.total_size[p] += tree.total_size[idx]
+        tree.file_count[p] += tree.file_count[idx]
+    return tree
+
+def list_snapshots(root):
+    """
+    Returns [(path, created)] of the snapshots of a mountpoint, newest first.
+    """
+    directory = snapshot_dir()
+    prefix = _slug(root) + "-"
+    result = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return result
+    for name in names:
+        if not (name.startswith(prefix) and name.endswith(".vbs")):
+            continue
+        # A longer mountpoint may share the prefix (/home vs /home/x), check the stamp shape
+        if not re.fullmatch(r"\d{8}-\d{6}", name[len(prefix):-4]):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path, "rb") as f:
+                header = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            continue
+        if header[0] == MAGIC:
+            result.append((path, header[5]))
+    result.sort(key=lambda item: item[1], reverse=True)
+    return result
+
+def _prune(root):
+    for path, _ in list_snapshots(root)[KEEP_SNAPSHOTS:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class SnapshotDiff:
+    """
+    Matches the directories of two trees of the same mountpoint by path,
+    so each directory of the newer tree can report how much it grew.
+    """
+    def __init__(self, old, new):
+        self.old = old
+        self.new = new
+        self.old_index = {} # new index -> old index
+        self._old_children = {}
+        if old.root_path == new.root_path:
+            self.old_index[0] = 0
+
+    def _match(self, idx):
+        """Old index of a directory of the new tree, or None if it did not exist."""
+        # Climb to the nearest matched ancestor, then match back down (no recursion: trees can be deep)
+        chain = []
+        while idx not in self.old_index:
+            if idx == 0:
+                self.old_index[0] = None
+                break
+            chain.append(idx)
+            idx = self.new.parent[idx]
+        old = self.old_index[idx]
+        for idx in reversed(chain):
+            if old is not None:
+                children = self._old_children.get(old)
+                if children is None:
+                    children = {self.old.names[c]: c for c in self.old.children(old)}
+                    self._old_children[old] = children
+                old = children.get(self.new.names[idx])
+            self.old_index[idx] = old
+        return old
+
+    def growth(self, idx):
+        """Bytes a directory of the new tree grew by (negative when it shrank)."""
+        old = self._match(idx)
+        if old is None:
+            return self.new.total_size[idx]
+        return self.new.total_size[idx] - self.old.total_size[old]
+
+    def removed_children(self, idx):
+        """[(name, size)] of directories that existed below `idx` in the old tree only."""
+        old = self._match(idx)
+        if old is None:
+            return []
+        current = {self.new.names[c] for c in self.new.children(idx)}
+        return [
+            (self.old.names[c], self.old.total_size[c])
+            for c in self.old.children(old)
+            if self.old.names[c] not in current
+        ]
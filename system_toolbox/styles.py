@@ -1,4 +1,6 @@
 
+import functools
+
 # Color Palette - Light Mode Optimized
 THEME = {
     "background": "#f8f9fa", # Slightly off-white for less glare
@@ -16,7 +18,13 @@ THEME = {
     "selection": "#e7f1ff"
 }
 
+@functools.lru_cache(maxsize=None)
 def get_stylesheet():
+    """
+    The one application stylesheet, built once. Widgets pick their look with object names
+    and change state with dynamic properties (see set_style_state), never with a sheet of
+    their own, so Qt parses CSS once per session.
+    """
     colors = THEME
     
     return f"""
@@ -187,4 +195,86 @@ def get_stylesheet():
     QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
         height: 0px;
     }}
+
+    /* Package table */
+    QTableWidget#packageTable {{
+        border: none;
+        background-color: white;
+        gridline-color: #e0e0e0;
+    }}
+    QTableWidget#packageTable::item {{
+        padding: 10px;
+        border-bottom: 1px solid #f0f0f0;
+    }}
+    QTableWidget#packageTable::item:selected {{
+        background-color: #e3f2fd;
+        color: black;
+    }}
+    QTableWidget#packageTable QHeaderView::section {{
+        background-color: white;
+        border: none;
+        border-bottom: 2px solid #e0e0e0;
+        padding: 12px;
+        font-weight: bold;
+        color: #9e9e9e;
+        text-transform: uppercase;
+        font-size: 12px;
+    }}
+    QLabel#loadingLabel {{
+        color: #666;
+        font-style: italic;
+    }}
+
+    /* Disk table */
+    QTableView#diskTable {{
+        border: none;
+        background-color: white;
+        gridline-color: #f0f0f0;
+    }}
+    QTableView#diskTable::item {{
+        padding-left: 10px;
+        padding-right: 10px;
+        border-bottom: 1px solid #f5f5f5;
+    }}
+    QTableView#diskTable::item:selected {{
+        background-color: #e3f2fd;
+        color: black;
+    }}
+    QTableView#diskTable QHeaderView::section {{
+        background-color: white;
+        border: none;
+        border-bottom: 2px solid #e0e0e0;
+        padding: 12px;
+        font-weight: bold;
+        color: #757575;
+        text-transform: uppercase;
+        font-size: 12px;
+    }}
+
+    /* States, switched with set_style_state() */
+    QLabel#alertLabel, QLabel[alert="true"] {{
+        color: #ef5350;
+        font-weight: bold;
+    }}
+    QProgressBar#ramBar[level="normal"]::chunk {{
+        background-color: #5cb85c;
+    }}
+    QProgressBar#ramBar[level="warning"]::chunk {{
+        background-color: #f0ad4e;
+    }}
+    QProgressBar#ramBar[level="critical"]::chunk {{
+        background-color: #d9534f;
+    }}
+    """
+
+def set_style_state(widget, name, value):
+    """
+    Sets the dynamic property matched by the [name="value"] selectors above. Only a change
+    re-polishes the widget, from the rules already parsed.
     """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    # The stylesheet style recomputes the widget's rules on polish; no unpolish needed
+    widget.style().polish(widget)
+    widget.update()
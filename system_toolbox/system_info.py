@@ -1,4 +1,14 @@
 import psutil
+import os
+from system_toolbox.mounts import mount_details
+from system_toolbox.tracing import traced
+
+def format_size(size):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.2f} TB"
 
 def get_disk_usage():
     """
@@ -10,17 +20,15 @@ def get_disk_usage():
         partitions = psutil.disk_partitions(all=False)
         for partition in partitions:
             try:
-                usage = psutil.disk_usage(partition.mountpoint)
-                disk_info.append({
+                entry = {
                     "device": partition.device,
                     "mountpoint": partition.mountpoint,
                     "fstype": partition.fstype,
                     "opts": partition.opts,
-                    "total": usage.total,
-                    "used": usage.used,
-                    "free": usage.free,
-                    "percent": usage.percent
-                })
+                }
+                # Sizes, reserved blocks, inodes and fs specifics from one statvfs()
+                entry.update(mount_details(entry))
+                disk_info.append(entry)
             except PermissionError:
                 # Skip partitions that we don't have access to
                 continue
@@ -41,6 +49,7 @@ def get_ram_usage():
         "percent": mem.percent
     }
 
+@traced("processes.list")
 def get_process_list():
     """
     Returns a list of running processes with memory usage.
@@ -65,3 +74,80 @@ def get_process_list():
     # Sort by memory usage (descending)
     processes.sort(key=lambda x: x['memory_percent'], reverse=True)
     return processes
+
+def _read_key_values(path, separator=None):
+    """
+    Parses "key value ..." lines (meminfo / vmstat style) into a dictionary of integers.
+    """
+    values = {}
+    with open(path, "r") as f:
+        for line in f:
+            parts = line.split(separator)
+            if len(parts) >= 2:
+                try:
+                    values[parts[0].rstrip(":")] = int(parts[1])
+                except ValueError:
+                    continue
+    return values
+
+def get_memory_pressure(proc_root="/proc", sys_root="/sys"):
+    """
+    Returns a dictionary with the kernel's view of memory pressure:
+    meminfo (bytes), PSI some/full averages, vmstat counters and zram usage.
+    Sections that are not available on this kernel are left empty.
+    """
+    result = {"meminfo": {}, "psi": {}, "vmstat": {}, "zram": []}
+
+    # /proc/meminfo values are in kB
+    try:
+        meminfo = _read_key_values(os.path.join(proc_root, "meminfo"))
+        result["meminfo"] = {key: value * 1024 for key, value in meminfo.items()}
+    except OSError as e:
+        print(f"Error reading meminfo: {e}")
+
+    # PSI: "some avg10=0.00 avg60=0.00 avg300=0.00 total=0" (needs CONFIG_PSI)
+    try:
+        with open(os.path.join(proc_root, "pressure", "memory"), "r") as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                fields = dict(part.split("=", 1) for part in parts[1:])
+                result["psi"][parts[0]] = {
+                    "avg10": float(fields.get("avg10", 0)),
+                    "avg60": float(fields.get("avg60", 0)),
+                    "avg300": float(fields.get("avg300", 0)),
+                    "total": int(fields.get("total", 0))
+                }
+    except (OSError, ValueError):
+        pass
+
+    try:
+        vmstat = _read_key_values(os.path.join(proc_root, "vmstat"))
+        result["vmstat"] = {
+            key: vmstat.get(key, 0)
+            for key in ("pgmajfault", "pswpin", "pswpout", "workingset_refault_file", "workingset_refault_anon")
+        }
+    except OSError as e:
+        print(f"Error reading vmstat: {e}")
+
+    # zram mm_stat: orig_data_size compr_data_size mem_used_total ...
+    block_dir = os.path.join(sys_root, "block")
+    try:
+        devices = sorted(d for d in os.listdir(block_dir) if d.startswith("zram"))
+    except OSError:
+        devices = []
+    for device in devices:
+        try:
+            with open(os.path.join(block_dir, device, "mm_stat"), "r") as f:
+                fields = [int(v) for v in f.read().split()]
+            result["zram"].append({
+                "device": device,
+                "orig_data_size": fields[0],
+                "compr_data_size": fields[1],
+                "mem_used_total": fields[2]
+            })
+        except (OSError, ValueError, IndexError):
+            continue
+
+    return result
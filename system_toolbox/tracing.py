@@ -0,0 +1,157 @@
+"""
+Named timing spans, to find where the time goes on a slow machine:
+
+    with span("apps.render"):
+        ...
+
+    @traced("processes.sample")
+    def update(self): ...
+
+Tracing is off unless VBOX_TRACE is set (or enable() is called). While off, span()
+returns one shared no-op context manager and traced() functions cost one flag check.
+The diagnostics panel (Ctrl+Shift+D) shows per-span statistics; dump_chrome_trace()
+writes the session for chrome://tracing or https://ui.perfetto.dev.
+"""
+import os
+import json
+import atexit
+import functools
+import threading
+import time
+from collections import deque
+
+# Finished spans kept for the Chrome trace (the oldest are dropped)
+MAX_EVENTS = 100000
+# Durations kept per span name for the percentiles
+SAMPLES_PER_SPAN = 1000
+
+enabled = os.environ.get("VBOX_TRACE", "") not in ("", "0")
+
+_lock = threading.Lock()
+_events = deque(maxlen=MAX_EVENTS) # (name, start ns, duration ns, thread id)
+_durations = {} # name -> deque of recent durations (ns)
+_counts = {} # name -> (count, total ns) since the last reset
+_threads = {} # thread id -> name
+_origin = time.perf_counter_ns()
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+def span(name):
+    """Context manager timing the block as `name`."""
+    return _Span(name) if enabled else _NO_SPAN
+
+def traced(name):
+    """Decorator timing every call of a function as `name`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, start, time.perf_counter_ns())
+        return wrapper
+    return decorate
+
+def record(name, start, end):
+    tid = threading.get_ident()
+    duration = end - start
+    with _lock:
+        if tid not in _threads:
+            _threads[tid] = threading.current_thread().name
+        _events.append((name, start, duration, tid))
+        samples = _durations.get(name)
+        if samples is None:
+            samples = _durations[name] = deque(maxlen=SAMPLES_PER_SPAN)
+        samples.append(duration)
+        count, total = _counts.get(name, (0, 0))
+        _counts[name] = (count + 1, total + duration)
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+def reset():
+    with _lock:
+        _events.clear()
+        _durations.clear()
+        _counts.clear()
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of a sorted list."""
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+def stats():
+    """
+    {name: {"count", "total_ms", "p50_ms", "p99_ms", "max_ms"}}; the percentiles
+    cover the last SAMPLES_PER_SPAN calls, count and total the whole session.
+    """
+    with _lock:
+        snapshot = {name: (sorted(samples), _counts[name]) for name, samples in _durations.items()}
+    result = {}
+    for name, (ordered, (count, total)) in snapshot.items():
+        result[name] = {
+            "count": count,
+            "total_ms": total / 1e6,
+            "p50_ms": percentile(ordered, 0.50) / 1e6,
+            "p99_ms": percentile(ordered, 0.99) / 1e6,
+            "max_ms": ordered[-1] / 1e6,
+        }
+    return result
+
+def chrome_trace():
+    """The recorded spans in the Chrome trace event format (complete events, microseconds)."""
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        threads = dict(_threads)
+    trace = [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+        for tid, name in threads.items()
+    ]
+    for name, start, duration, tid in events:
+        trace.append({
+            "name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": tid,
+            "ts": (start - _origin) / 1000.0, "dur": duration / 1000.0,
+        })
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+def dump_chrome_trace(path):
+    with open(path, "w") as f:
+        json.dump(chrome_trace(), f)
+
+def dump_at_exit(path):
+    """Enables tracing and writes the Chrome trace of the whole session to `path` on exit."""
+    def dump():
+        try:
+            dump_chrome_trace(path)
+        except OSError as e:
+            print(f"Error writing trace {path}: {e}")
+    enable()
+    atexit.register(dump)
@@ -0,0 +1,146 @@
+from array import array
+from system_toolbox.dir_scanner import NO_NODE
+
+# Rectangles smaller than this (in pixels, either side) are not produced
+MIN_SIZE = 4
+# Space kept around nested rectangles and for the folder name on top
+PADDING = 2
+LABEL_HEIGHT = 14
+
+class TreemapLayout:
+    """
+    Flat result of layout_treemap(): rectangle i is rects[4*i:4*i+4] (x, y, w, h)
+    for directory nodes[i] at nesting level depths[i]. Parents come before children.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.rects = array('f')
+        self.nodes = array('q')
+        self.depths = array('B')
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def add(self, x, y, w, h, node, depth):
+        self.rects.extend((x, y, w, h))
+        self.nodes.append(node)
+        self.depths.append(min(depth, 255))
+
+    def hit_test(self, px, py):
+        """Returns the deepest directory under a point, or NO_NODE."""
+        rects = self.rects
+        for i in range(len(self.nodes) - 1, -1, -1):
+            x, y, w, h = rects[4 * i], rects[4 * i + 1], rects[4 * i + 2], rects[4 * i + 3]
+            if x <= px < x + w and y <= py < y + h:
+                return self.nodes[i]
+        return NO_NODE
+
+def _worst(row_sum, row_max, row_min, side):
+    # Highest aspect ratio in a row of the squarified algorithm (Bruls, Huizing, van Wijk)
+    side2 = side * side
+    sum2 = row_sum * row_sum
+    return max(side2 * row_max / sum2, sum2 / (side2 * row_min))
+
+def squarify(items, x, y, w, h, out):
+    """
+    Lays out (area, key) items, sorted largest first and summing to w * h,
+    calling out(x, y, w, h, key) for each rectangle.
+    """
+    i = 0
+    count = len(items)
+    while i < count and w > 0 and h > 0:
+        side = min(w, h)
+        first = items[i][0]
+        row_sum = row_max = row_min = first
+        worst = _worst(row_sum, row_max, row_min, side)
+        end = i + 1
+        while end < count:
+            area = items[end][0]
+            candidate = _worst(row_sum + area, row_max, min(row_min, area), side)
+            if candidate > worst:
+                break
+            row_sum += area
+            row_min = min(row_min, area)
+            worst = candidate
+            end += 1
+
+        if row_sum <= 0:
+            break
+        if w >= h:
+            # Column along the left edge
+            column_w = row_sum / h
+            cy = y
+            for area, key in items[i:end]:
+                cell_h = area / column_w
+                out(x, cy, column_w, cell_h, key)
+                cy += cell_h
+            x += column_w
+            w -= column_w
+        else:
+            # Row along the top edge
+            row_h = row_sum / w
+            cx = x
+            for area, key in items[i:end]:
+                cell_w = area / row_h
+                out(cx, y, cell_w, row_h, key)
+                cx += cell_w
+            y += row_h
+            h -= row_h
+        i = end
+
+def layout_treemap(tree, root, width, height, min_size=MIN_SIZE, is_cancelled=None):
+    """
+    Squarified treemap of the subtree below `root`, computed from the flat
+    size arrays of a DirTree. Level of detail: children whose rectangle would be
+    smaller than min_size pixels are never sorted or laid out, so the amount of
+    work depends on the pixels available, not on the number of directories.
+    """
+    layout = TreemapLayout(root)
+    if width <= 0 or height <= 0 or tree.total_size[root] == 0:
+        return layout
+    min_area = min_size * min_size
+    total_size = tree.total_size
+
+    layout.add(0.0, 0.0, float(width), float(height), root, 0)
+    stack = [(root, 0.0, 0.0, float(width), float(height), 0)]
+    while stack:
+        if is_cancelled and is_cancelled():
+            break
+        node, x, y, w, h, depth = stack.pop()
+
+        # Inner area left for the children
+        top = LABEL_HEIGHT if h > LABEL_HEIGHT * 3 and w > 40 else 0
+        ix, iy = x + PADDING, y + PADDING + top
+        iw, ih = w - 2 * PADDING, h - 2 * PADDING - top
+        if iw < min_size or ih < min_size:
+            continue
+        node_total = total_size[node]
+        if node_total == 0:
+            continue
+        scale = iw * ih / node_total
+
+        items = []
+        child = tree.first_child[node]
+        while child != NO_NODE:
+            area = total_size[child] * scale
+            if area >= min_area:
+                items.append((area, child))
+            child = tree.next_sibling[child]
+        if not items:
+            continue
+        items.sort(reverse=True)
+
+        # Files and culled children keep their share as empty space at the end
+        rest = iw * ih - sum(area for area, _ in items)
+        if rest > 0:
+            items.append((rest, NO_NODE))
+
+        def place(cx, cy, cw, ch, key, depth=depth):
+            if key == NO_NODE or cw < min_size or ch < min_size:
+                return
+            layout.add(cx, cy, cw, ch, key, depth + 1)
+            if tree.first_child[key] != NO_NODE:
+                stack.append((key, cx, cy, cw, ch, depth + 1))
+
+        squarify(items, ix, iy, iw, ih, place)
+    return layout
@@ -0,0 +1,142 @@
+import sys
+import time
+import threading
+import traceback
+from collections import deque
+from PySide6.QtCore import QObject, QTimer
+from system_toolbox import tracing
+
+HEARTBEAT_MS = 50
+# Seconds the event loop may go without a heartbeat before it counts as stalled
+STALL_THRESHOLD = 0.2
+# How often the watchdog thread checks the heartbeat
+CHECK_INTERVAL = 0.05
+# Histogram bucket upper bounds (ms); the last bucket holds everything longer
+STALL_BUCKETS_MS = [250, 500, 1000, 2000, 5000]
+MAX_STALLS = 100
+STACK_DEPTH = 40
+
+def bucket_labels():
+    labels = []
+    lower = int(STALL_THRESHOLD * 1000)
+    for upper in STALL_BUCKETS_MS:
+        labels.append(f"{lower}-{upper} ms")
+        lower = upper
+    labels.append(f"> {lower} ms")
+    return labels
+
+def stall_location(stack):
+    """Innermost frame of VBox's own code: where a stall is attributed."""
+    for frame in reversed(stack):
+        if "system_toolbox" in frame.filename and not frame.filename.endswith("watchdog.py"):
+            return f"{frame.name} ({frame.filename.rsplit('/', 1)[-1]}:{frame.lineno})"
+    if stack:
+        frame = stack[-1]
+        return f"{frame.name} ({frame.filename.rsplit('/', 1)[-1]}:{frame.lineno})"
+    return "Qt (no Python code running)"
+
+class StallWatchdog(QObject):
+    """
+    Detects freezes of the GUI thread. A QTimer beats every HEARTBEAT_MS on the event loop;
+    a background thread checks the beats and, once none came for `threshold` seconds, takes
+    the GUI thread's Python stack with sys._current_frames(). When the loop answers again the
+    stall's duration goes into `histogram` and the stack into `stalls` and `culprits`.
+    """
+    def __init__(self, threshold=STALL_THRESHOLD, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold
+        self.gui_thread = threading.get_ident() # created on the GUI thread
+        self.lock = threading.Lock()
+        self.last_beat = time.perf_counter_ns()
+        self.current = None # stack of the stall in progress
+        self.histogram = [0] * (len(STALL_BUCKETS_MS) + 1)
+        self.stalls = deque(maxlen=MAX_STALLS) # {"duration_ms", "location", "stack"}, newest last
+        self.culprits = {} # location -> {"count", "total_ms", "worst_ms", "stack"}
+        self.thread = None
+        self.stopping = threading.Event()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(HEARTBEAT_MS)
+        self.timer.timeout.connect(self.beat)
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.last_beat = time.perf_counter_ns()
+        self.stopping.clear()
+        self.timer.start()
+        self.thread = threading.Thread(target=self.watch, name="vbox-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.timer.stop()
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+        self.current = None
+
+    def reset(self):
+        with self.lock:
+            self.histogram = [0] * (len(STALL_BUCKETS_MS) + 1)
+            self.stalls.clear()
+            self.culprits = {}
+
+    def beat(self):
+        now = time.perf_counter_ns()
+        with self.lock:
+            stack = self.current
+            self.current = None
+            previous = self.last_beat
+            self.last_beat = now
+        if stack is not None:
+            self.finish_stall(stack, previous, now)
+
+    def watch(self):
+        limit = (self.threshold + HEARTBEAT_MS / 1000.0) * 1e9
+        while not self.stopping.wait(CHECK_INTERVAL):
+            with self.lock:
+                if self.current is not None or time.perf_counter_ns() - self.last_beat < limit:
+                    continue
+                frame = sys._current_frames().get(self.gui_thread)
+                stack = []
+                if frame is not None:
+                    # Source lines are read later, not while the GUI thread is stuck
+                    stack = traceback.StackSummary.extract(traceback.walk_stack(frame), limit=STACK_DEPTH, lookup_lines=False)
+                    stack.reverse()
+                    del frame
+                self.current = stack
+
+    def finish_stall(self, stack, last_beat, now):
+        # The beat after `last_beat` was due HEARTBEAT_MS later
+        start = last_beat + HEARTBEAT_MS * 1000000
+        duration_ms = (now - start) / 1e6
+        location = stall_location(stack)
+        text = "".join(traceback.format_list(stack))
+        bucket = next((i for i, upper in enumerate(STALL_BUCKETS_MS) if duration_ms <= upper), len(STALL_BUCKETS_MS))
+        with self.lock:
+            self.histogram[bucket] += 1
+            self.stalls.append({"duration_ms": duration_ms, "location": location, "stack": text})
+            culprit = self.culprits.setdefault(location, {"count": 0, "total_ms": 0.0, "worst_ms": 0.0, "stack": text})
+            culprit["count"] += 1
+            culprit["total_ms"] += duration_ms
+            if duration_ms >= culprit["worst_ms"]:
+                culprit["worst_ms"] = duration_ms
+                culprit["stack"] = text
+        if tracing.enabled:
+            tracing.record("gui.stall", start, now)
+        print(f"UI stall of {duration_ms:.0f} ms in {location}")
+
+    def snapshot(self):
+        """Copies of the histogram, stalls and culprits for the diagnostics panel."""
+        with self.lock:
+            return {
+                "histogram": list(self.histogram),
+                "stalls": list(self.stalls),
+                "culprits": {location: dict(culprit) for location, culprit in self.culprits.items()},
+            }
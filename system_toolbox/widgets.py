@@ -0,0 +1,267 @@
+from PySide6.QtWidgets import QWidget, QToolTip, QVBoxLayout, QLabel
+import time
+from PySide6.QtCore import Qt, QObject, QPointF, QRectF, QThread, QTimer, Signal, QEvent
+from PySide6.QtGui import QPainter, QPen, QColor, QPolygonF, QBrush
+from system_toolbox.treemap import layout_treemap, LABEL_HEIGHT
+from system_toolbox.dir_scanner import NO_NODE
+from system_toolbox.tracing import span
+
+# Time the GUI thread spends filling a table before it returns to the event loop
+SLICE_MS = 8
+
+class LazyTab(QWidget):
+    """
+    Tab page that builds its real widget the first time it is shown.
+    Until then the tab's imports, threads and timers cost nothing; the build
+    runs after the placeholder has painted, so the window never waits for it.
+    """
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.widget = None
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.placeholder = QLabel("Loading...")
+        self.placeholder.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.placeholder)
+
+    def build(self):
+        if self.widget is None:
+            self.widget = self.factory()
+            self.placeholder.deleteLater()
+            self.placeholder = None
+            self.layout.addWidget(self.widget)
+        return self.widget
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.widget is None:
+            QTimer.singleShot(0, self.build)
+
+class ChunkedRenderer(QObject):
+    """
+    Calls render_row(index, item) for a list of items in time slices of about SLICE_MS,
+    from a zero-interval timer, so input and paints are handled between slices.
+    start() again or cancel() drops the rest of a running render.
+    """
+    progress = Signal(int, int) # rendered, total
+    finished = Signal()
+
+    def __init__(self, render_row, span_name="render.slice", slice_ms=SLICE_MS, parent=None):
+        super().__init__(parent)
+        self.render_row = render_row
+        self.span_name = span_name
+        self.slice_ns = slice_ms * 1000000
+        self.items = []
+        self.index = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.render_slice)
+
+    @property
+    def running(self):
+        return self.timer.isActive()
+
+    def start(self, items):
+        self.items = items
+        self.index = 0
+        self.timer.start()
+
+    def cancel(self):
+        self.timer.stop()
+        self.items = []
+
+    def render_slice(self):
+        items = self.items
+        deadline = time.perf_counter_ns() + self.slice_ns
+        with span(self.span_name):
+            # At least one row per slice, whatever a row costs
+            while self.index < len(items):
+                self.render_row(self.index, items[self.index])
+                self.index += 1
+                if time.perf_counter_ns() >= deadline:
+                    break
+        self.progress.emit(self.index, len(items))
+        if self.index >= len(items):
+            self.cancel()
+            self.finished.emit()
+
+    def finish(self):
+        """Renders the remaining items now, without returning to the event loop."""
+        while self.running:
+            self.render_slice()
+
+class Sparkline(QWidget):
+    """Small line chart for a rolling history of values."""
+    def __init__(self, color="#0d6efd", maximum=None, parent=None):
+        super().__init__(parent)
+        self.values = []
+        self.maximum = maximum # None scales to the largest value in the history
+        self.pen = QPen(QColor(color))
+        self.pen.setWidthF(1.5)
+        self.setMinimumSize(120, 28)
+
+    def set_values(self, values):
+        self.values = list(values)
+        self.update()
+
+    def paintEvent(self, event):
+        if len(self.values) < 2:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.pen)
+
+        width = self.width() - 2
+        height = self.height() - 2
+        top = self.maximum if self.maximum is not None else max(self.values)
+        top = top or 1
+        step = width / (len(self.values) - 1)
+
+        points = QPolygonF([
+            QPointF(1 + i * step, 1 + height - min(value / top, 1.0) * height)
+            for i, value in enumerate(self.values)
+        ])
+        painter.drawPolyline(points)
+        painter.end()
+
+class TreemapLayoutWorker(QThread):
+    finished = Signal(object) # TreemapLayout
+
+    def __init__(self, tree, root, width, height):
+        super().__init__()
+        self.tree = tree
+        self.root = root
+        self.width = width
+        self.height = height
+        self.cancelled = False
+
+    def run(self):
+        layout = layout_treemap(
+            self.tree, self.root, self.width, self.height,
+            is_cancelled=lambda: self.cancelled
+        )
+        # Emitted even when cancelled, so the widget knows the thread is free again
+        self.finished.emit(layout)
+
+# Fill colors per nesting level (brushes are shared, not created per rectangle)
+TREEMAP_COLORS = ["#e7f1ff", "#9ec5fe", "#6ea8fe", "#3d8bfd", "#0d6efd", "#0a58ca", "#084298"]
+
+class TreemapWidget(QWidget):
+    """
+    Squarified treemap of a DirTree subtree. Layout runs on a worker thread and
+    only produces rectangles a few pixels or larger; painting draws that flat list.
+    """
+    directory_activated = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tree = None
+        self.root = 0
+        self.layout_result = None
+        self.worker = None
+        self.relayout_pending = False
+        self.brushes = [QBrush(QColor(c)) for c in TREEMAP_COLORS]
+        self.text_colors = [QColor("#212529") if i < 3 else QColor("white") for i in range(len(TREEMAP_COLORS))]
+        self.border_pen = QPen(QColor("#ffffff"))
+        self.setMinimumSize(200, 150)
+
+        # Resizes are coalesced into one layout
+        self.relayout_timer = QTimer(self)
+        self.relayout_timer.setSingleShot(True)
+        self.relayout_timer.setInterval(100)
+        self.relayout_timer.timeout.connect(self.relayout)
+
+    def set_root(self, tree, root):
+        """Shows the subtree below `root`; zooming only lays out that subtree."""
+        self.tree = tree
+        self.root = root
+        self.relayout()
+
+    def relayout(self):
+        if self.tree is None or not self.isVisible():
+            return
+        if self.worker is not None and self.worker.isRunning():
+            # Finish the running layout first, then start over with the new size / root
+            self.worker.cancelled = True
+            self.relayout_pending = True
+            return
+        self.relayout_pending = False
+        self.worker = TreemapLayoutWorker(self.tree, self.root, self.width(), self.height())
+        self.worker.finished.connect(self.on_layout_finished)
+        self.worker.start()
+
+    def stop(self):
+        """Cancels a running layout and waits for its thread."""
+        self.relayout_timer.stop()
+        self.relayout_pending = False
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.cancelled = True
+            self.worker.wait()
+
+    def on_layout_finished(self, layout):
+        if self.relayout_pending:
+            # Outdated (size or root changed meanwhile)
+            self.relayout()
+            return
+        self.layout_result = layout
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.relayout_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.relayout()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#f8f9fa"))
+        layout = self.layout_result
+        if layout is None or self.tree is None:
+            painter.end()
+            return
+
+        rects = layout.rects
+        names = self.tree.names
+        clip = QRectF(event.rect())
+        levels = len(self.brushes)
+        painter.setPen(self.border_pen)
+        for i in range(len(layout)):
+            rect = QRectF(rects[4 * i], rects[4 * i + 1], rects[4 * i + 2], rects[4 * i + 3])
+            if not rect.intersects(clip):
+                continue
+            level = min(layout.depths[i], levels - 1)
+            painter.setBrush(self.brushes[level])
+            painter.drawRect(rect)
+            # Folder name in the strip reserved above the children
+            if rect.height() > LABEL_HEIGHT * 3 and rect.width() > 40 and layout.depths[i] > 0:
+                painter.setPen(self.text_colors[level])
+                painter.drawText(
+                    rect.adjusted(3, 1, -3, 0), Qt.AlignLeft | Qt.AlignTop | Qt.TextSingleLine,
+                    names[layout.nodes[i]]
+                )
+                painter.setPen(self.border_pen)
+        painter.end()
+
+    def node_at(self, pos):
+        if self.layout_result is None:
+            return NO_NODE
+        return self.layout_result.hit_test(pos.x(), pos.y())
+
+    def mouseDoubleClickEvent(self, event):
+        node = self.node_at(event.position())
+        if node != NO_NODE and node != self.root:
+            self.directory_activated.emit(node)
+
+    def event(self, event):
+        if event.type() == QEvent.ToolTip and self.tree is not None:
+            node = self.node_at(event.position() if hasattr(event, "position") else event.pos())
+            if node != NO_NODE:
+                size = self.tree.total_size[node] / (1024**2)
+                QToolTip.showText(event.globalPos(), f"{self.tree.path(node)}\n{size:,.1f} MB", self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(event)
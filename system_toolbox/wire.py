@@ -0,0 +1,162 @@
+import struct
+
+# Frames larger than this are treated as a corrupt stream
+MAX_FRAME = 64 * 1024 * 1024
+
+_LENGTH = struct.Struct(">I")
+
+class WireError(ValueError):
+    pass
+
+def encode(value):
+    """
+    Serializes None, bool, int, float, str, bytes, lists / tuples and dicts
+    in the MessagePack format (the subset of it VBox needs).
+    """
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+def _encode(value, out):
+    if value is None:
+        out.append(0xc0)
+    elif value is True:
+        out.append(0xc3)
+    elif value is False:
+        out.append(0xc2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -32 <= value < 0:
+            out.append(value & 0xff)
+        elif 0 <= value < 1 << 64:
+            for limit, tag, fmt in ((1 << 8, 0xcc, ">B"), (1 << 16, 0xcd, ">H"), (1 << 32, 0xce, ">I"), (1 << 64, 0xcf, ">Q")):
+                if value < limit:
+                    out.append(tag)
+                    out += struct.pack(fmt, value)
+                    break
+        elif -(1 << 63) <= value < 0:
+            for limit, tag, fmt in ((1 << 7, 0xd0, ">b"), (1 << 15, 0xd1, ">h"), (1 << 31, 0xd2, ">i"), (1 << 63, 0xd3, ">q")):
+                if value >= -limit:
+                    out.append(tag)
+                    out += struct.pack(fmt, value)
+                    break
+        else:
+            raise WireError(f"Integer out of range: {value}")
+    elif isinstance(value, float):
+        out.append(0xcb)
+        out += struct.pack(">d", value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8", "surrogateescape")
+        _header(len(data), 0xa0, 32, (0xd9, 0xda, 0xdb), out)
+        out += data
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        _header(len(data), None, 0, (0xc4, 0xc5, 0xc6), out)
+        out += data
+    elif isinstance(value, (list, tuple)):
+        _header(len(value), 0x90, 16, (None, 0xdc, 0xdd), out)
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        _header(len(value), 0x80, 16, (None, 0xde, 0xdf), out)
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+    else:
+        raise WireError(f"Cannot encode {type(value).__name__}")
+
+def _header(length, fix_tag, fix_limit, tags, out):
+    """Type tag and length: fix form, then 8 / 16 / 32 bit lengths (None where the format has none)."""
+    if fix_tag is not None and length < fix_limit:
+        out.append(fix_tag | length)
+        return
+    for tag, limit, fmt in zip(tags, (1 << 8, 1 << 16, 1 << 32), (">B", ">H", ">I")):
+        if tag is not None and length < limit:
+            out.append(tag)
+            out += struct.pack(fmt, length)
+            return
+    raise WireError(f"Too long: {length}")
+
+_FIXED = {
+    0xcc: struct.Struct(">B"), 0xcd: struct.Struct(">H"), 0xce: struct.Struct(">I"), 0xcf: struct.Struct(">Q"),
+    0xd0: struct.Struct(">b"), 0xd1: struct.Struct(">h"), 0xd2: struct.Struct(">i"), 0xd3: struct.Struct(">q"),
+    0xca: struct.Struct(">f"), 0xcb: struct.Struct(">d"),
+}
+# tag -> (kind, length struct)
+_SIZED = {
+    0xd9: ("str", _FIXED[0xcc]), 0xda: ("str", _FIXED[0xcd]), 0xdb: ("str", _FIXED[0xce]),
+    0xc4: ("bin", _FIXED[0xcc]), 0xc5: ("bin", _FIXED[0xcd]), 0xc6: ("bin", _FIXED[0xce]),
+    0xdc: ("array", _FIXED[0xcd]), 0xdd: ("array", _FIXED[0xce]),
+    0xde: ("map", _FIXED[0xcd]), 0xdf: ("map", _FIXED[0xce]),
+}
+
+def decode(data):
+    """Inverse of encode(). Arrays decode to lists."""
+    try:
+        value, offset = _decode(data, 0)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise WireError(f"Corrupt message: {e}") from e
+    if offset != len(data):
+        raise WireError("Trailing data after message")
+    return value
+
+def _decode(data, offset):
+    tag = data[offset]
+    offset += 1
+    if tag < 0x80:
+        return tag, offset
+    if tag >= 0xe0:
+        return tag - 0x100, offset
+    if tag == 0xc0:
+        return None, offset
+    if tag == 0xc2:
+        return False, offset
+    if tag == 0xc3:
+        return True, offset
+    fixed = _FIXED.get(tag)
+    if fixed is not None:
+        return fixed.unpack_from(data, offset)[0], offset + fixed.size
+    if 0xa0 <= tag <= 0xbf:
+        kind, length = "str", tag & 0x1f
+    elif 0x90 <= tag <= 0x9f:
+        kind, length = "array", tag & 0x0f
+    elif 0x80 <= tag <= 0x8f:
+        kind, length = "map", tag & 0x0f
+    elif tag in _SIZED:
+        kind, size = _SIZED[tag]
+        length = size.unpack_from(data, offset)[0]
+        offset += size.size
+    else:
+        raise WireError(f"Unsupported type tag 0x{tag:02x}")
+
+    if kind in ("str", "bin"):
+        end = offset + length
+        if end > len(data):
+            raise WireError("Truncated message")
+        chunk = bytes(data[offset:end])
+        return (chunk.decode("utf-8", "surrogateescape") if kind == "str" else chunk), end
+    if kind == "array":
+        items = []
+        for _ in range(length):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return items, offset
+    result = {}
+    for _ in range(length):
+        key, offset = _decode(data, offset)
+        result[key], offset = _decode(data, offset)
+    return result, offset
+
+def frame(value):
+    """A message with its 4 byte big-endian length prefix."""
+    payload = encode(value)
+    return _LENGTH.pack(len(payload)) + payload
+
+def frame_length(header):
+    length = _LENGTH.unpack(header)[0]
+    if length > MAX_FRAME:
+        raise WireError(f"Frame too large: {length} bytes")
+    return length
+
+HEADER_SIZE = _LENGTH.size